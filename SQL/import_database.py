@@ -1,67 +1,170 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""数据库导入脚本"""
+"""数据库导入脚本
 
-import sqlite3
+- 分块读取SQL文件，按字符串、标识符引号和注释切分语句，内容中的分号不会截断语句
+- 在目标库旁的临时文件中导入：journal_mode=OFF、synchronous=OFF，整个导入一个事务，
+  文件自带的 BEGIN/COMMIT 由本脚本统一管理
+- 先建表再导入数据和增量文件，最后创建索引和触发器；全部成功后才替换目标数据库
+用法: python import_database.py [数据库文件] [SQL目录]
+"""
+
+import json
 import os
+import re
+import sqlite3
+import sys
+import time
+
+# 每次读取的字符数
+READ_CHUNK = 1024 * 1024
+# 普通状态下需要关注的记号：语句结束、各种引号、注释开始
+SPECIAL = re.compile(r"[;'\"`\[]|--|/\*")
+# 进入引号或注释后对应的结束符
+CLOSING = {"'": "'", '"': '"', '`': '`', '[': ']', '--': '\n', '/*': '*/'}
+LEADING = re.compile(r"(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*", re.S)
+TRIGGER = re.compile(r"CREATE\s+(?:TEMP\s+|TEMPORARY\s+)?TRIGGER\b", re.I)
+DEFERRED = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\b", re.I)
+TRANSACTION = re.compile(r"(?:BEGIN|COMMIT|END|ROLLBACK)\b(?:\s+TRANSACTION)?\s*;?$", re.I)
+
+
+def iter_statements(path):
+    """流式读取SQL文件，逐条返回语句（去掉前导空白和注释，跳过空语句）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        start = pos = 0
+        closing = None
+        eof = False
+        while not eof:
+            chunk = f.read(READ_CHUNK)
+            eof = not chunk
+            # 只保留未完成的语句，已返回的部分丢掉
+            buf = buf[start:] + chunk
+            pos -= start
+            start = 0
+            while True:
+                if closing is None:
+                    m = SPECIAL.search(buf, pos)
+                    if not m:
+                        # 最后一个字符可能是跨块的 -- 或 /* 的一半
+                        pos = max(pos, len(buf) - 1)
+                        break
+                    pos = m.end()
+                    token = m.group()
+                    if token != ';':
+                        closing = CLOSING[token]
+                        continue
+                    stmt = buf[start:pos]
+                    body = stmt[LEADING.match(stmt).end():]
+                    # 触发器体内的分号不结束语句
+                    if TRIGGER.match(body) and not sqlite3.complete_statement(stmt):
+                        continue
+                    start = pos
+                    if body.strip() != ';':
+                        yield body
+                else:
+                    end = buf.find(closing, pos)
+                    if end < 0:
+                        pos = max(pos, len(buf) - len(closing) + 1)
+                        break
+                    pos = end + len(closing)
+                    closing = None
+        tail = buf[start:]
+        body = tail[LEADING.match(tail).end():]
+        if body.strip():
+            yield body
+
+
+def execute_file(conn, path, deferred=None):
+    """执行一个SQL文件，返回执行的语句数；deferred 不为 None 时把建索引语句留到最后"""
+    count = 0
+    for stmt in iter_statements(path):
+        if TRANSACTION.match(stmt):
+            continue
+        if deferred is not None and DEFERRED.match(stmt):
+            deferred.append(stmt)
+            continue
+        try:
+            conn.execute(stmt)
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"{os.path.basename(path)} 执行语句出错: {stmt[:80]}... 错误: {e}") from e
+        count += 1
+    return count
+
 
 def import_database(db_path='DB/app.db', sql_dir='SQL'):
-    """导入数据库结构和数据"""
-    
+    """导入数据库结构和数据，成功返回 True"""
+
     # 确保数据库目录存在
     db_dir = os.path.dirname(db_path)
-    if not os.path.exists(db_dir):
+    if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir)
-    
-    # 连接数据库
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+
+    tmp_path = db_path + '.importing'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    # 每条语句只执行一次，不缓存预编译语句
+    conn = sqlite3.connect(tmp_path, isolation_level=None, cached_statements=0)
+    t0 = time.perf_counter()
+
     try:
-        # 导入数据库结构
+        # 导入期间不写回滚日志、不等待落盘；出错时丢弃临时文件，目标库不受影响
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("BEGIN")
+        indexes = []
+
+        # 导入数据库结构（索引留到数据导入之后）
         schema_file = os.path.join(sql_dir, 'database_schema.sql')
         if os.path.exists(schema_file):
             print(f"导入数据库结构: {schema_file}")
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                schema_sql = f.read()
-            
-            # 执行结构SQL（分割成单独的语句）
-            statements = [stmt.strip() for stmt in schema_sql.split(';') if stmt.strip() and not stmt.strip().startswith('--')]
-            for statement in statements:
-                try:
-                    cursor.execute(statement)
-                except sqlite3.Error as e:
-                    print(f"执行语句时出错: {statement[:50]}... 错误: {e}")
-            
-            conn.commit()
+            execute_file(conn, schema_file, indexes)
             print("数据库结构导入完成")
-        
+
         # 导入数据
         data_file = os.path.join(sql_dir, 'database_data.sql')
         if os.path.exists(data_file):
             print(f"导入数据: {data_file}")
-            with open(data_file, 'r', encoding='utf-8') as f:
-                data_sql = f.read()
-            
-            # 执行数据SQL
-            statements = [stmt.strip() for stmt in data_sql.split(';') if stmt.strip() and not stmt.strip().startswith('--')]
-            for statement in statements:
-                try:
-                    cursor.execute(statement)
-                except sqlite3.Error as e:
-                    print(f"执行语句时出错: {statement[:50]}... 错误: {e}")
-            
-            conn.commit()
-            print("数据导入完成")
-        
-        print("数据库导入成功！")
-        
+            count = execute_file(conn, data_file)
+            print(f"数据导入完成（{count} 条语句）")
+
+        # 按清单顺序导入增量文件
+        manifest_file = os.path.join(sql_dir, 'export_manifest.json')
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                deltas = json.load(f).get('deltas', [])
+            for name in deltas:
+                delta_file = os.path.join(sql_dir, name)
+                print(f"导入增量: {delta_file}")
+                execute_file(conn, delta_file)
+            if deltas:
+                print(f"增量导入完成（{len(deltas)} 个文件）")
+
+        # 数据就位后一次性建索引，再建触发器（导入数据时不触发）
+        for stmt in indexes:
+            conn.execute(stmt)
+        print(f"创建索引: {len(indexes)} 个")
+        triggers_file = os.path.join(sql_dir, 'database_triggers.sql')
+        if os.path.exists(triggers_file):
+            print(f"创建触发器: {execute_file(conn, triggers_file)} 条语句")
+
+        conn.execute("COMMIT")
+        conn.close()
     except Exception as e:
         print(f"导入过程中出错: {e}")
-        conn.rollback()
-    
-    finally:
         conn.close()
+        os.remove(tmp_path)
+        return False
+
+    # 替换目标数据库（旧库的 WAL 文件一并删除，避免被应用到新库上）
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.replace(tmp_path, db_path)
+    print(f"数据库导入成功！{db_path}（耗时 {time.perf_counter() - t0:.2f} 秒）")
+    return True
 
 if __name__ == '__main__':
-    import_database()
+    ok = import_database(*sys.argv[1:3])
+    sys.exit(0 if ok else 1)
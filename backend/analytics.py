@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+成绩分析
+每次交卷在同一写事务中累加到汇总表（按 试卷 × 班级），查询只读汇总表，与提交数量无关：
+- analytics_exam_class: 提交数、得分率之和/平方和、最高/最低
+- analytics_score_buckets: 得分率分布（每10%一档）
+- analytics_question: 每题的作答数、失分数以及计算难度和区分度所需的累加和
+- analytics_knowledge: 每个知识点引用的作答数和失分数
+班级取交卷时学生所在班级，未分班的记为空字符串。
+用法: python backend/analytics.py rebuild
+"""
+
+import json
+import math
+import sys
+
+from db import run_write
+
+BUCKETS = 10
+
+
+def bucket_of(rate):
+    """得分率(0~100)所在分档，100分归入最后一档"""
+    return min(int(rate // (100 / BUCKETS)), BUCKETS - 1)
+
+
+def record(c, user_id, exam_id, rate, detail):
+    """把一次交卷累加到汇总表，需在插入 submissions 的同一事务中调用"""
+    row = c.execute('SELECT class_name FROM users WHERE id=?', (user_id,)).fetchone()
+    cls = (row[0] if row else None) or ''
+    c.execute('''
+        INSERT INTO analytics_exam_class(exam_id, class_name, submissions, sum_rate, sum_rate_sq, min_rate, max_rate)
+        VALUES (?, ?, 1, ?, ?, ?, ?)
+        ON CONFLICT(exam_id, class_name) DO UPDATE SET
+          submissions = submissions + 1,
+          sum_rate = sum_rate + excluded.sum_rate,
+          sum_rate_sq = sum_rate_sq + excluded.sum_rate_sq,
+          min_rate = MIN(min_rate, excluded.min_rate),
+          max_rate = MAX(max_rate, excluded.max_rate)
+    ''', (exam_id, cls, rate, rate * rate, rate, rate))
+    c.execute('''
+        INSERT INTO analytics_score_buckets(exam_id, class_name, bucket, count) VALUES (?, ?, ?, 1)
+        ON CONFLICT(exam_id, class_name, bucket) DO UPDATE SET count = count + 1
+    ''', (exam_id, cls, bucket_of(rate)))
+    # x: 本题得分率，y: 整卷得分率，用于计算题目与总分的相关系数（区分度）
+    y = rate / 100.0
+    questions = []
+    krefs = {}
+    for q in detail:
+        x = q['score'] / q['max'] if q['max'] else 0.0
+        wrong = 1 if q['score'] < q['max'] else 0
+        questions.append((exam_id, cls, q['qid'], wrong, x, x * x, x * y, y, y * y))
+        if q.get('kref'):
+            attempts, wrongs = krefs.get(q['kref'], (0, 0))
+            krefs[q['kref']] = (attempts + 1, wrongs + wrong)
+    c.executemany('''
+        INSERT INTO analytics_question(exam_id, class_name, qid, n, wrong, sum_x, sum_x2, sum_xy, sum_y, sum_y2)
+        VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(exam_id, class_name, qid) DO UPDATE SET
+          n = n + 1,
+          wrong = wrong + excluded.wrong,
+          sum_x = sum_x + excluded.sum_x,
+          sum_x2 = sum_x2 + excluded.sum_x2,
+          sum_xy = sum_xy + excluded.sum_xy,
+          sum_y = sum_y + excluded.sum_y,
+          sum_y2 = sum_y2 + excluded.sum_y2
+    ''', questions)
+    c.executemany('''
+        INSERT INTO analytics_knowledge(exam_id, class_name, kref, attempts, wrong) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(exam_id, class_name, kref) DO UPDATE SET
+          attempts = attempts + excluded.attempts,
+          wrong = wrong + excluded.wrong
+    ''', [(exam_id, cls, kref, a, w) for kref, (a, w) in krefs.items()])
+
+
+def rebuild(c):
+    """清空汇总表并按现有提交重新累加（班级按学生当前所在班级）"""
+    for table in ('analytics_exam_class', 'analytics_score_buckets', 'analytics_question', 'analytics_knowledge'):
+        c.execute(f'DELETE FROM {table}')
+    rows = c.execute('SELECT user_id, exam_id, rate, detail FROM submissions ORDER BY id').fetchall()
+    for r in rows:
+        record(c, r['user_id'], r['exam_id'], r['rate'], json.loads(r['detail']))
+    return len(rows)
+
+
+def _class_filter(class_name):
+    if class_name is None:
+        return '', ()
+    return ' AND class_name = ?', (class_name,)
+
+
+def _std(n, total, total_sq):
+    if n < 2:
+        return 0.0
+    return math.sqrt(max(0.0, (total_sq - total * total / n) / (n - 1)))
+
+
+def discrimination(n, sx, sx2, sxy, sy, sy2):
+    """题目得分率与整卷得分率的相关系数（点二列相关），样本不足或无差异时为 None"""
+    cov = n * sxy - sx * sy
+    var = (n * sx2 - sx * sx) * (n * sy2 - sy * sy)
+    if n < 2 or var <= 1e-12:
+        return None
+    return cov / math.sqrt(var)
+
+
+def exam_overview(c):
+    """各试卷的提交数和平均得分率"""
+    rows = c.execute('''
+        SELECT a.exam_id, e.name, SUM(a.submissions) AS n, SUM(a.sum_rate) AS sum_rate,
+               MIN(a.min_rate) AS min_rate, MAX(a.max_rate) AS max_rate, COUNT(*) AS classes
+        FROM analytics_exam_class a LEFT JOIN exam_sets e ON e.id = a.exam_id
+        GROUP BY a.exam_id ORDER BY a.exam_id
+    ''').fetchall()
+    return [{
+        'exam_id': r['exam_id'],
+        'exam_name': r['name'],
+        'submissions': r['n'],
+        'avg_rate': round(r['sum_rate'] / r['n'], 2) if r['n'] else None,
+        'min_rate': r['min_rate'],
+        'max_rate': r['max_rate'],
+        'classes': r['classes'],
+    } for r in rows]
+
+
+def exam_report(c, exam_id, class_name=None, refs=None):
+    """单张试卷的分析：得分分布、各班概况、每题难度/区分度、知识点失分率
+
+    class_name 为 None 时汇总所有班级；refs 为 knowledge.KnowledgeMap，用于给知识点加上标题。
+    """
+    where, params = _class_filter(class_name)
+    args = (exam_id,) + params
+    summary = c.execute(f'''
+        SELECT SUM(submissions), SUM(sum_rate), SUM(sum_rate_sq), MIN(min_rate), MAX(max_rate)
+        FROM analytics_exam_class WHERE exam_id = ?{where}
+    ''', args).fetchone()
+    n = summary[0] or 0
+    distribution = [0] * BUCKETS
+    for bucket, count in c.execute(f'''
+        SELECT bucket, SUM(count) FROM analytics_score_buckets WHERE exam_id = ?{where} GROUP BY bucket
+    ''', args):
+        distribution[bucket] = count
+    classes = [{
+        'class_name': r['class_name'] or None,
+        'submissions': r['submissions'],
+        'avg_rate': round(r['sum_rate'] / r['submissions'], 2),
+        'min_rate': r['min_rate'],
+        'max_rate': r['max_rate'],
+    } for r in c.execute('''
+        SELECT class_name, submissions, sum_rate, min_rate, max_rate FROM analytics_exam_class
+        WHERE exam_id = ? ORDER BY class_name
+    ''', (exam_id,))]
+    questions = []
+    for r in c.execute(f'''
+        SELECT qid, SUM(n), SUM(wrong), SUM(sum_x), SUM(sum_x2), SUM(sum_xy), SUM(sum_y), SUM(sum_y2)
+        FROM analytics_question WHERE exam_id = ?{where} GROUP BY qid ORDER BY qid
+    ''', args):
+        qid, qn, wrong, sx, sx2, sxy, sy, sy2 = r
+        disc = discrimination(qn, sx, sx2, sxy, sy, sy2)
+        questions.append({
+            'qid': qid,
+            'answered': qn,
+            'difficulty': round(sx / qn, 4),
+            'discrimination': round(disc, 4) if disc is not None else None,
+            'error_rate': round(wrong / qn, 4),
+        })
+    knowledge = []
+    for kref, attempts, wrong in c.execute(f'''
+        SELECT kref, SUM(attempts), SUM(wrong) FROM analytics_knowledge WHERE exam_id = ?{where}
+        GROUP BY kref ORDER BY SUM(wrong) * 1.0 / SUM(attempts) DESC, kref
+    ''', args):
+        item = {'kref': kref, 'attempts': attempts, 'wrong': wrong, 'error_rate': round(wrong / attempts, 4)}
+        if refs is not None:
+            try:
+                item['module'], item['topic'] = refs.titles(kref)
+            except ValueError:
+                item['module'] = item['topic'] = None
+        knowledge.append(item)
+    return {
+        'exam_id': exam_id,
+        'class_name': class_name,
+        'summary': {
+            'submissions': n,
+            'avg_rate': round(summary[1] / n, 2) if n else None,
+            'std_rate': round(_std(n, summary[1], summary[2]), 2) if n else None,
+            'min_rate': summary[3],
+            'max_rate': summary[4],
+        },
+        'distribution': [{'range': f'{i * 10}-{i * 10 + 10}', 'count': cnt} for i, cnt in enumerate(distribution)],
+        'classes': classes,
+        'questions': questions,
+        'knowledge': knowledge,
+    }
+
+
+def main(argv=None):
+    args = argv if argv is not None else sys.argv[1:]
+    cmd = args[0] if args else 'rebuild'
+    if cmd != 'rebuild':
+        print('用法: python backend/analytics.py rebuild')
+        sys.exit(1)
+    import migrations
+    migrations.migrate()
+    count = run_write(rebuild)
+    print(f'✅ 已按 {count} 份提交重建成绩分析汇总表')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+响应压缩
+- init_app(app): JSON/文本响应按 Accept-Encoding 协商 br/gzip 压缩（小于阈值的不压缩）
+- precompress_assets(dir): 构建时为静态资源生成 .br/.gz，运行时由 send_precompressed 原样发送
+用法: python backend/compression.py [静态资源目录]
+"""
+
+import gzip
+import mimetypes
+import os
+import sys
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# 静态资源只在构建时压缩一次，用最高压缩率
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+COMPRESSIBLE = frozenset([
+    'application/json', 'application/javascript', 'text/javascript',
+    'text/html', 'text/css', 'text/plain', 'image/svg+xml',
+])
+STATIC_EXTENSIONS = ('.js', '.css', '.html', '.json', '.svg', '.txt')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(req):
+    """按客户端 Accept-Encoding 选择编码，优先 br"""
+    accept = req.accept_encodings
+    for enc in available_encodings():
+        if accept[enc]:
+            return enc
+    return None
+
+
+def compress(data, encoding, static=False):
+    if encoding == 'br':
+        return brotli.compress(data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(data, STATIC_GZIP_LEVEL if static else GZIP_LEVEL)
+
+
+def encoded_etag(etag, encoding):
+    """同一资源不同编码的字节不同，强ETag需要区分"""
+    return f'{etag}-{encoding}'
+
+
+def strip_etag_encoding(etag):
+    for enc in SUFFIXES:
+        if etag.endswith('-' + enc):
+            return etag[:-len(enc) - 1]
+    return etag
+
+
+def _tag_encoding(resp, encoding):
+    etag, weak = resp.get_etag()
+    if etag and not etag.endswith('-' + encoding):
+        resp.set_etag(encoded_etag(etag, encoding), weak)
+
+
+def compress_response(req, resp, min_size=MIN_SIZE):
+    encoding = resp.headers.get('Content-Encoding')
+    if encoding:
+        # 已由处理函数或静态文件预先编码
+        _tag_encoding(resp, encoding)
+        return resp
+    if (resp.status_code != 200 or resp.direct_passthrough or resp.is_streamed
+            or resp.mimetype not in COMPRESSIBLE):
+        return resp
+    resp.vary.add('Accept-Encoding')
+    data = resp.get_data()
+    if len(data) < min_size:
+        return resp
+    encoding = negotiate(req)
+    if encoding is None:
+        return resp
+    resp.set_data(compress(data, encoding))
+    resp.headers['Content-Encoding'] = encoding
+    _tag_encoding(resp, encoding)
+    return resp
+
+
+def init_app(app, min_size=MIN_SIZE):
+    @app.after_request
+    def _compress(resp):
+        return compress_response(request, resp, min_size)
+
+
+def send_precompressed(directory, path):
+    """发送静态文件，客户端支持且存在最新的 .br/.gz 预压缩文件时直接发送压缩文件"""
+    source = safe_join(directory, path)
+    if source and os.path.isfile(source):
+        mimetype = mimetypes.guess_type(path)[0]
+        accept = request.accept_encodings
+        for enc in ('br', 'gzip'):
+            if not accept[enc]:
+                continue
+            candidate = source + SUFFIXES[enc]
+            if os.path.isfile(candidate) and os.path.getmtime(candidate) >= os.path.getmtime(source):
+                resp = send_from_directory(directory, path + SUFFIXES[enc], mimetype=mimetype)
+                resp.headers['Content-Encoding'] = enc
+                resp.vary.add('Accept-Encoding')
+                return resp
+    resp = send_from_directory(directory, path)
+    resp.vary.add('Accept-Encoding')
+    return resp
+
+
+def precompress_assets(directory, min_size=MIN_SIZE):
+    """为目录下的静态资源生成 .gz（以及安装了brotli时的 .br），返回 [(文件, 原大小, {编码: 压缩后大小})]"""
+    results = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.endswith(STATIC_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            sizes = {}
+            for enc in available_encodings():
+                out = compress(data, enc, static=True)
+                with open(path + SUFFIXES[enc], 'wb') as f:
+                    f.write(out)
+                sizes[enc] = len(out)
+            results.append((path, len(data), sizes))
+    return results
+
+
+def main():
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base, 'frontend', 'assets')
+    for path, size, sizes in precompress_assets(directory):
+        detail = '  '.join(f'{enc}: {n} ({n / size:.0%})' for enc, n in sizes.items())
+        print(f'{os.path.relpath(path, base)}: {size} 字节  {detail}')
+
+
+if __name__ == '__main__':
+    main()
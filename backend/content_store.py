@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+from flask import Response
+
+import compression
+from db import get_db
+
+# 缓存的编码后内容总字节上限
+MAX_BYTES = 16 * 1024 * 1024
+
+
+class ContentBlob:
+    """一个知识点的学习内容：数据库中的JSON原文（UTF-8字节）及其压缩版本"""
+
+    __slots__ = ('tid', 'version', 'body', 'encoded', 'size')
+
+    def __init__(self, tid, version, body):
+        self.tid = tid
+        self.version = version
+        self.body = body
+        self.encoded = {}
+        if len(body) >= compression.MIN_SIZE:
+            for enc in compression.available_encodings():
+                self.encoded[enc] = compression.compress(body, enc)
+        self.size = len(body) + sum(len(v) for v in self.encoded.values())
+
+    def response(self, req):
+        """按客户端 Accept-Encoding 直接输出存储的字节，不再 json.loads/jsonify"""
+        enc = compression.negotiate(req) if self.encoded else None
+        if enc:
+            resp = Response(self.encoded[enc], mimetype='application/json')
+            resp.headers['Content-Encoding'] = enc
+        else:
+            resp = Response(self.body, mimetype='application/json')
+        resp.vary.add('Accept-Encoding')
+        return resp
+
+
+class ContentBlobStore:
+    """按 (知识点ID, 内容版本号) 缓存编码后的内容，按总字节数做LRU淘汰"""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._blobs = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, tid, version):
+        with self._lock:
+            blob = self._blobs.get(tid)
+            if blob is not None and blob.version == version:
+                self._blobs.move_to_end(tid)
+                self._stats['hits'] += 1
+                return blob
+            self._stats['misses'] += 1
+        with get_db() as c:
+            row = c.execute('SELECT data FROM contents WHERE topic_id=?', (tid,)).fetchone()
+        blob = ContentBlob(tid, version, row['data'].encode('utf-8') if row else b'{}')
+        self._put(blob)
+        return blob
+
+    def _put(self, blob):
+        with self._lock:
+            old = self._blobs.pop(blob.tid, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._blobs[blob.tid] = blob
+            self._bytes += blob.size
+            while self._bytes > self.max_bytes and len(self._blobs) > 1:
+                _, evicted = self._blobs.popitem(last=False)
+                self._bytes -= evicted.size
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._blobs.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out['entries'] = len(self._blobs)
+            out['bytes'] = self._bytes
+            out['max_bytes'] = self.max_bytes
+        return out
+
+
+blobs = ContentBlobStore()
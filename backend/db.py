@@ -0,0 +1,215 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+
+# 数据库配置
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJ_ROOT = os.path.dirname(BASE_DIR)
+DB_DIR = os.path.join(PROJ_ROOT, 'DB')
+os.makedirs(DB_DIR, exist_ok=True)
+DB_PATH = os.path.join(DB_DIR, 'app.db')
+
+# 每个连接建立时只执行一次的PRAGMA
+# WAL下 synchronous=NORMAL 只在checkpoint时fsync，掉电最多丢最后几个事务，不会损坏数据库
+CONNECTION_PRAGMAS = [
+    ('busy_timeout', 5000),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -8000),        # 每个连接约8MB页缓存
+    ('mmap_size', 64 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+]
+
+# 写操作遇到锁冲突时的重试参数
+WRITE_RETRY_ATTEMPTS = 6
+WRITE_RETRY_BASE_DELAY = 0.02
+WRITE_RETRY_MAX_DELAY = 0.5
+
+
+def is_locked_error(exc):
+    msg = str(exc).lower()
+    return 'database is locked' in msg or 'database is busy' in msg or 'database table is locked' in msg
+
+
+def configure_database(db_path=None):
+    """启动时的一次性数据库配置：切换到WAL（持久化在数据库文件上）"""
+    conn = sqlite3.connect(db_path or pool.db_path)
+    try:
+        mode = conn.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+    finally:
+        conn.close()
+    return mode
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """等待空闲连接超时"""
+
+
+class ConnectionPool:
+    """有界SQLite连接池
+
+    连接在首次 acquire() 时绑定到当前线程，同一线程内重复获取拿到的是同一个连接；
+    release() 把连接还回空闲队列供其他线程复用。连接总数不超过 max_size，
+    超出时等待其他线程归还，最长 timeout 秒。
+    """
+
+    def __init__(self, db_path, max_size=8, timeout=10.0, pragmas=None):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = CONNECTION_PRAGMAS if pragmas is None else pragmas
+        self._idle = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {
+            'connects': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'write_retries': 0,
+            'write_failures': 0,
+        }
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas:
+            conn.execute(f'PRAGMA {name}={value}')
+        return conn
+
+    def acquire(self):
+        """获取当前线程的连接（没有则从池中借出一个）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        started = None
+        with self._cond:
+            while not self._idle and self._created >= self.max_size:
+                if started is None:
+                    started = time.perf_counter()
+                    self._stats['waits'] += 1
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError('数据库连接池已耗尽')
+                self._cond.wait(remaining)
+            if started is not None:
+                waited = time.perf_counter() - started
+                self._stats['wait_time_total'] += waited
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+            self._stats['checkouts'] += 1
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                self._created += 1
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._stats['connects'] += 1
+        self._local.conn = conn
+        return conn
+
+    def release(self):
+        """归还当前线程持有的连接，未提交的事务会被回滚"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # 连接已损坏，直接丢弃
+            conn.close()
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def run_write(self, fn, attempts=WRITE_RETRY_ATTEMPTS,
+                  base_delay=WRITE_RETRY_BASE_DELAY, max_delay=WRITE_RETRY_MAX_DELAY):
+        """在一个 BEGIN IMMEDIATE 事务中执行 fn(conn) 并提交
+
+        遇到锁冲突时回滚并按指数退避（full jitter）重试，最多 attempts 次。
+        fn 可能被执行多次，不要在里面做数据库之外的副作用。
+        """
+        conn = self.acquire()
+        if conn.in_transaction:
+            conn.commit()
+        for attempt in range(1, attempts + 1):
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    result = fn(conn)
+                    conn.commit()
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+                return result
+            except sqlite3.OperationalError as e:
+                if not is_locked_error(e) or attempt >= attempts:
+                    if is_locked_error(e):
+                        with self._cond:
+                            self._stats['write_failures'] += 1
+                    raise
+                with self._cond:
+                    self._stats['write_retries'] += 1
+                time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
+
+    def close_all(self):
+        """关闭所有空闲连接"""
+        with self._cond:
+            while self._idle:
+                self._idle.pop().close()
+                self._created -= 1
+
+    def stats(self):
+        """连接池指标：建连次数、借出次数、等待次数与耗时"""
+        with self._cond:
+            out = dict(self._stats)
+            out['size'] = self._created
+            out['idle'] = len(self._idle)
+            out['in_use'] = self._created - len(self._idle)
+            out['max_size'] = self.max_size
+        return out
+
+
+pool = ConnectionPool(DB_PATH, max_size=int(os.environ.get('DB_POOL_SIZE', 8)))
+
+
+def get_db():
+    return pool.acquire()
+
+
+def run_write(fn, **kwargs):
+    return pool.run_write(fn, **kwargs)
+
+
+def data_version(c, *names):
+    """data_versions 中给定表的版本号之和（触发器在每次增删改时递增），供各级缓存判断是否失效"""
+    marks = ','.join('?' * len(names))
+    return c.execute(f'SELECT COALESCE(SUM(version), 0) FROM data_versions WHERE name IN ({marks})',
+                     names).fetchone()[0]
+
+
+def release_db(exc=None):
+    pool.release()
+
+
+def init_app(app):
+    """请求结束时归还连接"""
+    app.teardown_appcontext(release_db)
@@ -0,0 +1,80 @@
+"""
+每题作答结果表 answers(submission_id, qid, score, max, qtype, kref, ord)
+交卷时与 submissions 在同一事务中写入；按题目查询（谁做错了某题、某题得分率）走 qid 索引，
+不再需要逐行解析 submissions.detail。detail 仍原样保存，作为交卷时的完整快照；
+qtype/kref/ord（题型、知识点、在试卷中的位置）同样取自交卷时的快照，之后修改或删除题目不影响历史成绩。
+"""
+
+BACKFILL_SQL = '''
+    INSERT OR IGNORE INTO answers(submission_id, qid, score, max, qtype, kref, ord)
+    SELECT s.id, json_extract(j.value, '$.qid'), json_extract(j.value, '$.score'), json_extract(j.value, '$.max'),
+           json_extract(j.value, '$.type'), json_extract(j.value, '$.kref'), j.key
+    FROM submissions s, json_each(s.detail) j
+    WHERE json_valid(s.detail) AND json_extract(j.value, '$.qid') IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM answers a WHERE a.submission_id = s.id)
+'''
+
+# 迁移 12 建表时还没有快照字段，这时只补得分（迁移 15 再按快照重写）
+SCORES_SQL = '''
+    INSERT OR IGNORE INTO answers(submission_id, qid, score, max)
+    SELECT s.id, json_extract(j.value, '$.qid'), json_extract(j.value, '$.score'), json_extract(j.value, '$.max')
+    FROM submissions s, json_each(s.detail) j
+    WHERE json_valid(s.detail) AND json_extract(j.value, '$.qid') IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM answers a WHERE a.submission_id = s.id)
+'''
+
+# 迁移前写入的记录只有得分：删掉后按 detail 快照重新写入（得分本来就取自 detail），比逐行 UPDATE 快得多
+STALE_SQL = 'DELETE FROM answers WHERE submission_id IN (SELECT DISTINCT submission_id FROM answers WHERE ord IS NULL)'
+
+
+def record(c, submission_id, detail):
+    """写入一次交卷的每题结果，需在插入 submissions 的同一事务中调用"""
+    c.executemany('INSERT INTO answers(submission_id, qid, score, max, qtype, kref, ord) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                  [(submission_id, q['qid'], q['score'], q['max'], q.get('type'), q.get('kref'), i)
+                   for i, q in enumerate(detail)])
+
+
+def backfill(c):
+    """从 submissions.detail 补齐还没有作答记录的提交（可重复执行），返回写入的行数"""
+    columns = {r[1] for r in c.execute('PRAGMA table_info(answers)')}
+    return c.execute(BACKFILL_SQL if 'ord' in columns else SCORES_SQL).rowcount
+
+
+def backfill_snapshot(c):
+    """为迁移前写入的记录补上交卷时的题型、知识点和位置，返回重新写入的行数"""
+    c.execute(STALE_SQL)
+    return backfill(c)
+
+
+def submission_detail(c, submission_id):
+    """按交卷时的顺序返回每题结果；题型和知识点来自交卷快照，只有题干取自 questions（题目已删除时为 None）"""
+    return c.execute('''
+        SELECT a.qid, a.qtype, a.score, a.max, a.kref, q.prompt
+        FROM answers a LEFT JOIN questions q ON q.id = a.qid
+        WHERE a.submission_id = ?
+        ORDER BY a.ord, a.qid
+    ''', (submission_id,)).fetchall()
+
+
+def question_misses(c, qid, limit=200):
+    """做错（未得满分）某道题的提交，按提交时间倒序"""
+    return c.execute('''
+        SELECT s.id AS submission_id, s.exam_id, s.created_at, a.score, a.max,
+               u.id AS user_id, u.name, u.student_id, u.class_name
+        FROM answers a
+        JOIN submissions s ON s.id = a.submission_id
+        LEFT JOIN users u ON u.id = s.user_id
+        WHERE a.qid = ? AND a.score < a.max
+        ORDER BY a.submission_id DESC LIMIT ?
+    ''', (qid, limit)).fetchall()
+
+
+def question_summary(c, qid):
+    """某道题的作答次数、失分次数和平均得分率"""
+    row = c.execute('''
+        SELECT COUNT(*), COALESCE(SUM(score < max), 0),
+               AVG(CASE WHEN max > 0 THEN score * 1.0 / max ELSE 0 END)
+        FROM answers WHERE qid = ?
+    ''', (qid,)).fetchone()
+    return {'qid': qid, 'answered': row[0], 'wrong': row[1],
+            'avg_rate': round(row[2], 4) if row[2] is not None else None}
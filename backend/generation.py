@@ -0,0 +1,342 @@
+"""
+知识点内容生成（大模型）
+- Provider: 生成服务接口，OpenAIProvider 调用 OpenAI，StubProvider 为离线桩（固定延迟、确定性输出）
+- 结果缓存: 按 (服务, 模型, 提示词) 的哈希保存在 generation_cache 表，相同提示词不会重复付费调用
+- GenerationQueue: 生成任务记录在 generation_jobs 表，由有界线程池在后台执行，或在请求线程中流式执行（SSE）；
+  同一知识点已有排队/进行中的任务时直接返回该任务，不会重复提交
+通过环境变量 LLM_PROVIDER=openai|stub|local 选择服务（默认有 OPENAI_API_KEY 时用 OpenAI，否则只用本地模板）。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from openai import OpenAI
+except Exception:
+    OpenAI = None
+
+import db
+from db import get_db, run_write
+from http_cache import content_version
+
+WORKERS = int(os.environ.get('GENERATION_WORKERS', 4))
+# 排队和进行中的任务总数上限，超过时拒绝新任务
+MAX_PENDING = 100
+DEFAULT_MODEL = 'gpt-4o-mini'
+SYSTEM_PROMPT = '你是严谨而耐心的教学助理。'
+# 排队中或进行中的任务
+ACTIVE = "status IN ('queued', 'running')"
+
+logger = logging.getLogger(__name__)
+
+
+def build_prompt(module_title, topic_ord):
+    return (f"你是资深大数据讲师。面向零基础学员，用通俗易懂的语言讲解模块《{module_title}》中‘知识点{topic_ord}’的内容。"
+            "输出分为：1) 理论讲解（分点+比喻），2) 示例代码（含注释），3) 案例分析（一步步推演），4) 练习（3题），5) 小结（3条）。"
+            "用中文，适当加入实践建议。")
+
+
+class Provider:
+    """生成服务接口：complete 返回完整文本，stream 逐段产出文本（默认一次性产出）"""
+
+    name = 'base'
+    model = ''
+
+    def complete(self, system, prompt):
+        raise NotImplementedError
+
+    def stream(self, system, prompt):
+        yield self.complete(system, prompt)
+
+
+class OpenAIProvider(Provider):
+    name = 'openai'
+
+    def __init__(self, api_key, model=DEFAULT_MODEL, temperature=0.3):
+        if OpenAI is None:
+            raise RuntimeError('需要安装 openai: pip install openai')
+        # 客户端内部有连接池，整个进程共用一个
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+        self.temperature = temperature
+
+    def _messages(self, system, prompt):
+        return [{'role': 'system', 'content': system}, {'role': 'user', 'content': prompt}]
+
+    def complete(self, system, prompt):
+        comp = self.client.chat.completions.create(
+            model=self.model, messages=self._messages(system, prompt), temperature=self.temperature)
+        return comp.choices[0].message.content
+
+    def stream(self, system, prompt):
+        chunks = self.client.chat.completions.create(
+            model=self.model, messages=self._messages(system, prompt), temperature=self.temperature, stream=True)
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class StubProvider(Provider):
+    """离线桩：latency 秒后返回由提示词决定的固定文本，用于压测和本地测试
+
+    fail_rate 为每次调用随机失败的概率，用于测试重试；stream 按 token_delay 间隔分段产出，模拟流式输出。
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency=0.0, model='stub', fail_rate=0.0, token_delay=0.0, chunk_size=8):
+        self.latency = latency
+        self.model = model
+        self.fail_rate = fail_rate
+        self.token_delay = token_delay
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, system, prompt):
+        return ''.join(self.stream(system, prompt))
+
+    def stream(self, system, prompt):
+        """首段在 latency 秒后产出，之后每 token_delay 秒产出 chunk_size 个字符"""
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            raise RuntimeError('stub: 模拟调用失败')
+        digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+        text = f'【离线生成 {digest}】\n{prompt}'
+        for i in range(0, len(text), self.chunk_size):
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            yield text[i:i + self.chunk_size]
+
+
+def provider_from_env():
+    """按环境变量创建生成服务；返回 None 表示只使用本地模板内容"""
+    kind = os.environ.get('LLM_PROVIDER', '').lower()
+    if kind == 'stub':
+        return StubProvider(latency=float(os.environ.get('LLM_STUB_LATENCY', 0)),
+                            token_delay=float(os.environ.get('LLM_STUB_TOKEN_DELAY', 0)))
+    if kind == 'local':
+        return None
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if api_key and OpenAI is not None:
+        return OpenAIProvider(api_key, model=os.environ.get('OPENAI_MODEL', DEFAULT_MODEL))
+    return None
+
+
+def prompt_key(provider, system, prompt):
+    raw = json.dumps([provider.name, provider.model, system, prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def cached_text(c, key):
+    row = c.execute('SELECT text FROM generation_cache WHERE prompt_hash=?', (key,)).fetchone()
+    return row[0] if row else None
+
+
+def store_text(c, key, provider, text):
+    c.execute('INSERT OR REPLACE INTO generation_cache(prompt_hash, provider, model, text, created_at) '
+              'VALUES(?,?,?,?,?)', (key, provider.name, provider.model, text, time.time()))
+
+
+def topic_context(c, topic_id):
+    return c.execute('SELECT t.id AS tid, t.ord AS tord, m.id AS mid, m.title AS mtitle '
+                     'FROM topics t JOIN modules m ON t.module_id=m.id WHERE t.id=?', (topic_id,)).fetchone()
+
+
+def save_content(c, topic_id, data):
+    """写入知识点内容（在调用方的事务中）"""
+    c.execute('UPDATE contents SET data=? WHERE topic_id=?', (json.dumps(data, ensure_ascii=False), topic_id))
+
+
+def _fmt_time(ts):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)) if ts else None
+
+
+def job_dict(row):
+    return {
+        'id': row['id'],
+        'topic_id': row['topic_id'],
+        'status': row['status'],
+        'provider': row['provider'],
+        'cached': bool(row['cached']),
+        # 从开始执行到拿到第一段输出的秒数
+        'ttft': round(row['ttft'], 3) if row['ttft'] is not None else None,
+        'error': row['error'],
+        'created_at': _fmt_time(row['created_at']),
+        'started_at': _fmt_time(row['started_at']),
+        'finished_at': _fmt_time(row['finished_at']),
+        'elapsed': round(row['finished_at'] - row['started_at'], 3)
+        if row['finished_at'] and row['started_at'] else None,
+    }
+
+
+class QueueFull(Exception):
+    pass
+
+
+class GenerationQueue:
+    """后台生成队列
+
+    template(模块标题, 知识点序号) 返回本地模板内容，大模型输出替换其中的 theory。
+    调用失败时任务标记为 failed，已有内容保持不变。进程重启后 queued/running 的任务由 resume() 重新执行。
+    """
+
+    def __init__(self, template, provider=None, workers=WORKERS, max_pending=MAX_PENDING):
+        self.template = template
+        self.provider = provider if provider is not None else provider_from_env()
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='generation')
+            return self._executor
+
+    def claim(self, topic_id):
+        """登记知识点的生成任务，返回 (任务ID, 是否新建)；同一知识点已有未完成任务时返回该任务，队列已满时抛出 QueueFull"""
+        provider_name = self.provider.name if self.provider else 'local'
+
+        def create(c):
+            # 在写事务中检查，多个进程同时提交同一知识点也只会有一个任务
+            row = c.execute(f'SELECT id FROM generation_jobs WHERE {ACTIVE} AND topic_id=? '
+                            'ORDER BY id LIMIT 1', (topic_id,)).fetchone()
+            if row:
+                return row[0], False
+            pending = c.execute(f'SELECT COUNT(*) FROM generation_jobs WHERE {ACTIVE}').fetchone()[0]
+            if pending >= self.max_pending:
+                raise QueueFull(f'生成队列已满（{pending} 个任务），请稍后重试')
+            cur = c.execute('INSERT INTO generation_jobs(topic_id, provider, created_at) VALUES(?,?,?)',
+                            (topic_id, provider_name, time.time()))
+            return cur.lastrowid, True
+
+        return run_write(create)
+
+    def submit(self, topic_id):
+        """提交到后台线程池执行，返回 (任务ID, 是否新建)"""
+        job_id, created = self.claim(topic_id)
+        if created:
+            self._pool().submit(self._run, job_id, topic_id)
+        return job_id, created
+
+    def resume(self):
+        """重新执行上次进程退出时未完成的任务"""
+        with get_db() as c:
+            rows = c.execute(f'SELECT id, topic_id FROM generation_jobs WHERE {ACTIVE} ORDER BY id'
+                             ).fetchall()
+        for r in rows:
+            self._pool().submit(self._run, r['id'], r['topic_id'])
+        return len(rows)
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+    def _finish(self, c, job_id, status, error=None, key=None, cached=False, ttft=None):
+        c.execute('UPDATE generation_jobs SET status=?, error=?, prompt_hash=?, cached=?, ttft=?, finished_at=? '
+                  'WHERE id=?', (status, error, key, 1 if cached else 0, ttft, time.time(), job_id))
+
+    def _fail(self, job_id, error, key=None):
+        run_write(lambda c: self._finish(c, job_id, 'failed', error, key))
+        return 'error', {'job_id': job_id, 'error': error}
+
+    def events(self, job_id, topic_id, stream=False):
+        """在当前线程执行已登记的任务，依次产出事件 (类型, 数据)
+
+        stream=True 时边生成边产出 ('token', {'text': 片段})；最后产出 ('done', 任务信息) 或 ('error', 错误)。
+        内容和结果缓存在生成结束后一个事务中写入；中途断开（生成器被关闭）时任务记为失败，已有内容不变。
+        """
+        finished = False
+        try:
+            started = time.time()
+            run_write(lambda c: c.execute(
+                "UPDATE generation_jobs SET status='running', started_at=? WHERE id=?", (started, job_id)))
+            with get_db() as c:
+                r = topic_context(c, topic_id)
+            if not r:
+                finished = True
+                yield self._fail(job_id, 'topic not found')
+                return
+            data = self.template(r['mtitle'], r['tord'])
+            key = text = ttft = None
+            cached = False
+            if self.provider is not None:
+                prompt = build_prompt(r['mtitle'], r['tord'])
+                key = prompt_key(self.provider, SYSTEM_PROMPT, prompt)
+                with get_db() as c:
+                    text = cached_text(c, key)
+                # 调用生成服务要几秒，期间不占用连接池；之后的 run_write 会重新取连接
+                db.release_db()
+                cached = text is not None
+                try:
+                    if cached:
+                        ttft = time.time() - started
+                        if stream:
+                            yield 'token', {'text': text}
+                    elif stream:
+                        parts = []
+                        for piece in self.provider.stream(SYSTEM_PROMPT, prompt):
+                            if ttft is None:
+                                ttft = time.time() - started
+                            parts.append(piece)
+                            yield 'token', {'text': piece}
+                        text = ''.join(parts)
+                    else:
+                        text = self.provider.complete(SYSTEM_PROMPT, prompt)
+                        ttft = time.time() - started
+                except GeneratorExit:
+                    raise
+                except Exception as e:
+                    finished = True
+                    yield self._fail(job_id, f'生成服务调用失败: {e}', key)
+                    return
+                if text:
+                    data['theory'] = text
+
+            def save(c):
+                if key is not None and not cached and text:
+                    store_text(c, key, self.provider, text)
+                save_content(c, topic_id, data)
+                self._finish(c, job_id, 'done', key=key, cached=cached, ttft=ttft)
+            run_write(save)
+            finished = True
+            content_version.bump()
+            yield 'done', get_job(job_id)
+        except GeneratorExit:
+            raise
+        except Exception as e:
+            logger.exception('生成任务 %s（知识点 %s）异常', job_id, topic_id)
+            if not finished:
+                finished = True
+                yield self._fail(job_id, str(e))
+        finally:
+            if not finished:
+                # 流式输出时客户端断开
+                try:
+                    self._fail(job_id, '连接中断，生成未完成')
+                except Exception:
+                    pass
+            db.release_db()
+
+    def _run(self, job_id, topic_id):
+        for _ in self.events(job_id, topic_id):
+            pass
+
+
+def get_job(job_id):
+    with get_db() as c:
+        row = c.execute('SELECT * FROM generation_jobs WHERE id=?', (job_id,)).fetchone()
+    return job_dict(row) if row else None
@@ -0,0 +1,123 @@
+import json
+import threading
+from collections import namedtuple
+
+from db import data_version
+
+# 判断题可接受的作答写法
+TRUE_WORDS = frozenset(['true', 't', '1', '是', '对'])
+FALSE_WORDS = frozenset(['false', 'f', '0', '否', '错'])
+
+# 编译后的题目：expected 为归一化后的标准答案，short 题为小写关键词元组
+CompiledQuestion = namedtuple('CompiledQuestion', 'qid skey qtype expected score kref')
+GradeResult = namedtuple('GradeResult', 'got total detail wrong_qids')
+
+
+class AnswerKey:
+    """一套试卷编译后的只读答案"""
+
+    __slots__ = ('exam_id', 'version', 'questions', 'total')
+
+    def __init__(self, exam_id, version, questions):
+        self.exam_id = exam_id
+        self.version = version
+        self.questions = tuple(questions)
+        self.total = sum(q.score for q in self.questions)
+
+
+def compile_question(row):
+    qid, qtype, ans, score = row['id'], row['qtype'], row['answer'], row['score']
+    if qtype == 'mcq':
+        expected = ans.upper()
+    elif qtype == 'tf':
+        # 与原评分一致：标准答案只认 'True' / 'False'
+        expected = TRUE_WORDS if ans == 'True' else FALSE_WORDS if ans == 'False' else frozenset()
+    elif qtype == 'fill':
+        expected = ans.lower()
+    else:  # short
+        try:
+            kw = json.loads(ans).get('keywords', [])
+        except Exception:
+            kw = []
+        expected = tuple(k.lower() for k in kw)
+    return CompiledQuestion(qid, str(qid), qtype, expected, score, row['knowledge_ref'])
+
+
+def compile_key(exam_id, version, rows):
+    return AnswerKey(exam_id, version, [compile_question(r) for r in rows])
+
+
+def grade(key, answers):
+    """一次遍历完成评分，answers 为 {qid: 作答}（qid 可为字符串或整数）"""
+    got = 0
+    detail = []
+    wrong_qids = []
+    get = answers.get
+    for q in key.questions:
+        ua = get(q.skey) or get(q.qid)
+        score = q.score
+        qtype = q.qtype
+        if qtype == 'mcq':
+            s = score if str(ua).strip().upper() == q.expected else 0
+        elif qtype == 'tf':
+            s = score if str(ua).strip().lower() in q.expected else 0
+        elif qtype == 'fill':
+            s = score if str(ua).strip().lower() == q.expected else 0
+        else:
+            kw = q.expected
+            part = 0.0
+            if kw:
+                text = str(ua or '').lower()
+                part = min(1.0, sum(1 for k in kw if k in text) / len(kw))
+            s = score if part > 0.6 else (int(score * part) if part > 0 else 0)
+        if s < score:
+            wrong_qids.append(q.qid)
+        got += s
+        detail.append({'qid': q.qid, 'type': qtype, 'score': s, 'max': score, 'kref': q.kref})
+    return GradeResult(got, key.total, detail, wrong_qids)
+
+
+class AnswerKeyCache:
+    """按试卷ID缓存编译后的答案
+
+    questions 表的增删改由触发器递增 data_versions 中的版本号，
+    版本变化后所有缓存的答案失效，跨进程修改题目同样能感知。
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'compiles': 0}
+
+    def get(self, c, exam_id):
+        version = data_version(c, 'questions')
+        key = self._keys.get(exam_id)
+        if key is not None and key.version == version:
+            self._stats['hits'] += 1
+            return key
+        # 原交卷实现没有索引、按 rowid 顺序扫描；按 id 排序使 detail 中各题的顺序与之相同（不随索引变化）
+        rows = c.execute('SELECT id,qtype,answer,score,knowledge_ref FROM questions WHERE exam_id=? ORDER BY id',
+                         (exam_id,)).fetchall()
+        key = compile_key(exam_id, version, rows)
+        with self._lock:
+            # 题目版本变化后，其他试卷的旧答案也一并丢弃
+            keys = {k: v for k, v in self._keys.items() if v.version == version}
+            keys[exam_id] = key
+            self._keys = keys
+            self._stats['compiles'] += 1
+        return key
+
+    def invalidate(self, exam_id=None):
+        with self._lock:
+            if exam_id is None:
+                self._keys = {}
+            else:
+                self._keys.pop(exam_id, None)
+
+    def stats(self):
+        out = dict(self._stats)
+        out['cached'] = len(self._keys)
+        return out
+
+
+answer_keys = AnswerKeyCache()
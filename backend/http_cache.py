@@ -0,0 +1,96 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import request, make_response
+
+import compression
+from db import data_version, get_db
+
+# 参与内容版本号计算的表：学习模块、知识点、学习内容、试卷列表（各接口只用它依赖的那几张）
+CONTENT_TABLES = ('modules', 'topics', 'contents', 'exam_sets')
+# 两次读取数据库版本号的最小间隔（秒）；本进程内的写入会立即生效，
+# 种子脚本等外部进程的修改最多延迟这么久被感知
+CHECK_INTERVAL = 1.0
+# 浏览器每次都带 If-None-Match 回源校验，命中时只返回 304
+CACHE_CONTROL = 'public, no-cache'
+
+
+class ContentVersion:
+    """内容版本号：data_versions 中给定几张表的版本之和（触发器在每次写入时递增），按表组合分别缓存"""
+
+    def __init__(self, interval=CHECK_INTERVAL):
+        self.interval = interval
+        # 表组合 -> (版本号, 读取时间)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _read(self, tables):
+        with get_db() as c:
+            return data_version(c, *tables)
+
+    def current(self, tables=CONTENT_TABLES):
+        now = time.monotonic()
+        hit = self._versions.get(tables)
+        if hit is not None and now - hit[1] < self.interval:
+            return hit[0]
+        version = self._read(tables)
+        with self._lock:
+            self._versions[tables] = (version, now)
+        return version
+
+    def bump(self):
+        """本进程写入内容后调用，下一次请求立即重新读取版本号"""
+        with self._lock:
+            self._versions.clear()
+
+
+content_version = ContentVersion()
+
+
+def resource_etag(version):
+    """ETag = 请求路径和查询参数的摘要 + 所依赖表的版本号，不同资源的ETag互不相同"""
+    resource = request.path.encode('utf-8') + b'?' + request.query_string
+    return f'{hashlib.sha1(resource).hexdigest()[:16]}-{version}'
+
+
+def not_modified(etag, weak=False):
+    resp = make_response('', 304)
+    resp.set_etag(etag, weak=weak)
+    resp.vary.add('Accept-Encoding')
+    return resp
+
+
+def conditional(*tables):
+    """为只读内容接口加上强ETag，客户端缓存仍有效时直接返回304，不访问数据库
+
+    tables 为接口依赖的内容表，只有这些表的写入才使它的ETag失效。
+    版本号只存在库中、没有修改时间，不发 Last-Modified（按进程内首次看到新版本的时间发送会在重启后变化）。
+    """
+    tables = tables or CONTENT_TABLES
+
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag = resource_etag(content_version.current(tables))
+            if_none_match = request.if_none_match
+            # If-None-Match 按弱比较（RFC 9110 13.1.2），W/ 前缀不影响匹配；
+            # 压缩后的响应ETag带有编码后缀（见 compression.encoded_etag），比较时去掉；
+            # 304 原样带回客户端持有的那个ETag，与它缓存的200响应一致
+            matched = [t for t in if_none_match.as_set(include_weak=True)
+                       if compression.strip_etag_encoding(t) == etag]
+            if matched:
+                resp = not_modified(matched[0], weak=if_none_match.is_weak(matched[0]))
+            else:
+                resp = make_response(fn(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+                resp.set_etag(etag)
+                if if_none_match.star_tag:
+                    # If-None-Match: * 在资源存在（接口返回200）时即命中
+                    resp = not_modified(etag)
+            resp.headers['Cache-Control'] = CACHE_CONTROL
+            return resp
+        return wrapper
+    return deco
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from openpyxl import load_workbook
+
+import db
+import student_import
+from db import get_db, run_write
+
+# 没有新任务时后台线程的轮询间隔（秒）；提交任务时会立即唤醒
+POLL_INTERVAL = 5.0
+# 任务记录中保存的错误信息条数上限，总数见 error_count
+MAX_STORED_ERRORS = 200
+ACTIVE_STATUSES = ('queued', 'running')
+# running 任务超过这么久没有提交进度，视为处理它的进程已退出，可被重新领取（每批导入都会刷新 updated_at）
+LEASE_TIMEOUT = 300.0
+
+logger = logging.getLogger(__name__)
+
+
+def upload_dir():
+    """上传的名单保存在数据库旁边，进程重启后可以继续导入"""
+    return os.path.join(os.path.dirname(os.path.abspath(db.pool.db_path)), 'import_jobs')
+
+
+def _fmt_time(ts):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)) if ts else None
+
+
+def job_dict(row):
+    """任务记录转为接口输出：进度、错误和吞吐量（行/秒）"""
+    end = row['finished_at'] or (time.time() if row['status'] == 'running' else row['updated_at'])
+    elapsed = end - row['started_at'] if row['started_at'] and end else 0.0
+    total = row['total_rows']
+    return {
+        'id': row['id'],
+        'status': row['status'],
+        'filename': row['filename'],
+        'total_rows': total,
+        'rows_done': row['rows_done'],
+        'progress': round(row['rows_done'] * 100.0 / total, 1) if total else None,
+        'imported': row['imported'],
+        'updated': row['updated'],
+        'error_count': row['error_count'],
+        'errors': json.loads(row['errors']),
+        'error': row['error'],
+        'elapsed': round(elapsed, 3),
+        'rows_per_sec': round(row['rows_done'] / elapsed, 1) if elapsed > 0 else None,
+        'created_at': _fmt_time(row['created_at']),
+        'started_at': _fmt_time(row['started_at']),
+        'finished_at': _fmt_time(row['finished_at']),
+    }
+
+
+def create_job(upload, fmt='roster'):
+    """保存上传的文件并创建排队中的任务，返回任务ID；文件无法解析时抛出 ValueError"""
+    os.makedirs(upload_dir(), exist_ok=True)
+    path = os.path.join(upload_dir(), f'{uuid.uuid4().hex}.xlsx')
+    upload.save(path)
+    try:
+        wb = load_workbook(filename=path, read_only=True)
+        total = wb.active.max_row - 1 if wb.active.max_row else None
+        wb.close()
+    except Exception as e:
+        os.remove(path)
+        raise ValueError(f'文件无法解析：{e}')
+    job_id = run_write(lambda c: c.execute(
+        'INSERT INTO import_jobs(format, filename, file_path, total_rows, created_at) VALUES(?,?,?,?,?)',
+        (fmt, upload.filename, path, total, time.time())).lastrowid)
+    runner.wake()
+    return job_id
+
+
+def get_job(job_id):
+    with get_db() as c:
+        row = c.execute('SELECT * FROM import_jobs WHERE id=?', (job_id,)).fetchone()
+    return job_dict(row) if row else None
+
+
+def list_jobs(limit=20):
+    with get_db() as c:
+        rows = c.execute('SELECT * FROM import_jobs ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+    return [job_dict(r) for r in rows]
+
+
+class ImportJobRunner:
+    """后台导入线程：按提交顺序逐个处理任务，同一时间只有一个导入在写数据库
+
+    任务在写事务中领取（queued -> running），多个进程同时运行时同一任务只会被一个进程处理。
+    进度与数据在同一事务中提交；进程退出后它的 running 任务在租约过期（lease_timeout 秒）后
+    被重新领取，从最后提交的行继续。
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL, lease_timeout=LEASE_TIMEOUT):
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='import-jobs', daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            job = None
+            try:
+                job = self._claim()
+                if job is not None:
+                    self._run(job)
+            except Exception:
+                logger.exception('导入任务处理异常（任务 %s）', job['id'] if job is not None else '-')
+                job = None
+            finally:
+                db.release_db()
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _claim(self):
+        """领取最早的排队任务或租约已过期的运行中任务，没有时返回 None"""
+        def claim(c):
+            now = time.time()
+            row = c.execute("""
+                SELECT * FROM import_jobs
+                WHERE status = 'queued' OR (status = 'running' AND updated_at < ?)
+                ORDER BY id LIMIT 1
+            """, (now - self.lease_timeout,)).fetchone()
+            if row is None:
+                return None
+            # 只有状态和租约时间都没变时才领取成功
+            cur = c.execute("""
+                UPDATE import_jobs SET status='running', started_at=COALESCE(started_at, ?), updated_at=?
+                WHERE id=? AND status=? AND updated_at IS ?
+            """, (now, now, row['id'], row['status'], row['updated_at']))
+            return row if cur.rowcount == 1 else None
+        return run_write(claim)
+
+    def _finish(self, job_id, status, error=None):
+        run_write(lambda c: c.execute(
+            "UPDATE import_jobs SET status=?, error=?, finished_at=?, updated_at=? WHERE id=? AND status='running'",
+            (status, error, time.time(), time.time(), job_id)))
+
+    def _run(self, job):
+        job_id = job['id']
+        if not os.path.exists(job['file_path']):
+            self._finish(job_id, 'failed', '上传的文件已丢失，无法继续导入')
+            return
+        stored = json.loads(job['errors'])
+        # 只保存了前 MAX_STORED_ERRORS 条错误，总数从已有计数继续累加
+        dropped = job['error_count'] - len(stored)
+
+        def checkpoint(c, done, result):
+            c.execute('''
+                UPDATE import_jobs SET rows_done=?, imported=?, updated=?, error_count=?, errors=?, updated_at=?
+                WHERE id=?
+            ''', (done, result.imported, result.updated, dropped + len(result.errors),
+                  json.dumps(result.errors[:MAX_STORED_ERRORS], ensure_ascii=False), time.time(), job_id))
+
+        try:
+            student_import.import_students(
+                job['file_path'], student_import.FORMATS[job['format']],
+                start_row=job['rows_done'],
+                result=student_import.ImportResult(job['imported'], job['updated'], stored),
+                checkpoint=checkpoint)
+        except Exception as e:
+            logger.exception('导入任务 %s 失败（%s，第 %s 行起）', job_id, job['format'], job['rows_done'])
+            self._finish(job_id, 'failed', str(e))
+        else:
+            self._finish(job_id, 'done')
+        try:
+            os.remove(job['file_path'])
+        except OSError:
+            pass
+
+
+runner = ImportJobRunner()
@@ -0,0 +1,68 @@
+import threading
+
+from db import data_version
+
+
+def parse_kref(kref):
+    """知识点引用格式为 '模块ID:知识点序号'"""
+    mid, tord = map(int, str(kref).split(':'))
+    return mid, tord
+
+
+class KnowledgeMap:
+    """某一版本的 模块/知识点 标题表（只读）"""
+
+    __slots__ = ('version', 'modules', 'topics')
+
+    def __init__(self, version, modules, topics):
+        self.version = version
+        self.modules = modules
+        self.topics = topics
+
+    def titles(self, kref):
+        """返回 (模块标题, 知识点标题)，不存在的为 None；引用格式错误时抛出 ValueError"""
+        mid, tord = parse_kref(kref)
+        return self.modules.get(mid), self.topics.get((mid, tord))
+
+
+class KnowledgeRefResolver:
+    """缓存 knowledge_ref -> 标题 的映射
+
+    modules/topics 表变化时触发器会递增 data_versions 中的版本号，版本变化后整表重新加载。
+    """
+
+    def __init__(self):
+        self._map = None
+        self._lock = threading.Lock()
+
+    def get(self, c):
+        version = data_version(c, 'modules', 'topics')
+        current = self._map
+        if current is not None and current.version == version:
+            return current
+        modules = {}
+        topics = {}
+        rows = c.execute('''
+            SELECT 'm' AS kind, id AS mid, NULL AS tord, title, id AS rid FROM modules
+            UNION ALL
+            SELECT 't', module_id, ord, title, id FROM topics
+            ORDER BY rid
+        ''').fetchall()
+        for kind, mid, tord, title, _ in rows:
+            if kind == 'm':
+                modules[mid] = title
+            else:
+                # 同一模块下重复序号时取ID最小的一条
+                topics.setdefault((mid, tord), title)
+        current = KnowledgeMap(version, modules, topics)
+        with self._lock:
+            self._map = current
+        return current
+
+    def invalidate(self):
+        with self._lock:
+            self._map = None
+
+
+resolver = KnowledgeRefResolver()
+
@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库结构版本管理
+每个迁移有一个递增的版本号，已执行的版本记录在 schema_migrations 表中。
+用法: python backend/migrations.py [status|migrate|explain]
+"""
+
+import re
+import sqlite3
+import sys
+
+import analytics
+import exam_answers
+import db
+import student_stats
+from db import run_write
+
+
+class SchemaError(RuntimeError):
+    """数据库结构与程序不匹配"""
+
+
+SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS modules (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  title TEXT NOT NULL,
+  description TEXT,
+  ord INTEGER
+);
+CREATE TABLE IF NOT EXISTS topics (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  module_id INTEGER NOT NULL,
+  title TEXT NOT NULL,
+  ord INTEGER,
+  FOREIGN KEY(module_id) REFERENCES modules(id)
+);
+CREATE TABLE IF NOT EXISTS contents (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  topic_id INTEGER NOT NULL,
+  data TEXT NOT NULL,
+  FOREIGN KEY(topic_id) REFERENCES topics(id)
+);
+CREATE TABLE IF NOT EXISTS exam_sets (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  exam_id INTEGER NOT NULL,
+  qtype TEXT NOT NULL,
+  prompt TEXT NOT NULL,
+  options TEXT,
+  answer TEXT NOT NULL,
+  score INTEGER NOT NULL,
+  ord INTEGER,
+  knowledge_ref TEXT,
+  FOREIGN KEY(exam_id) REFERENCES exam_sets(id)
+);
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  username TEXT UNIQUE,
+  student_id TEXT UNIQUE,
+  name TEXT,
+  role TEXT NOT NULL DEFAULT 'student',
+  password_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL,
+  token TEXT NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY(user_id) REFERENCES users(id)
+);
+CREATE TABLE IF NOT EXISTS submissions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL,
+  exam_id INTEGER NOT NULL,
+  score INTEGER NOT NULL,
+  total INTEGER NOT NULL,
+  rate REAL NOT NULL,
+  detail TEXT NOT NULL,
+  wrong_qids TEXT,
+  suggestions TEXT,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY(user_id) REFERENCES users(id),
+  FOREIGN KEY(exam_id) REFERENCES exam_sets(id)
+);
+'''
+
+
+def add_columns(table, columns):
+    """补齐旧数据库缺失的字段（早期版本通过 ALTER TABLE 临时添加）"""
+    def step(c):
+        existing = {r[1] for r in c.execute(f'PRAGMA table_info({table})')}
+        for name, decl in columns:
+            if name not in existing:
+                c.execute(f'ALTER TABLE {table} ADD COLUMN {name} {decl}')
+    return step
+
+
+def version_triggers(table):
+    """表的增删改都递增 data_versions 中对应的版本号，供各级缓存判断是否失效"""
+    stmts = [f"INSERT OR IGNORE INTO data_versions(name, version) VALUES('{table}', 1)"]
+    for event, suffix in (('INSERT', 'ai'), ('UPDATE', 'au'), ('DELETE', 'ad')):
+        stmts.append(f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_{suffix} AFTER {event} ON {table}
+        BEGIN
+          UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+        END''')
+    return stmts
+
+
+STUDENT_FTS_TRIGGERS = [
+    '''CREATE TRIGGER IF NOT EXISTS trg_users_fts_ai AFTER INSERT ON users
+    BEGIN
+      INSERT INTO students_fts(rowid, name, student_id, class_name)
+      VALUES (new.id, new.name, new.student_id, new.class_name);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_users_fts_ad AFTER DELETE ON users
+    BEGIN
+      INSERT INTO students_fts(students_fts, rowid, name, student_id, class_name)
+      VALUES ('delete', old.id, old.name, old.student_id, old.class_name);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_users_fts_au AFTER UPDATE OF name, student_id, class_name ON users
+    BEGIN
+      INSERT INTO students_fts(students_fts, rowid, name, student_id, class_name)
+      VALUES ('delete', old.id, old.name, old.student_id, old.class_name);
+      INSERT INTO students_fts(rowid, name, student_id, class_name)
+      VALUES (new.id, new.name, new.student_id, new.class_name);
+    END''',
+]
+
+
+def create_student_search(c):
+    """学生搜索全文索引（trigram分词，中文子串也能命中），由触发器与 users 保持同步
+
+    trigram 分词需要 SQLite 3.34+，不支持时跳过，搜索退回 LIKE。
+    """
+    try:
+        c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+          name, student_id, class_name, content='users', content_rowid='id', tokenize='trigram'
+        )''')
+    except sqlite3.OperationalError:
+        return
+    for stmt in STUDENT_FTS_TRIGGERS:
+        c.execute(stmt)
+    c.execute("INSERT INTO students_fts(students_fts) VALUES('rebuild')")
+
+
+# trigram 全文索引匹配不了 1、2 个字的关键词（常见的姓、两字姓名），姓名另建 1、2 字片段索引；
+# 每个位置取一个片段，超过这个长度的姓名只索引前面部分
+NAME_GRAM_POSITIONS = 64
+GRAM_SOURCE = 'student_gram_positions p, (SELECT 1 AS n UNION ALL SELECT 2) w'
+
+
+def name_gram(name):
+    """与 GRAM_SOURCE 一起使用：name 从 p.i 开始长 w.n 的片段（与 LIKE 一样不区分ASCII大小写）"""
+    return f'lower(substr({name}, p.i, w.n))'
+
+
+def name_gram_fits(name):
+    return f'p.i + w.n - 1 <= length({name})'
+
+
+STUDENT_GRAM_TRIGGERS = [
+    f'''CREATE TRIGGER IF NOT EXISTS trg_users_grams_ai AFTER INSERT ON users
+    BEGIN
+      INSERT OR IGNORE INTO student_name_grams(gram, user_id)
+      SELECT {name_gram('new.name')}, new.id FROM {GRAM_SOURCE} WHERE {name_gram_fits('new.name')};
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_users_grams_ad AFTER DELETE ON users
+    BEGIN
+      DELETE FROM student_name_grams WHERE user_id = old.id AND gram IN (
+        SELECT {name_gram('old.name')} FROM {GRAM_SOURCE} WHERE {name_gram_fits('old.name')});
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_users_grams_au AFTER UPDATE OF name ON users
+    WHEN old.name IS NOT new.name
+    BEGIN
+      DELETE FROM student_name_grams WHERE user_id = old.id AND gram IN (
+        SELECT {name_gram('old.name')} FROM {GRAM_SOURCE} WHERE {name_gram_fits('old.name')});
+      INSERT OR IGNORE INTO student_name_grams(gram, user_id)
+      SELECT {name_gram('new.name')}, new.id FROM {GRAM_SOURCE} WHERE {name_gram_fits('new.name')};
+    END''',
+]
+
+
+# 计入学生统计的条件（与原统计查询一致：status 为 NULL 的不计入）
+STUDENT_COUNTED = "{r}.role = 'student' AND {r}.status IS NOT NULL AND {r}.status != 'deleted'"
+# 最近注册环形表保留的条数（接口展示前5条，多留一些，删除时很少需要回填）
+RECENT_RING_SIZE = 20
+
+
+def student_stats_triggers():
+    """users 增删改时增量维护 student_counters / student_class_counts / student_recent"""
+    old = STUDENT_COUNTED.format(r='old')
+    new = STUDENT_COUNTED.format(r='new')
+    remove_old = f'''
+      UPDATE student_counters SET value = value - 1 WHERE name = 'total' AND {old};
+      UPDATE student_class_counts SET count = count - 1 WHERE class_name = old.class_name AND {old};
+      DELETE FROM student_class_counts WHERE class_name = old.class_name AND count <= 0;
+      DELETE FROM student_recent WHERE user_id = old.id;'''
+    add_new = f'''
+      UPDATE student_counters SET value = value + 1 WHERE name = 'total' AND {new};
+      INSERT INTO student_class_counts(class_name, count) SELECT new.class_name, 1
+        WHERE new.class_name IS NOT NULL AND {new}
+        ON CONFLICT(class_name) DO UPDATE SET count = count + 1;
+      INSERT OR REPLACE INTO student_recent(user_id, name, student_id, created_at)
+        SELECT new.id, new.name, new.student_id, new.created_at WHERE {new};'''
+    # 裁剪环形表到固定大小
+    trim = f'''
+      DELETE FROM student_recent WHERE user_id NOT IN (
+        SELECT user_id FROM student_recent ORDER BY created_at DESC, user_id DESC LIMIT {RECENT_RING_SIZE});'''
+    # 被删到不足时从 users 回填（走 idx_users_role_created）；环形表是满的时 LIMIT 为0，不扫描 users
+    refill = f'''
+      INSERT OR IGNORE INTO student_recent(user_id, name, student_id, created_at)
+        SELECT u.id, u.name, u.student_id, u.created_at FROM users u
+        WHERE {STUDENT_COUNTED.format(r='u')}
+        ORDER BY u.created_at DESC, u.id DESC
+        LIMIT CASE WHEN (SELECT COUNT(*) FROM student_recent) < {RECENT_RING_SIZE} THEN {RECENT_RING_SIZE} ELSE 0 END;''' + trim
+    return [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_users_stats_ai AFTER INSERT ON users WHEN {new}
+    BEGIN{add_new}{trim}
+    END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_users_stats_ad AFTER DELETE ON users WHEN {old}
+    BEGIN{remove_old}{refill}
+    END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_users_stats_au
+    AFTER UPDATE OF role, status, class_name, name, student_id, created_at ON users
+    WHEN ({old}) OR ({new})
+    BEGIN{remove_old}{add_new}{refill}
+    END''',
+    ]
+
+
+def rebuild_student_stats(c):
+    # student_stats 引用本模块的常量（两个模块互相导入），执行时再取它的函数
+    student_stats.rebuild(c)
+
+
+def split_sql(script):
+    return [stmt.strip() for stmt in script.split(';') if stmt.strip()]
+
+
+# (版本号, 说明, 步骤列表)；步骤为SQL语句或接收连接的函数。已发布的迁移不要修改，只能追加
+MIGRATIONS = [
+    (1, '基础表结构', split_sql(SCHEMA_SQL)),
+    (2, '补齐历史字段', [
+        add_columns('questions', [('knowledge_ref', 'TEXT')]),
+        add_columns('users', [
+            ('class_name', 'TEXT'),
+            ('phone', 'TEXT'),
+            ('email', 'TEXT'),
+            ('status', 'TEXT DEFAULT "active"'),
+            ('created_at', 'DATETIME'),
+        ]),
+    ]),
+    (3, '热点查询索引', [
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_tokens_token ON tokens(token)',
+        'CREATE INDEX IF NOT EXISTS idx_questions_exam ON questions(exam_id, ord)',
+        'CREATE INDEX IF NOT EXISTS idx_topics_module ON topics(module_id, ord)',
+        'CREATE INDEX IF NOT EXISTS idx_contents_topic ON contents(topic_id)',
+        'CREATE INDEX IF NOT EXISTS idx_submissions_user ON submissions(user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_users_role_status ON users(role, status)',
+        'CREATE INDEX IF NOT EXISTS idx_users_class ON users(class_name)',
+    ]),
+    (4, '令牌过期时间', [
+        add_columns('tokens', [('expires_at', 'DATETIME')]),
+        "UPDATE tokens SET expires_at = datetime(created_at, '+7 days') WHERE expires_at IS NULL",
+        'CREATE INDEX IF NOT EXISTS idx_tokens_expires ON tokens(expires_at)',
+        'CREATE INDEX IF NOT EXISTS idx_tokens_user ON tokens(user_id)',
+    ]),
+    (5, '题目数据版本号', [
+        '''CREATE TABLE IF NOT EXISTS data_versions (
+          name TEXT PRIMARY KEY,
+          version INTEGER NOT NULL DEFAULT 0
+        )''',
+        *version_triggers('questions'),
+    ]),
+    (6, '模块/知识点数据版本号', [
+        *version_triggers('modules'),
+        *version_triggers('topics'),
+    ]),
+    (7, '内容/试卷数据版本号', [
+        *version_triggers('contents'),
+        *version_triggers('exam_sets'),
+    ]),
+    (8, '后台导入任务', [
+        '''CREATE TABLE IF NOT EXISTS import_jobs (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          status TEXT NOT NULL DEFAULT 'queued',
+          format TEXT NOT NULL DEFAULT 'roster',
+          filename TEXT,
+          file_path TEXT NOT NULL,
+          total_rows INTEGER,
+          rows_done INTEGER NOT NULL DEFAULT 0,
+          imported INTEGER NOT NULL DEFAULT 0,
+          updated INTEGER NOT NULL DEFAULT 0,
+          error_count INTEGER NOT NULL DEFAULT 0,
+          errors TEXT NOT NULL DEFAULT '[]',
+          error TEXT,
+          created_at REAL NOT NULL,
+          started_at REAL,
+          finished_at REAL,
+          updated_at REAL
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_import_jobs_status ON import_jobs(status, id)',
+    ]),
+    (9, '学生搜索与按学号分页', [
+        'CREATE INDEX IF NOT EXISTS idx_users_role_sid ON users(role, student_id)',
+        *version_triggers('users'),
+        create_student_search,
+    ]),
+    (10, '学生统计物化表', [
+        '''CREATE TABLE IF NOT EXISTS student_counters (
+          name TEXT PRIMARY KEY,
+          value INTEGER NOT NULL DEFAULT 0
+        )''',
+        '''CREATE TABLE IF NOT EXISTS student_class_counts (
+          class_name TEXT PRIMARY KEY,
+          count INTEGER NOT NULL DEFAULT 0
+        )''',
+        '''CREATE TABLE IF NOT EXISTS student_recent (
+          user_id INTEGER PRIMARY KEY,
+          name TEXT,
+          student_id TEXT,
+          created_at DATETIME
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_student_recent_created ON student_recent(created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_users_role_created ON users(role, created_at)',
+        *student_stats_triggers(),
+        rebuild_student_stats,
+    ]),
+    (11, '成绩分析汇总表', [
+        '''CREATE TABLE IF NOT EXISTS analytics_exam_class (
+          exam_id INTEGER NOT NULL,
+          class_name TEXT NOT NULL DEFAULT '',
+          submissions INTEGER NOT NULL DEFAULT 0,
+          sum_rate REAL NOT NULL DEFAULT 0,
+          sum_rate_sq REAL NOT NULL DEFAULT 0,
+          min_rate REAL,
+          max_rate REAL,
+          PRIMARY KEY (exam_id, class_name)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS analytics_score_buckets (
+          exam_id INTEGER NOT NULL,
+          class_name TEXT NOT NULL DEFAULT '',
+          bucket INTEGER NOT NULL,
+          count INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (exam_id, class_name, bucket)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS analytics_question (
+          exam_id INTEGER NOT NULL,
+          class_name TEXT NOT NULL DEFAULT '',
+          qid INTEGER NOT NULL,
+          n INTEGER NOT NULL DEFAULT 0,
+          wrong INTEGER NOT NULL DEFAULT 0,
+          sum_x REAL NOT NULL DEFAULT 0,
+          sum_x2 REAL NOT NULL DEFAULT 0,
+          sum_xy REAL NOT NULL DEFAULT 0,
+          sum_y REAL NOT NULL DEFAULT 0,
+          sum_y2 REAL NOT NULL DEFAULT 0,
+          PRIMARY KEY (exam_id, class_name, qid)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS analytics_knowledge (
+          exam_id INTEGER NOT NULL,
+          class_name TEXT NOT NULL DEFAULT '',
+          kref TEXT NOT NULL,
+          attempts INTEGER NOT NULL DEFAULT 0,
+          wrong INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (exam_id, class_name, kref)
+        )''',
+        analytics.rebuild,
+    ]),
+    (12, '每题作答结果表', [
+        '''CREATE TABLE IF NOT EXISTS answers (
+          submission_id INTEGER NOT NULL,
+          qid INTEGER NOT NULL,
+          score INTEGER NOT NULL,
+          max INTEGER NOT NULL,
+          PRIMARY KEY (submission_id, qid)
+        ) WITHOUT ROWID''',
+        'CREATE INDEX IF NOT EXISTS idx_answers_qid ON answers(qid, score, max)',
+        'CREATE INDEX IF NOT EXISTS idx_answers_missed ON answers(qid, submission_id) WHERE score < max',
+        '''CREATE TRIGGER IF NOT EXISTS trg_submissions_answers_ad AFTER DELETE ON submissions
+    BEGIN
+      DELETE FROM answers WHERE submission_id = old.id;
+    END''',
+        exam_answers.backfill,
+    ]),
+    (13, '内容生成任务与结果缓存', [
+        '''CREATE TABLE IF NOT EXISTS generation_jobs (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          topic_id INTEGER NOT NULL,
+          status TEXT NOT NULL DEFAULT 'queued',
+          provider TEXT,
+          prompt_hash TEXT,
+          cached INTEGER NOT NULL DEFAULT 0,
+          error TEXT,
+          created_at REAL NOT NULL,
+          started_at REAL,
+          finished_at REAL
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_generation_jobs_status ON generation_jobs(status, topic_id)',
+        '''CREATE TABLE IF NOT EXISTS generation_cache (
+          prompt_hash TEXT PRIMARY KEY,
+          provider TEXT NOT NULL,
+          model TEXT,
+          text TEXT NOT NULL,
+          created_at REAL NOT NULL
+        )''',
+    ]),
+    (14, '生成任务首段输出耗时', [
+        add_columns('generation_jobs', [('ttft', 'REAL')]),
+    ]),
+    (15, '作答结果保存题型和知识点快照', [
+        add_columns('answers', [('qtype', 'TEXT'), ('kref', 'TEXT'), ('ord', 'INTEGER')]),
+        exam_answers.backfill_snapshot,
+    ]),
+    (16, '学生姓名短关键词索引', [
+        'CREATE TABLE IF NOT EXISTS student_gram_positions (i INTEGER PRIMARY KEY)',
+        'INSERT OR IGNORE INTO student_gram_positions(i) VALUES '
+        + ', '.join(f'({i})' for i in range(1, NAME_GRAM_POSITIONS + 1)),
+        '''CREATE TABLE IF NOT EXISTS student_name_grams (
+          gram TEXT NOT NULL,
+          user_id INTEGER NOT NULL,
+          PRIMARY KEY (gram, user_id)
+        ) WITHOUT ROWID''',
+        *STUDENT_GRAM_TRIGGERS,
+        f'''INSERT OR IGNORE INTO student_name_grams(gram, user_id)
+        SELECT {name_gram('u.name')}, u.id FROM users u, {GRAM_SOURCE} WHERE {name_gram_fits('u.name')}''',
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# 迁移完成后必须存在的表和字段
+REQUIRED_COLUMNS = {
+    'modules': ['id', 'title', 'description', 'ord'],
+    'topics': ['id', 'module_id', 'title', 'ord'],
+    'contents': ['id', 'topic_id', 'data'],
+    'exam_sets': ['id', 'name'],
+    'questions': ['id', 'exam_id', 'qtype', 'prompt', 'options', 'answer', 'score', 'ord', 'knowledge_ref'],
+    'users': ['id', 'username', 'student_id', 'name', 'role', 'password_hash',
+              'class_name', 'phone', 'email', 'status', 'created_at'],
+    'tokens': ['id', 'user_id', 'token', 'created_at', 'expires_at'],
+    'submissions': ['id', 'user_id', 'exam_id', 'score', 'total', 'rate', 'detail',
+                    'wrong_qids', 'suggestions', 'created_at'],
+    'answers': ['submission_id', 'qid', 'score', 'max', 'qtype', 'kref', 'ord'],
+    'generation_jobs': ['id', 'topic_id', 'status', 'provider', 'prompt_hash', 'cached', 'error',
+                        'created_at', 'started_at', 'finished_at', 'ttft'],
+    'generation_cache': ['prompt_hash', 'provider', 'model', 'text', 'created_at'],
+    'analytics_exam_class': ['exam_id', 'class_name', 'submissions', 'sum_rate', 'sum_rate_sq',
+                             'min_rate', 'max_rate'],
+    'analytics_score_buckets': ['exam_id', 'class_name', 'bucket', 'count'],
+    'analytics_question': ['exam_id', 'class_name', 'qid', 'n', 'wrong', 'sum_x', 'sum_x2', 'sum_xy',
+                           'sum_y', 'sum_y2'],
+    'analytics_knowledge': ['exam_id', 'class_name', 'kref', 'attempts', 'wrong'],
+    'student_counters': ['name', 'value'],
+    'student_class_counts': ['class_name', 'count'],
+    'student_recent': ['user_id', 'name', 'student_id', 'created_at'],
+    'student_name_grams': ['gram', 'user_id'],
+    'import_jobs': ['id', 'status', 'format', 'filename', 'file_path', 'total_rows', 'rows_done',
+                    'imported', 'updated', 'error_count', 'errors', 'error',
+                    'created_at', 'started_at', 'finished_at', 'updated_at'],
+}
+
+
+def ensure_migrations_table(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version INTEGER PRIMARY KEY,
+          name TEXT NOT NULL,
+          applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def current_version(c):
+    row = c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'").fetchone()
+    if not row:
+        return 0
+    return c.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations').fetchone()[0]
+
+
+def verify_schema(c):
+    """检查所有必需的表和字段是否存在"""
+    problems = []
+    for table, columns in REQUIRED_COLUMNS.items():
+        existing = {r[1] for r in c.execute(f'PRAGMA table_info({table})')}
+        if not existing:
+            problems.append(f'缺少表 {table}')
+            continue
+        missing = [col for col in columns if col not in existing]
+        if missing:
+            problems.append(f"表 {table} 缺少字段 {', '.join(missing)}")
+    if problems:
+        raise SchemaError('数据库结构校验失败：' + '；'.join(problems))
+
+
+def migrate():
+    """执行所有未应用的迁移，返回本次应用的版本号列表
+
+    数据库版本高于程序已知的最新版本时拒绝启动，避免旧程序写坏新结构。
+    """
+    def apply(c):
+        version = current_version(c)
+        if version > LATEST_VERSION:
+            raise SchemaError(f'数据库结构版本 {version} 高于程序支持的版本 {LATEST_VERSION}，请升级程序')
+        ensure_migrations_table(c)
+        applied = []
+        for ver, name, steps in MIGRATIONS:
+            if ver <= version:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(c)
+                else:
+                    c.execute(step)
+            c.execute('INSERT INTO schema_migrations(version, name) VALUES(?,?)', (ver, name))
+            applied.append(ver)
+        verify_schema(c)
+        return applied
+    return run_write(apply)
+
+
+# 各路由使用的查询及示例参数，用于 EXPLAIN QUERY PLAN 检查
+ROUTE_QUERIES = [
+    ('auth: token查用户', "SELECT u.* FROM tokens t JOIN users u ON t.user_id=u.id WHERE t.token=? AND t.expires_at > datetime('now') AND COALESCE(u.status, 'active') != 'deleted'", ('x',)),
+    ('auth: 清理过期令牌', "SELECT id FROM tokens WHERE expires_at <= datetime('now')", ()),
+    ('GET /api/modules', '''
+        SELECT m.id, m.title, m.description, m.ord, COUNT(t.id) as topics_count
+        FROM modules m LEFT JOIN topics t ON m.id = t.module_id
+        GROUP BY m.id, m.title, m.description, m.ord ORDER BY m.ord''', ()),
+    ('GET /api/modules/<mid>/topics', 'SELECT id,title,ord FROM topics WHERE module_id=? ORDER BY ord', (1,)),
+    ('GET /api/topics/<tid>/content', 'SELECT data FROM contents WHERE topic_id=?', (1,)),
+    ('GET /api/exams', 'SELECT id,name FROM exam_sets', ()),
+    ('GET /api/exams/<eid>', 'SELECT id,qtype,prompt,options,score,ord FROM questions WHERE exam_id=? ORDER BY ord', (1,)),
+    ('POST /api/exams/<eid>/submit', 'SELECT id,qtype,answer,score,knowledge_ref FROM questions WHERE exam_id=? ORDER BY id', (1,)),
+    ('submit: 试卷数据版本', 'SELECT version FROM data_versions WHERE name=?', ('questions',)),
+    ('POST /api/auth/login (学号)', 'SELECT * FROM users WHERE student_id=?', ('x',)),
+    ('POST /api/auth/login (用户名)', 'SELECT * FROM users WHERE username=?', ('x',)),
+    ('GET /api/my/scores', '''
+        SELECT s.id, s.exam_id, e.name as exam_name, s.score, s.total, s.rate, s.created_at
+        FROM submissions s JOIN exam_sets e ON s.exam_id=e.id
+        WHERE s.user_id=? ORDER BY s.id DESC''', (1,)),
+    ('GET /api/my/scores/<sid>', '''
+        SELECT s.id, s.score, s.total, s.rate, s.suggestions, s.created_at, e.name as exam_name
+        FROM submissions s JOIN exam_sets e ON s.exam_id=e.id
+        WHERE s.id=? AND s.user_id=?''', (1, 1)),
+    ('GET /api/my/scores/<sid> (每题结果)', '''
+        SELECT a.qid, a.qtype, a.score, a.max, a.kref, q.prompt
+        FROM answers a LEFT JOIN questions q ON q.id = a.qid
+        WHERE a.submission_id = ? ORDER BY a.ord, a.qid''', (1,)),
+    ('POST /api/generate/topic/<tid>', 'SELECT t.id as tid, t.ord as tord, m.id as mid, m.title as mtitle FROM topics t JOIN modules m ON t.module_id=m.id WHERE t.id=?', (1,)),
+    ('生成任务: 同一知识点进行中', "SELECT id FROM generation_jobs WHERE status IN ('queued', 'running') AND topic_id=? ORDER BY id LIMIT 1", (1,)),
+    ('生成任务: 排队数', "SELECT COUNT(*) FROM generation_jobs WHERE status IN ('queued', 'running')", ()),
+    ('生成任务: 结果缓存', 'SELECT text FROM generation_cache WHERE prompt_hash=?', ('x',)),
+    ('GET /api/generate/jobs/<id>', 'SELECT * FROM generation_jobs WHERE id=?', (1,)),
+    ('GET /api/students', '''
+        SELECT u.id, u.name, u.student_id FROM users u WHERE u.role = 'student'
+        ORDER BY u.student_id LIMIT ? OFFSET ?''', (21, 0)),
+    ('GET /api/students (游标)', '''
+        SELECT u.id, u.name, u.student_id FROM users u WHERE u.role = 'student'
+        AND u.student_id > ? ORDER BY u.student_id LIMIT ?''', ('x', 21)),
+    ('GET /api/students (全文搜索)', '''
+        SELECT u.id, u.name, u.student_id FROM students_fts CROSS JOIN users u ON u.id = students_fts.rowid
+        WHERE students_fts MATCH ? AND u.role = 'student' ORDER BY u.student_id LIMIT ?''', ('"大数据"', 21)),
+    ('GET /api/students (短关键词)', '''
+        SELECT u.id, u.name, u.student_id FROM (
+          SELECT user_id FROM student_name_grams WHERE gram = lower(?)
+          UNION SELECT id FROM users WHERE role = 'student' AND student_id >= ? AND student_id < ?
+          UNION SELECT id FROM users WHERE class_name >= ? AND class_name < ?) m
+        CROSS JOIN users u ON u.id = m.user_id WHERE u.role = 'student' ORDER BY u.student_id LIMIT ?''', ('张', '张', '张\U0010ffff', '张', '张\U0010ffff', 21)),
+    ('GET /api/students/stats (总数)', "SELECT value FROM student_counters WHERE name = 'total'", ()),
+    ('GET /api/students/stats (班级)', 'SELECT class_name, count FROM student_class_counts ORDER BY count DESC', ()),
+    ('GET /api/students/stats (最近)', '''
+        SELECT name, student_id, created_at FROM student_recent ORDER BY created_at DESC, user_id DESC LIMIT 5''', ()),
+    ('学生统计: 回填最近注册', '''
+        SELECT u.id FROM users u WHERE u.role = 'student' AND u.status IS NOT NULL AND u.status != 'deleted'
+        ORDER BY u.created_at DESC, u.id DESC LIMIT 20''', ()),
+    ('DELETE /api/students/<sid>', 'SELECT id FROM users WHERE student_id = ? AND role = "student"', ('x',)),
+    ('GET /api/admin/analytics/exams', '''
+        SELECT exam_id, SUM(submissions), SUM(sum_rate) FROM analytics_exam_class GROUP BY exam_id''', ()),
+    ('GET /api/admin/analytics/exams/<eid> (题目)', '''
+        SELECT qid, SUM(n), SUM(wrong), SUM(sum_x), SUM(sum_x2), SUM(sum_xy), SUM(sum_y), SUM(sum_y2)
+        FROM analytics_question WHERE exam_id = ? GROUP BY qid''', (1,)),
+    ('GET /api/admin/analytics/exams/<eid> (知识点)', '''
+        SELECT kref, SUM(attempts), SUM(wrong) FROM analytics_knowledge WHERE exam_id = ? GROUP BY kref''', (1,)),
+    ('GET /api/admin/questions/<qid>/answers (错题)', '''
+        SELECT s.id, s.exam_id, s.created_at, a.score, a.max, u.id, u.name, u.student_id, u.class_name
+        FROM answers a JOIN submissions s ON s.id = a.submission_id LEFT JOIN users u ON u.id = s.user_id
+        WHERE a.qid = ? AND a.score < a.max ORDER BY a.submission_id DESC LIMIT ?''', (1, 200)),
+    ('GET /api/admin/questions/<qid>/answers (汇总)', '''
+        SELECT COUNT(*), SUM(score < max), AVG(CASE WHEN max > 0 THEN score * 1.0 / max ELSE 0 END)
+        FROM answers WHERE qid = ?''', (1,)),
+    ('导入任务: 领取', "SELECT * FROM import_jobs WHERE status = 'queued' OR (status = 'running' AND updated_at < ?) "
+                     "ORDER BY id LIMIT 1", (0,)),
+    ('GET /api/students/import/jobs/<id>', 'SELECT * FROM import_jobs WHERE id=?', (1,)),
+]
+
+
+def explain_route_queries(c, out=sys.stdout):
+    """打印每个路由查询的执行计划，返回出现全表扫描的查询名称列表"""
+    full_scans = []
+    for label, sql, params in ROUTE_QUERIES:
+        plan = c.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+        details = [r[3] for r in plan]
+        # 带约束的虚拟表扫描（如全文索引 MATCH）和遍历子查询结果不算全表扫描
+        subqueries = {d.split()[-1] for d in details if d.startswith(('CO-ROUTINE', 'MATERIALIZE'))}
+        scans = [d for d in details if d.startswith('SCAN') and ' USING ' not in d
+                 and not re.search(r'VIRTUAL TABLE INDEX \d+:\S', d) and d.split()[1] not in subqueries]
+        flag = '⚠️ ' if scans else '✅'
+        print(f'{flag} {label}', file=out)
+        for d in details:
+            print(f'      {d}', file=out)
+        if scans:
+            full_scans.append(label)
+    return full_scans
+
+
+def main(argv=None):
+    args = argv if argv is not None else sys.argv[1:]
+    cmd = args[0] if args else 'status'
+    try:
+        if cmd == 'migrate':
+            applied = migrate()
+            print(f"已应用迁移: {applied or '无'}，当前版本 {LATEST_VERSION}")
+        elif cmd == 'explain':
+            full_scans = explain_route_queries(db.get_db())
+            print(f'\n共 {len(ROUTE_QUERIES)} 条查询，{len(full_scans)} 条包含全表扫描')
+        else:
+            c = db.get_db()
+            version = current_version(c)
+            print(f'数据库: {db.pool.db_path}')
+            print(f'当前版本: {version}，程序支持的最新版本: {LATEST_VERSION}')
+            for ver, name, _ in MIGRATIONS:
+                print(f"  {'✅' if ver <= version else '⏳'} {ver:>3} {name}")
+    finally:
+        db.release_db()
+
+
+if __name__ == '__main__':
+    main()
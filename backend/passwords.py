@@ -0,0 +1,24 @@
+import hmac
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from db import run_write
+
+# 批量导入的学生使用统一的初始密码
+DEFAULT_PASSWORD = '123456'
+# 初始密码尚未哈希的占位值：导入时不再逐行做PBKDF2，首次登录时再生成真正的哈希。
+# 不含 '$'，check_password_hash 对它总是返回 False，不会被当成任何密码的哈希
+PENDING_DEFAULT_HASH = 'pending:default'
+
+
+def verify_password(user, password):
+    """校验 users 行的密码；初始密码占位值在首次登录成功时替换为真正的哈希"""
+    stored = user['password_hash']
+    if stored != PENDING_DEFAULT_HASH:
+        return check_password_hash(stored, password)
+    if not hmac.compare_digest(password.encode('utf-8'), DEFAULT_PASSWORD.encode('utf-8')):
+        return False
+    pw_hash = generate_password_hash(password)
+    run_write(lambda c: c.execute('UPDATE users SET password_hash=? WHERE id=? AND password_hash=?',
+                                  (pw_hash, user['id'], PENDING_DEFAULT_HASH)))
+    return True
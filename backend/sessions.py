@@ -0,0 +1,152 @@
+import threading
+import time
+import secrets
+from collections import OrderedDict
+
+from db import data_version, get_db, run_write
+
+# 登录令牌有效期（与迁移中回填旧令牌使用的 '+7 days' 保持一致）
+TOKEN_TTL_DAYS = 7
+# 缓存条目最长存活时间；users 表的版本号变化（包括其他进程如学生管理服务的修改）时条目立即失效
+CACHE_TTL = 60.0
+CACHE_SIZE = 4096
+# 过期令牌清理间隔
+PURGE_INTERVAL = 3600.0
+
+
+class SessionCache:
+    """令牌 -> 用户 的内存缓存，带TTL和LRU淘汰
+
+    同时维护 user_id -> 令牌集合 的反向索引，用户状态/角色变化时可按用户失效。
+    条目记录写入时 users 表的版本号，读取时版本号不同即视为失效。
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, token, version=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            user, expires, entry_version = entry
+            if expires <= now or entry_version != version:
+                self._remove(token)
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(token)
+            self._stats['hits'] += 1
+            return dict(user)
+
+    def put(self, token, user, ttl=None, version=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (dict(user), expires, version)
+            self._by_user.setdefault(user['id'], set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def _remove(self, token):
+        user = self._entries.pop(token)[0]
+        tokens = self._by_user.get(user['id'])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[user['id']]
+
+    def invalidate_token(self, token):
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+                self._stats['invalidations'] += 1
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for token in list(self._by_user.get(user_id, ())):
+                self._remove(token)
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out['size'] = len(self._entries)
+            out['maxsize'] = self.maxsize
+            out['ttl'] = self.ttl
+        return out
+
+
+cache = SessionCache()
+_last_purge = [None]
+_purge_lock = threading.Lock()
+
+
+def make_token():
+    return secrets.token_hex(32)
+
+
+def issue_token(user_id):
+    """签发登录令牌，顺带按间隔清理过期令牌"""
+    token = make_token()
+    run_write(lambda c: c.execute(
+        "INSERT INTO tokens(user_id, token, expires_at) VALUES(?, ?, datetime('now', ?))",
+        (user_id, token, f'+{TOKEN_TTL_DAYS} days')))
+    maybe_purge()
+    return token
+
+
+def get_user_by_token(token):
+    if not token:
+        return None
+    with get_db() as c:
+        # 按主键读一行版本号，比令牌与用户的联表查询便宜；其他进程改了 users 也能立即察觉
+        version = data_version(c, 'users')
+        user = cache.get(token, version)
+        if user is not None:
+            return user
+        row = c.execute('''
+            SELECT u.*, (julianday(t.expires_at) - julianday('now')) * 86400 AS token_ttl
+            FROM tokens t JOIN users u ON t.user_id=u.id
+            WHERE t.token=? AND t.expires_at > datetime('now') AND COALESCE(u.status, 'active') != 'deleted'
+        ''', (token,)).fetchone()
+    if not row:
+        return None
+    user = dict(row)
+    remaining = user.pop('token_ttl')
+    # 缓存时间不超过令牌剩余有效期
+    cache.put(token, user, ttl=min(cache.ttl, remaining), version=version)
+    return user
+
+
+def invalidate_user(user_id):
+    """用户状态、角色等信息变化后调用，下一次请求重新从数据库读取"""
+    cache.invalidate_user(user_id)
+
+
+def purge_expired_tokens():
+    return run_write(lambda c: c.execute("DELETE FROM tokens WHERE expires_at <= datetime('now')").rowcount)
+
+
+def maybe_purge(now=None):
+    now = time.monotonic() if now is None else now
+    with _purge_lock:
+        if _last_purge[0] is not None and now - _last_purge[0] < PURGE_INTERVAL:
+            return 0
+        _last_purge[0] = now
+    return purge_expired_tokens()
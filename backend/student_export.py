@@ -0,0 +1,156 @@
+import csv
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from db import get_db
+
+# 每次从游标取出的行数
+CHUNK_SIZE = 1000
+
+HEADERS = ['学生姓名', '学号', '班级', '手机号', '邮箱', '状态', '创建时间']
+COLUMN_WIDTHS = [15, 15, 15, 15, 25, 10, 20]
+COLUMNS = 'ABCDEFG'
+
+EXPORT_SQL = '''
+    SELECT name, student_id, class_name, phone, email, status, created_at
+    FROM users
+    WHERE role = 'student'
+    ORDER BY student_id
+'''
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_MIMETYPE = 'text/csv'
+
+
+def iter_student_chunks(chunk_size=CHUNK_SIZE):
+    """逐批产出学生行，每批 chunk_size 行，不一次性 fetchall"""
+    with get_db() as conn:
+        cursor = conn.execute(EXPORT_SQL)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [(r['name'], r['student_id'], r['class_name'] or '', r['phone'] or '', r['email'] or '',
+                    r['status'] or 'active', r['created_at'] or '') for r in rows]
+
+
+def iter_csv(chunk_size=CHUNK_SIZE):
+    """CSV导出：带BOM的UTF-8，Excel打开中文不乱码"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADERS)
+    yield ('\ufeff' + buf.getvalue()).encode('utf-8')
+    for rows in iter_student_chunks(chunk_size):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+        yield buf.getvalue().encode('utf-8')
+
+
+# ---------- 流式XLSX ----------
+# openpyxl 的 write-only 模式仍要等 save() 才生成整个文件；这里直接把工作表XML
+# 边生成边写进zip（不可回写的流会使用数据描述符），每批行压缩后立即发送
+
+_CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+</Types>'''
+
+_ROOT_RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>'''
+
+_WORKBOOK = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{title}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>'''
+
+_WORKBOOK_RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>'''
+
+# 样式1：标题行，白色粗体、蓝色填充、居中（与原 openpyxl 导出一致）
+_STYLES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font></fonts>
+<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill><fill><patternFill patternType="solid"><fgColor rgb="FF366092"/><bgColor rgb="FF366092"/></patternFill></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>'''
+
+# XML 1.0 不允许的控制字符
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _row_xml(row_num, values, style=0):
+    s = f' s="{style}"' if style else ''
+    cells = ''.join(
+        f'<c r="{col}{row_num}" t="inlineStr"{s}><is><t>{escape(_ILLEGAL_XML.sub("", str(v)))}</t></is></c>'
+        for col, v in zip(COLUMNS, values) if v is not None)
+    return f'<row r="{row_num}">{cells}</row>'
+
+
+class _ChunkSink(io.RawIOBase):
+    """不可回写的输出流，收集zip写出的字节，供生成器分批取走"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_xlsx(title='学生信息', chunk_size=CHUNK_SIZE):
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _ROOT_RELS)
+        zf.writestr('xl/workbook.xml', _WORKBOOK.format(title=escape(title)))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        zf.writestr('xl/styles.xml', _STYLES)
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            cols = ''.join(f'<col min="{i}" max="{i}" width="{w}" customWidth="1"/>'
+                           for i, w in enumerate(COLUMN_WIDTHS, 1))
+            sheet.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                         '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         f'<cols>{cols}</cols><sheetData>' + _row_xml(1, HEADERS, style=1)).encode('utf-8'))
+            # 先发出固定部分，客户端立即开始接收
+            yield sink.drain()
+            row_num = 1
+            for rows in iter_student_chunks(chunk_size):
+                parts = []
+                for values in rows:
+                    row_num += 1
+                    parts.append(_row_xml(row_num, values))
+                sheet.write(''.join(parts).encode('utf-8'))
+                data = sink.drain()
+                if data:
+                    yield data
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
+
+
+FORMATS = {
+    'xlsx': (iter_xlsx, XLSX_MIMETYPE),
+    'csv': (iter_csv, CSV_MIMETYPE),
+}
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+学生名单批量导入
+- openpyxl 只读模式逐行读取，不把整个工作簿加载进内存
+- 新学生的密码写入初始密码占位值，首次登录时再哈希（见 passwords.py）
+- 每 CHUNK_SIZE 行一个写事务，用 executemany 按学号 upsert，批次之间释放写锁
+用法: python backend/student_import.py 名单.xlsx [--format roster|admin]
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+import sessions
+from db import run_write
+from passwords import PENDING_DEFAULT_HASH
+
+CHUNK_SIZE = 500
+
+# 学生管理系统模板：姓名、学号、班级、手机、邮箱
+ROSTER_COLUMNS = ('name', 'student_id', 'class_name', 'phone', 'email')
+# 平台管理员导入模板：学号、姓名
+ADMIN_COLUMNS = ('student_id', 'name')
+FORMATS = {'roster': ROSTER_COLUMNS, 'admin': ADMIN_COLUMNS}
+
+# 同一进程内同时只运行一个导入，避免多个导入交替抢占写锁
+import_lock = threading.Lock()
+
+
+def read_rows(source, columns, start_row=0):
+    """逐行产出 (Excel行号, {字段: 值})，跳过标题行和前 start_row 个数据行；同时返回数据行总数（可能未知）"""
+    wb = load_workbook(filename=source, read_only=True, data_only=True)
+    ws = wb.active
+    total = ws.max_row - 1 if ws.max_row else None
+
+    def rows():
+        try:
+            first = 2 + start_row
+            for row_idx, row in enumerate(ws.iter_rows(min_row=first, values_only=True), first):
+                values = {}
+                for i, col in enumerate(columns):
+                    value = row[i] if row and len(row) > i else None
+                    values[col] = str(value).strip() if value is not None else None
+                yield row_idx, values
+        finally:
+            wb.close()
+
+    return total, rows()
+
+
+def upsert_sql(columns):
+    insert_cols = columns + ('role', 'password_hash', 'status', 'created_at')
+    updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'student_id')
+    return (f'INSERT INTO users ({", ".join(insert_cols)}) VALUES ({", ".join("?" * len(insert_cols))}) '
+            f'ON CONFLICT(student_id) DO UPDATE SET {updates}')
+
+
+class ImportResult:
+    def __init__(self, imported=0, updated=0, errors=None):
+        self.imported = imported
+        self.updated = updated
+        self.errors = list(errors or [])
+
+    @property
+    def total_processed(self):
+        return self.imported + self.updated
+
+    def as_dict(self):
+        return {
+            'imported': self.imported,
+            'updated': self.updated,
+            'errors': self.errors,
+            'total_processed': self.total_processed,
+        }
+
+
+def _write_chunk(chunk, columns, sql, seen, result, done, checkpoint):
+    """一个写事务：查出已存在的学号，再 executemany 批量 upsert；checkpoint 在同一事务内记录进度"""
+    created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    params = [tuple(v[c] for c in columns) + ('student', PENDING_DEFAULT_HASH, 'active', created_at)
+              for _, v in chunk]
+    sids = [v['student_id'] for _, v in chunk]
+
+    def write(c):
+        existing = {r[0] for r in c.execute(
+            'SELECT student_id FROM users WHERE student_id IN (SELECT value FROM json_each(?))',
+            (json.dumps(sids),))}
+        failed = []
+        try:
+            c.executemany(sql, params)
+        except sqlite3.IntegrityError:
+            # 批内有违反约束的行：逐行写入，只跳过出错的行
+            for (row_idx, _), p in zip(chunk, params):
+                try:
+                    c.execute(sql, p)
+                except sqlite3.IntegrityError as e:
+                    failed.append((row_idx, f'第{row_idx}行：{e}'))
+        failed_rows = {row_idx for row_idx, _ in failed}
+        # 事务可能重试，这里只计算结果，提交后再合并到 result
+        imported = updated = 0
+        new_seen = set()
+        for row_idx, values in chunk:
+            if row_idx in failed_rows:
+                continue
+            sid = values['student_id']
+            if sid in existing or sid in seen or sid in new_seen:
+                updated += 1
+            else:
+                imported += 1
+            new_seen.add(sid)
+        outcome = ImportResult(result.imported + imported, result.updated + updated,
+                               result.errors + [msg for _, msg in failed])
+        if checkpoint:
+            checkpoint(c, done, outcome)
+        return outcome, new_seen
+
+    outcome, new_seen = run_write(write)
+    result.imported, result.updated, result.errors = outcome.imported, outcome.updated, outcome.errors
+    seen.update(new_seen)
+
+
+def import_students(source, columns=ROSTER_COLUMNS, chunk_size=CHUNK_SIZE, progress=None,
+                    start_row=0, result=None, checkpoint=None):
+    """导入学生名单，返回 ImportResult
+
+    每批独立提交，中途失败时已提交的批次保留（按学号upsert，重新导入是幂等的）。
+    progress(已处理行数, 总行数或None) 在每批提交后调用；
+    checkpoint(conn, 已处理行数, ImportResult) 在每批的写事务内调用，用于和数据一起持久化进度，
+    之后可用 start_row/result 从上次提交的位置继续。
+    """
+    with import_lock:
+        return _import(source, columns, chunk_size, progress, start_row, result or ImportResult(), checkpoint)
+
+
+def _import(source, columns, chunk_size, progress, start_row, result, checkpoint):
+    total, rows = read_rows(source, columns, start_row)
+    sql = upsert_sql(columns)
+    updated_before = result.updated
+    seen = set()
+    chunk = []
+    done = start_row
+    written = start_row
+    for row_idx, values in rows:
+        done += 1
+        if not values['name'] or not values['student_id']:
+            # 完全空白的行不算错误
+            if any(values.values()):
+                result.errors.append(f'第{row_idx}行：姓名和学号为必填项')
+            continue
+        chunk.append((row_idx, values))
+        if len(chunk) >= chunk_size:
+            _write_chunk(chunk, columns, sql, seen, result, done, checkpoint)
+            chunk = []
+            written = done
+            if progress:
+                progress(done, total)
+    if chunk:
+        _write_chunk(chunk, columns, sql, seen, result, done, checkpoint)
+    elif checkpoint and done > written:
+        # 最后一批之后只有无效行，单独记录进度
+        run_write(lambda c: checkpoint(c, done, result))
+    if progress:
+        progress(done, total)
+    if result.updated > updated_before:
+        # 姓名等信息可能已更新，缓存中的用户信息全部失效
+        sessions.cache.clear()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='学生名单批量导入')
+    parser.add_argument('file')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='roster',
+                        help='roster: 姓名,学号,班级,手机,邮箱; admin: 学号,姓名')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    import migrations
+    migrations.migrate()
+
+    def progress(done, total):
+        print(f'\r已处理 {done}/{total if total is not None else "?"} 行', end='', flush=True)
+
+    result = import_students(args.file, FORMATS[args.format], args.chunk_size, progress)
+    print(f'\n新增 {result.imported}，更新 {result.updated}，错误 {len(result.errors)}')
+    for err in result.errors[:20]:
+        print(f'  {err}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,124 +1,36 @@
 import os
-import sqlite3
 import json
-from flask import Flask, request, jsonify, send_file, render_template
+from urllib.parse import quote
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 import io
 
-# 数据库配置
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJ_ROOT = os.path.dirname(BASE_DIR)
-DB_DIR = os.path.join(PROJ_ROOT, 'DB')
-DB_PATH = os.path.join(DB_DIR, 'app.db')
-
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+import compression
+import db
+import import_jobs
+import migrations
+import sessions
+import student_export
+import student_import
+import student_search
+import student_stats
+from db import DB_PATH, get_db, run_write
 
 # 学生信息管理类
 class StudentManager:
     def __init__(self):
-        self.ensure_student_table()
-    
-    def ensure_student_table(self):
-        """确保学生表存在"""
-        with get_db() as conn:
-            # 检查users表是否已有学生相关字段
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(users)")
-            columns = [row[1] for row in cursor.fetchall()]
-            
-            # 如果缺少字段，添加它们
-            if 'class_name' not in columns:
-                cursor.execute('ALTER TABLE users ADD COLUMN class_name TEXT')
-            if 'phone' not in columns:
-                cursor.execute('ALTER TABLE users ADD COLUMN phone TEXT')
-            if 'email' not in columns:
-                cursor.execute('ALTER TABLE users ADD COLUMN email TEXT')
-            if 'status' not in columns:
-                cursor.execute('ALTER TABLE users ADD COLUMN status TEXT DEFAULT "active"')
-            if 'created_at' not in columns:
-                cursor.execute('ALTER TABLE users ADD COLUMN created_at DATETIME')
+        # 学生相关字段（class_name/phone/email/status/created_at）由迁移统一维护
+        migrations.migrate()
     
-    def import_from_excel(self, file_path_or_stream):
-        """从Excel文件导入学生信息"""
+    def import_from_excel(self, file_path_or_stream, progress=None):
+        """从Excel文件导入学生信息（只读模式流式读取，分批upsert，见 student_import）"""
         try:
-            # 加载Excel文件
-            wb = load_workbook(filename=file_path_or_stream, data_only=True)
-            ws = wb.active
-            
-            imported_count = 0
-            updated_count = 0
-            error_rows = []
-            
-            with get_db() as conn:
-                cursor = conn.cursor()
-                
-                # 遍历Excel行（跳过标题行）
-                for row_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
-                    if row_idx == 1:  # 跳过标题行
-                        continue
-                    
-                    try:
-                        # 解析Excel列：学生姓名、学号、班级、手机、邮箱
-                        name = str(row[0]).strip() if row and row[0] is not None else None
-                        student_id = str(row[1]).strip() if row and len(row) > 1 and row[1] is not None else None
-                        class_name = str(row[2]).strip() if row and len(row) > 2 and row[2] is not None else None
-                        phone = str(row[3]).strip() if row and len(row) > 3 and row[3] is not None else None
-                        email = str(row[4]).strip() if row and len(row) > 4 and row[4] is not None else None
-                        
-                        # 验证必填字段
-                        if not name or not student_id:
-                            error_rows.append(f"第{row_idx}行：姓名和学号为必填项")
-                            continue
-                        
-                        # 检查学号是否已存在
-                        existing = cursor.execute(
-                            'SELECT id, name FROM users WHERE student_id = ?', 
-                            (student_id,)
-                        ).fetchone()
-                        
-                        if existing:
-                            # 更新现有记录
-                            cursor.execute('''
-                                UPDATE users SET 
-                                    name = ?, 
-                                    class_name = ?, 
-                                    phone = ?, 
-                                    email = ?
-                                WHERE student_id = ?
-                            ''', (name, class_name, phone, email, student_id))
-                            updated_count += 1
-                        else:
-                            # 插入新记录
-                            cursor.execute('''
-                                INSERT INTO users (
-                                    student_id, name, class_name, phone, email, 
-                                    role, password_hash, status, created_at
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            ''', (
-                                student_id, name, class_name, phone, email,
-                                'student', generate_password_hash('123456'), 'active',
-                                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            ))
-                            imported_count += 1
-                    
-                    except Exception as e:
-                        error_rows.append(f"第{row_idx}行：{str(e)}")
-                        continue
-            
-            return {
-                'success': True,
-                'imported': imported_count,
-                'updated': updated_count,
-                'errors': error_rows,
-                'total_processed': imported_count + updated_count
-            }
+            result = student_import.import_students(file_path_or_stream, student_import.ROSTER_COLUMNS,
+                                                    progress=progress)
+            out = result.as_dict()
+            out['success'] = True
+            return out
         
         except Exception as e:
             return {
@@ -130,104 +42,18 @@ class StudentManager:
             }
     
     def export_to_excel(self):
-        """导出学生信息到Excel"""
+        """导出学生信息到Excel（一次性返回完整文件；接口使用流式导出，见 student_export）"""
         try:
-            # 创建工作簿
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "学生信息"
-            
-            # 设置标题行
-            headers = ['学生姓名', '学号', '班级', '手机号', '邮箱', '状态', '创建时间']
-            ws.append(headers)
-            
-            # 设置标题行样式
-            header_font = Font(bold=True, color='FFFFFF')
-            header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            
-            for col_num, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col_num)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
-            
-            # 获取学生数据
-            with get_db() as conn:
-                cursor = conn.cursor()
-                students = cursor.execute('''
-                    SELECT name, student_id, class_name, phone, email, status, created_at
-                    FROM users 
-                    WHERE role = 'student'
-                    ORDER BY student_id
-                ''').fetchall()
-                
-                # 添加数据行
-                for student in students:
-                    ws.append([
-                        student['name'],
-                        student['student_id'],
-                        student['class_name'] or '',
-                        student['phone'] or '',
-                        student['email'] or '',
-                        student['status'] or 'active',
-                        student['created_at'] or ''
-                    ])
-            
-            # 调整列宽
-            column_widths = [15, 15, 15, 15, 25, 10, 20]
-            for col_num, width in enumerate(column_widths, 1):
-                ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = width
-            
-            # 保存到内存
-            output = io.BytesIO()
-            wb.save(output)
-            output.seek(0)
-            
-            return output
+            return io.BytesIO(b''.join(student_export.iter_xlsx()))
         
         except Exception as e:
             raise Exception(f"导出失败：{str(e)}")
     
-    def get_students_list(self, page=1, per_page=20, search=None):
-        """获取学生列表（支持分页和搜索）"""
+    def get_students_list(self, page=1, per_page=20, search=None, cursor=None):
+        """获取学生列表（支持分页和搜索；传入 cursor 时按学号游标翻页）"""
         try:
-            offset = (page - 1) * per_page
-            
             with get_db() as conn:
-                cursor = conn.cursor()
-                
-                # 构建查询条件
-                where_clause = "WHERE role = 'student'"
-                params = []
-                
-                if search:
-                    where_clause += " AND (name LIKE ? OR student_id LIKE ? OR class_name LIKE ?)"
-                    search_param = f"%{search}%"
-                    params.extend([search_param, search_param, search_param])
-                
-                # 获取总数
-                total_query = f"SELECT COUNT(*) FROM users {where_clause}"
-                total = cursor.execute(total_query, params).fetchone()[0]
-                
-                # 获取分页数据
-                data_query = f'''
-                    SELECT id, name, student_id, class_name, phone, email, status, created_at
-                    FROM users {where_clause}
-                    ORDER BY student_id
-                    LIMIT ? OFFSET ?
-                '''
-                params.extend([per_page, offset])
-                
-                students = cursor.execute(data_query, params).fetchall()
-                
-                return {
-                    'students': [dict(student) for student in students],
-                    'total': total,
-                    'page': page,
-                    'per_page': per_page,
-                    'pages': (total + per_page - 1) // per_page
-                }
+                return student_search.list_students(conn, search, per_page, cursor=cursor, page=page)
         
         except Exception as e:
             raise Exception(f"获取学生列表失败：{str(e)}")
@@ -235,7 +61,9 @@ class StudentManager:
     def delete_student(self, student_id):
         """删除学生"""
         try:
-            with get_db() as conn:
+            deleted = []
+            
+            def soft_delete(conn):
                 cursor = conn.cursor()
                 
                 # 检查学生是否存在
@@ -252,60 +80,45 @@ class StudentManager:
                     'UPDATE users SET status = "deleted" WHERE student_id = ?',
                     (student_id,)
                 )
+                deleted.append(student['id'])
                 
                 return {'success': True, 'message': '学生删除成功'}
+            
+            result = run_write(soft_delete)
+            # 状态已变更，缓存的登录信息失效
+            for user_id in deleted:
+                sessions.invalidate_user(user_id)
+            return result
         
         except Exception as e:
             return {'success': False, 'error': f'删除失败：{str(e)}'}
     
     def get_student_stats(self):
-        """获取学生统计信息"""
+        """获取学生统计信息（读取触发器维护的统计表，见 student_stats）"""
         try:
             with get_db() as conn:
-                cursor = conn.cursor()
-                
-                # 总学生数
-                total_students = cursor.execute(
-                    'SELECT COUNT(*) FROM users WHERE role = "student" AND status != "deleted"'
-                ).fetchone()[0]
-                
-                # 按班级统计
-                class_stats = cursor.execute('''
-                    SELECT class_name, COUNT(*) as count
-                    FROM users 
-                    WHERE role = 'student' AND status != 'deleted' AND class_name IS NOT NULL
-                    GROUP BY class_name
-                    ORDER BY count DESC
-                ''').fetchall()
-                
-                # 最近注册的学生
-                recent_students = cursor.execute('''
-                    SELECT name, student_id, created_at
-                    FROM users 
-                    WHERE role = 'student' AND status != 'deleted'
-                    ORDER BY created_at DESC
-                    LIMIT 5
-                ''').fetchall()
-                
-                return {
-                    'total_students': total_students,
-                    'class_stats': [dict(row) for row in class_stats],
-                    'recent_students': [dict(row) for row in recent_students]
-                }
+                return student_stats.read(conn)
         
         except Exception as e:
             raise Exception(f"获取统计信息失败：{str(e)}")
 
 # 创建Flask应用
-def create_student_app():
+def create_student_app(start_jobs=True):
     app = Flask(__name__, template_folder='../templates')
     CORS(app)
+    db.init_app(app)
+    compression.init_app(app)
     
     student_manager = StudentManager()
+    # 启动阶段借出的连接归还给连接池
+    db.release_db()
+    # 后台导入线程，继续处理上次未完成的任务
+    if start_jobs:
+        import_jobs.runner.start()
     
     @app.route('/api/students/import', methods=['POST'])
     def import_students():
-        """导入学生信息"""
+        """上传学生名单，创建后台导入任务后立即返回任务ID"""
         if 'file' not in request.files:
             return jsonify({'error': '缺少文件'}), 400
         
@@ -313,30 +126,50 @@ def create_student_app():
         if file.filename == '':
             return jsonify({'error': '未选择文件'}), 400
         
-        if not file.filename.endswith(('.xlsx', '.xls')):
+        name = file.filename.lower()
+        if name.endswith('.xls'):
+            # openpyxl 只能读取 .xlsx，旧版 .xls 需先另存为 .xlsx
+            return jsonify({'error': '不支持旧版 .xls 文件，请在Excel中另存为 .xlsx 后上传'}), 400
+        if not name.endswith('.xlsx'):
             return jsonify({'error': '文件格式不正确，请上传Excel文件'}), 400
         
         try:
-            result = student_manager.import_from_excel(file)
-            return jsonify(result)
+            job_id = import_jobs.create_job(file)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': f'导入失败：{str(e)}'}), 500
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/students/import/jobs/{job_id}'
+        }), 202
+    
+    @app.route('/api/students/import/jobs/<int:job_id>', methods=['GET'])
+    def get_import_job(job_id):
+        """查询导入任务进度：已处理行数、错误和吞吐量"""
+        job = import_jobs.get_job(job_id)
+        if job is None:
+            return jsonify({'error': '导入任务不存在'}), 404
+        return jsonify(job)
+    
+    @app.route('/api/students/import/jobs', methods=['GET'])
+    def list_import_jobs():
+        """最近的导入任务"""
+        return jsonify({'jobs': import_jobs.list_jobs()})
     
     @app.route('/api/students/export', methods=['GET'])
     def export_students():
-        """导出学生信息"""
-        try:
-            output = student_manager.export_to_excel()
-            filename = f"学生信息_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-            return send_file(
-                output,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-        except Exception as e:
-            return jsonify({'error': f'导出失败：{str(e)}'}), 500
+        """导出学生信息（?format=xlsx|csv），边查询边发送"""
+        fmt = request.args.get('format', 'xlsx')
+        if fmt not in student_export.FORMATS:
+            return jsonify({'error': '不支持的导出格式'}), 400
+        generate, mimetype = student_export.FORMATS[fmt]
+        filename = f"学生信息_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+        resp = Response(stream_with_context(generate()), mimetype=mimetype)
+        resp.headers['Content-Disposition'] = f"attachment; filename=students.{fmt}; filename*=UTF-8''{quote(filename)}"
+        return resp
     
     @app.route('/api/students', methods=['GET'])
     def get_students():
@@ -345,11 +178,13 @@ def create_student_app():
             page = int(request.args.get('page', 1))
             per_page = int(request.args.get('per_page', 20))
             search = request.args.get('search', '').strip()
+            cursor = request.args.get('cursor')
             
             result = student_manager.get_students_list(
                 page=page, 
                 per_page=per_page, 
-                search=search if search else None
+                search=search if search else None,
+                cursor=cursor
             )
             return jsonify(result)
         except Exception as e:
@@ -380,5 +215,6 @@ def create_student_app():
     return app
 
 if __name__ == '__main__':
-    app = create_student_app()
+    # debug 模式的重载器父进程只负责重启子进程，导入线程只在实际提供服务的子进程中启动
+    app = create_student_app(start_jobs=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     app.run(host='0.0.0.0', port=92, debug=True)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+from db import data_version
+
+# trigram 分词至少需要3个字符才能走全文索引，更短的关键词用姓名片段索引
+MIN_FTS_LENGTH = 3
+# 比任何字符都大，prefix <= x < prefix + PREFIX_END 即 x 以 prefix 开头（可走索引的前缀匹配）
+PREFIX_END = '\U0010ffff'
+MAX_PER_PAGE = 200
+COUNT_CACHE_SIZE = 256
+
+LIST_COLUMNS = 'u.id, u.name, u.student_id, u.class_name, u.phone, u.email, u.status, u.created_at'
+
+
+def has_table(c, name):
+    return c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone() is not None
+
+
+def fts_phrase(term):
+    """整个关键词作为一个短语匹配（trigram 下即子串匹配），转义其中的双引号"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def student_filter(c, search):
+    """返回 (FROM ... WHERE 子句, 参数)"""
+    if not search:
+        return "FROM users u WHERE u.role = 'student'", []
+    if len(search) >= MIN_FTS_LENGTH and has_table(c, 'students_fts'):
+        # CROSS JOIN 固定由全文索引驱动，避免逐个学生去查索引
+        return ('FROM students_fts CROSS JOIN users u ON u.id = students_fts.rowid '
+                "WHERE students_fts MATCH ? AND u.role = 'student'", [fts_phrase(search)])
+    if len(search) < MIN_FTS_LENGTH and has_table(c, 'student_name_grams'):
+        # 姓名仍是子串匹配（片段索引）；1、2 个字的学号和班级片段几乎命中所有人，改为按前缀匹配。
+        # 与全文索引一样由命中的ID驱动
+        end = search + PREFIX_END
+        return ('FROM (SELECT user_id FROM student_name_grams WHERE gram = lower(?) '
+                "UNION SELECT id FROM users WHERE role = 'student' AND student_id >= ? AND student_id < ? "
+                'UNION SELECT id FROM users WHERE class_name >= ? AND class_name < ?) m '
+                "CROSS JOIN users u ON u.id = m.user_id WHERE u.role = 'student'",
+                [search, search, end, search, end])
+    like = f'%{search}%'
+    return ("FROM users u WHERE u.role = 'student' "
+            'AND (u.name LIKE ? OR u.student_id LIKE ? OR u.class_name LIKE ?)', [like, like, like])
+
+
+class CountCache:
+    """按搜索词缓存学生总数，users 表的数据版本变化后重新统计"""
+
+    def __init__(self, maxsize=COUNT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, c, search, from_where, params):
+        version = data_version(c, 'users')
+        key = search or ''
+        with self._lock:
+            hit = self._counts.get(key)
+            if hit is not None and hit[0] == version:
+                self._counts.move_to_end(key)
+                return hit[1]
+        total = c.execute(f'SELECT COUNT(*) {from_where}', params).fetchone()[0]
+        with self._lock:
+            self._counts[key] = (version, total)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.maxsize:
+                self._counts.popitem(last=False)
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+counts = CountCache()
+
+
+def list_students(c, search=None, per_page=20, cursor=None, page=None):
+    """按学号排序列出学生
+
+    cursor 为上一页最后一个学号，按 student_id > cursor 定位（不随页数变慢）；
+    未给 cursor 时按 page 使用 OFFSET，兼容旧客户端。两种方式都返回 next_cursor。
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    from_where, params = student_filter(c, search)
+    total = counts.get(c, search, from_where, params)
+    if cursor is not None:
+        rows = c.execute(f'SELECT {LIST_COLUMNS} {from_where} AND u.student_id > ? ORDER BY u.student_id LIMIT ?',
+                         params + [cursor, per_page + 1]).fetchall()
+    else:
+        page = max(1, page or 1)
+        rows = c.execute(f'SELECT {LIST_COLUMNS} {from_where} ORDER BY u.student_id LIMIT ? OFFSET ?',
+                         params + [per_page + 1, (page - 1) * per_page]).fetchall()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    result = {
+        'students': [dict(r) for r in rows],
+        'total': total,
+        'per_page': per_page,
+        'pages': (total + per_page - 1) // per_page,
+        'next_cursor': rows[-1]['student_id'] if more else None,
+    }
+    if cursor is None:
+        result['page'] = page
+    return result
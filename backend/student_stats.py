@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+学生统计物化表
+student_counters（总数）、student_class_counts（各班人数）、student_recent（最近注册环形表）
+由 users 上的触发器增量维护（见 migrations.student_stats_triggers），读取不再扫描 users。
+用法: python backend/student_stats.py [check|rebuild]
+"""
+
+import sys
+
+import migrations
+from db import run_write
+
+RECENT_LIMIT = 5
+
+
+def counted():
+    """计入统计的学生条件，与维护物化表的触发器共用 migrations.STUDENT_COUNTED"""
+    return migrations.STUDENT_COUNTED.format(r='users')
+
+
+def read(c):
+    """统计接口的数据：三个小表上的查询，与学生人数无关"""
+    row = c.execute("SELECT value FROM student_counters WHERE name = 'total'").fetchone()
+    class_stats = c.execute('SELECT class_name, count FROM student_class_counts ORDER BY count DESC').fetchall()
+    recent = c.execute('''
+        SELECT name, student_id, created_at FROM student_recent
+        ORDER BY created_at DESC, user_id DESC LIMIT ?
+    ''', (RECENT_LIMIT,)).fetchall()
+    return {
+        'total_students': row[0] if row else 0,
+        'class_stats': [dict(r) for r in class_stats],
+        'recent_students': [dict(r) for r in recent],
+    }
+
+
+def compute(c):
+    """从 users 全量重新统计，返回 (总数, {班级: 人数}, [最近注册的 user_id])"""
+    where = counted()
+    total = c.execute(f'SELECT COUNT(*) FROM users WHERE {where}').fetchone()[0]
+    classes = dict(c.execute(f'''
+        SELECT class_name, COUNT(*) FROM users
+        WHERE {where} AND class_name IS NOT NULL GROUP BY class_name
+    ''').fetchall())
+    recent = [r[0] for r in c.execute(f'''
+        SELECT id FROM users WHERE {where} ORDER BY created_at DESC, id DESC LIMIT ?
+    ''', (migrations.RECENT_RING_SIZE,))]
+    return total, classes, recent
+
+
+def check(c):
+    """比较物化表与全量统计，返回差异描述列表（空列表表示一致）"""
+    total, classes, recent = compute(c)
+    problems = []
+    row = c.execute("SELECT value FROM student_counters WHERE name = 'total'").fetchone()
+    stored_total = row[0] if row else None
+    if stored_total != total:
+        problems.append(f'学生总数：物化表 {stored_total}，实际 {total}')
+    stored_classes = dict(c.execute('SELECT class_name, count FROM student_class_counts').fetchall())
+    for name in sorted(set(classes) | set(stored_classes)):
+        if stored_classes.get(name) != classes.get(name):
+            problems.append(f'班级 {name}：物化表 {stored_classes.get(name)}，实际 {classes.get(name)}')
+    stored_recent = [r[0] for r in c.execute(
+        'SELECT user_id FROM student_recent ORDER BY created_at DESC, user_id DESC')]
+    if stored_recent[:RECENT_LIMIT] != recent[:RECENT_LIMIT]:
+        problems.append(f'最近注册：物化表 {stored_recent[:RECENT_LIMIT]}，实际 {recent[:RECENT_LIMIT]}')
+    return problems
+
+
+def rebuild(c):
+    """在当前事务中从 users 全量重建三个统计表"""
+    c.execute('DELETE FROM student_counters')
+    c.execute('DELETE FROM student_class_counts')
+    c.execute('DELETE FROM student_recent')
+    where = counted()
+    c.execute(f"INSERT INTO student_counters(name, value) SELECT 'total', COUNT(*) FROM users WHERE {where}")
+    c.execute(f'''
+        INSERT INTO student_class_counts(class_name, count)
+        SELECT class_name, COUNT(*) FROM users
+        WHERE {where} AND class_name IS NOT NULL GROUP BY class_name
+    ''')
+    c.execute(f'''
+        INSERT INTO student_recent(user_id, name, student_id, created_at)
+        SELECT id, name, student_id, created_at FROM users WHERE {where}
+        ORDER BY created_at DESC, id DESC LIMIT ?
+    ''', (migrations.RECENT_RING_SIZE,))
+
+
+def main(argv=None):
+    args = argv if argv is not None else sys.argv[1:]
+    cmd = args[0] if args else 'check'
+    migrations.migrate()
+    if cmd == 'rebuild':
+        run_write(rebuild)
+        print('✅ 学生统计已重建')
+        return
+    problems = run_write(check)
+    if problems:
+        print('⚠️ 学生统计与 users 不一致：')
+        for p in problems:
+            print(f'  {p}')
+        print('运行 python backend/student_stats.py rebuild 重建')
+        sys.exit(1)
+    print('✅ 学生统计与 users 一致')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+成绩分析基准测试
+在数据库副本中为一张试卷生成 N 份提交，对比每次请求读出全部 submissions 并解析 detail JSON 汇总，
+与读取增量维护的汇总表（analytics.exam_report）的单次请求耗时，并核对两者结果一致。
+用法: python benchmarks/bench_analytics.py [--submissions 50000]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import analytics  # noqa: E402
+import db  # noqa: E402
+import grading  # noqa: E402
+import migrations  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def naive_report(c, exam_id):
+    """逐份解析提交明细在 Python 中汇总"""
+    rates = []
+    per_q = {}
+    for r in c.execute('SELECT rate, detail FROM submissions WHERE exam_id = ?', (exam_id,)):
+        rate = r['rate']
+        rates.append(rate)
+        for q in json.loads(r['detail']):
+            x = q['score'] / q['max'] if q['max'] else 0.0
+            per_q.setdefault(q['qid'], []).append((x, rate / 100.0))
+    n = len(rates)
+    mean = sum(rates) / n
+    std = math.sqrt(sum((v - mean) ** 2 for v in rates) / (n - 1))
+    difficulty = {qid: sum(x for x, _ in pairs) / len(pairs) for qid, pairs in per_q.items()}
+    return n, mean, std, difficulty
+
+
+def populate(path, n, exam_id, students):
+    shutil.copy(SRC_DB, path)
+    db.pool = db.ConnectionPool(path)
+    migrations.migrate()
+    rng = random.Random(11)
+    c = db.get_db()
+    key = grading.answer_keys.get(c, exam_id)
+    qids = [r[0] for r in c.execute('SELECT id FROM questions WHERE exam_id = ?', (exam_id,))]
+    answers = [r[0] for r in c.execute('SELECT answer FROM questions WHERE exam_id = ?', (exam_id,))]
+    db.release_db()
+
+    def insert(cc):
+        cc.executemany('INSERT INTO users(name, student_id, class_name, role, password_hash) VALUES(?,?,?,?,?)',
+                       [(f'学生{i}', f'A{i:06d}', f'{i % 12 + 1}班', 'student', 'x') for i in range(students)])
+        user_ids = [r[0] for r in cc.execute("SELECT id FROM users WHERE student_id LIKE 'A%'")]
+        for _ in range(n):
+            skill = rng.random()
+            sheet = {str(q): (a if rng.random() < skill else 'Z') for q, a in zip(qids, answers)}
+            got, total, detail, wrong = grading.grade(key, sheet)
+            rate = round(got / total * 100, 2) if total else 0
+            uid = rng.choice(user_ids)
+            cc.execute('INSERT INTO submissions(user_id, exam_id, score, total, rate, detail, wrong_qids, suggestions) '
+                       'VALUES(?,?,?,?,?,?,?,?)',
+                       (uid, exam_id, got, total, rate, json.dumps(detail, ensure_ascii=False), json.dumps(wrong), '[]'))
+            analytics.record(cc, uid, exam_id, rate, detail)
+    db.run_write(insert)
+
+
+def timed(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='成绩分析基准')
+    parser.add_argument('--submissions', type=int, default=50000)
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    exam_id = 1
+    workdir = tempfile.mkdtemp(prefix='bench_analytics_')
+    try:
+        populate(os.path.join(workdir, 'app.db'), args.submissions, exam_id, args.students)
+        c = db.get_db()
+        a, (n, mean, std, difficulty) = timed(lambda: naive_report(c, exam_id), args.repeat)
+        b, report = timed(lambda: analytics.exam_report(c, exam_id), args.repeat)
+        summary = report['summary']
+        same = (summary['submissions'] == n and abs(summary['avg_rate'] - round(mean, 2)) < 0.01
+                and abs(summary['std_rate'] - round(std, 2)) < 0.01
+                and all(abs(q['difficulty'] - round(difficulty[q['qid']], 4)) < 1e-4 for q in report['questions']))
+        print(f'{args.submissions} 份提交，单次请求平均耗时')
+        print(f'  逐份解析明细 {a:>9.2f} ms')
+        print(f'  读取汇总表   {b:>9.2f} ms  ({a / b:.0f}x)  结果一致: {same}')
+        db.release_db()
+        db.pool.close_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
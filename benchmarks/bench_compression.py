@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+响应压缩基准测试
+统计典型响应（模块列表、学习内容、试卷详情、前端静态资源）在不同编码下
+传输的字节数和每次压缩的CPU耗时。
+用法: python benchmarks/bench_compression.py [--repeat 50]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import compression  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+ASSETS = os.path.join(ROOT, 'frontend', 'assets')
+
+
+def payloads():
+    conn = sqlite3.connect(SRC_DB)
+    conn.row_factory = sqlite3.Row
+    modules = [dict(r) for r in conn.execute('SELECT id, title, description, ord FROM modules ORDER BY ord')]
+    yield 'GET /api/modules', json.dumps(modules).encode()
+    contents = conn.execute('SELECT topic_id, data FROM contents ORDER BY length(data) DESC').fetchall()
+    yield f"GET /api/topics/{contents[0]['topic_id']}/content (最大)", contents[0]['data'].encode()
+    mid = contents[len(contents) // 2]
+    yield f"GET /api/topics/{mid['topic_id']}/content (中位)", mid['data'].encode()
+    rows = conn.execute('SELECT id,qtype,prompt,options,score,ord FROM questions WHERE exam_id=1 ORDER BY ord').fetchall()
+    exam = [{'id': r['id'], 'type': r['qtype'], 'prompt': r['prompt'],
+             'options': json.loads(r['options']) if r['options'] else None, 'score': r['score'], 'ord': r['ord']}
+            for r in rows]
+    yield 'GET /api/exams/1', json.dumps(exam).encode()
+    conn.close()
+    for name in ('app.js', 'style.css'):
+        with open(os.path.join(ASSETS, name), 'rb') as f:
+            yield f'/assets/{name}', f.read()
+    with open(os.path.join(ROOT, 'frontend', 'index.html'), 'rb') as f:
+        yield '/', f.read()
+
+
+def measure(data, encoding, static, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = compression.compress(data, encoding, static=static)
+    return len(out), (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='响应压缩基准')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    encodings = compression.available_encodings()
+    print(f"可用编码: {', '.join(encodings)}（未安装brotli时只有gzip）")
+    total_raw = 0
+    total = {}
+    for name, data in payloads():
+        static = not name.startswith('GET')
+        total_raw += len(data)
+        print(f"\n{name}: 原始 {len(data)} 字节{'（构建时预压缩）' if static else ''}")
+        for enc in encodings:
+            size, us = measure(data, enc, static, args.repeat)
+            total[enc] = total.get(enc, 0) + size
+            print(f"  {enc:<5} {size:>8} 字节  {size / len(data):>6.1%}  压缩耗时 {us:>9.1f} µs")
+    print(f"\n合计: 原始 {total_raw} 字节  " + '  '.join(f'{enc} {n} ({n / total_raw:.1%})' for enc, n in total.items()))
+
+
+if __name__ == '__main__':
+    main()
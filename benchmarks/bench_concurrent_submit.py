@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并发交卷基准测试
+模拟整班同时提交 /api/exams/<eid>/submit 的写入压力，对比：
+  baseline - 默认回滚日志模式，每次写入新建连接（原 get_db 行为）
+  tuned    - WAL + 调优PRAGMA + 连接池 + BEGIN IMMEDIATE 抖动重试
+用法: python benchmarks/bench_concurrent_submit.py [--writers 40] [--per-writer 25] [--readers 4]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+INSERT_SQL = ('INSERT INTO submissions(user_id,exam_id,score,total,rate,detail,wrong_qids,suggestions) '
+              'VALUES(?,?,?,?,?,?,?,?)')
+READ_SQL = ('SELECT s.id, s.exam_id, e.name, s.score, s.total, s.rate, s.created_at '
+            'FROM submissions s JOIN exam_sets e ON s.exam_id=e.id WHERE s.user_id=? ORDER BY s.id DESC')
+
+
+def make_params(uid):
+    detail = [{'qid': q, 'type': 'mcq', 'score': 2, 'max': 2, 'kref': '1:1'} for q in range(1, 31)]
+    return (uid, 1, 48, 68, 70.59, json.dumps(detail), json.dumps([1, 2, 3]), json.dumps(['优先复习：Linux基础']))
+
+
+def copy_db(tmpdir, name):
+    path = os.path.join(tmpdir, name)
+    shutil.copy(SRC_DB, path)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=DELETE')
+    conn.close()
+    return path
+
+
+def baseline_writer(path):
+    def write(params):
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute(INSERT_SQL, params)
+        conn.close()
+    return write
+
+
+def baseline_reader(path):
+    def read(uid):
+        conn = sqlite3.connect(path)
+        conn.execute(READ_SQL, (uid,)).fetchall()
+        conn.close()
+    return read
+
+
+def tuned_setup(path, size):
+    db.configure_database(path)
+    pool = db.ConnectionPool(path, max_size=size)
+
+    def write(params):
+        try:
+            pool.run_write(lambda c: c.execute(INSERT_SQL, params))
+        finally:
+            pool.release()
+
+    def read(uid):
+        try:
+            pool.acquire().execute(READ_SQL, (uid,)).fetchall()
+        finally:
+            pool.release()
+    return pool, write, read
+
+
+def run(write, read, writers, per_writer, readers):
+    errors = []
+    read_errors = []
+    stop = threading.Event()
+    reads = [0]
+    start_gate = threading.Barrier(writers + readers + 1)
+
+    def writer_loop(uid):
+        start_gate.wait()
+        for _ in range(per_writer):
+            try:
+                write(make_params(uid))
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    def reader_loop(uid):
+        start_gate.wait()
+        while not stop.is_set():
+            try:
+                read(uid)
+                reads[0] += 1
+            except sqlite3.OperationalError as e:
+                read_errors.append(str(e))
+
+    threads = [threading.Thread(target=writer_loop, args=(i + 2,)) for i in range(writers)]
+    rthreads = [threading.Thread(target=reader_loop, args=(i + 2,)) for i in range(readers)]
+    for t in threads + rthreads:
+        t.start()
+    start_gate.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    for t in rthreads:
+        t.join()
+    ok = writers * per_writer - len(errors)
+    return {'elapsed': elapsed, 'ok_writes': ok, 'errors': len(errors), 'read_errors': len(read_errors),
+            'writes_per_sec': ok / elapsed if elapsed else 0, 'reads': reads[0]}
+
+
+def report(name, r, extra=''):
+    print(f"{name:<9} 写入成功 {r['ok_writes']:>6}  失败 {r['errors']:>4}  "
+          f"耗时 {r['elapsed']:.2f}s  写入/秒 {r['writes_per_sec']:>8.1f}  并发读 {r['reads']:>6}(失败 {r['read_errors']})  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并发交卷写入基准')
+    parser.add_argument('--writers', type=int, default=40)
+    parser.add_argument('--per-writer', type=int, default=25)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--pool-size', type=int, default=8)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_submit_')
+    try:
+        print(f"并发写线程 {args.writers} × 每线程 {args.per_writer} 次，并发读线程 {args.readers}")
+        path = copy_db(tmpdir, 'baseline.db')
+        base = run(baseline_writer(path), baseline_reader(path), args.writers, args.per_writer, args.readers)
+        report('baseline', base)
+
+        path = copy_db(tmpdir, 'tuned.db')
+        pool, write, read = tuned_setup(path, args.pool_size)
+        tuned = run(write, read, args.writers, args.per_writer, args.readers)
+        stats = pool.stats()
+        report('tuned', tuned, f"重试 {stats['write_retries']} 建连 {stats['connects']} 池等待 {stats['waits']}")
+        pool.close_all()
+        if base['writes_per_sec']:
+            print(f"写入吞吐提升: {tuned['writes_per_sec'] / base['writes_per_sec']:.2f}x")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库快照基准测试
+在数据库副本中生成 N 份提交（含明细JSON和按题目的答题记录），对比 SQL 导出/导入（SQLExporter + SQL/import_database.py）
+与二进制快照生成/恢复（db_snapshot.py，替换文件和在线备份两种方式）的耗时和文件大小，并逐表核对恢复结果。
+在线备份时还检查 data_versions 中的版本号都高于恢复前。
+最后分别篡改归档中的数据库字节、压缩数据流和快照记录，检查恢复被拒绝、目标库保持原样且没有留下临时文件。
+用法: python benchmarks/bench_db_snapshot.py [--submissions 20000]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import db  # noqa: E402
+import db_snapshot  # noqa: E402
+import exam_answers  # noqa: E402
+from bench_sql_delta import quiet, same_data  # noqa: E402
+from bench_sql_export import populate  # noqa: E402
+from bench_sql_import import load_importer  # noqa: E402
+from sql_exporter import SQLExporter  # noqa: E402
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def remove_db(path):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def tamper(archive, out, mutate):
+    """复制归档，对指定条目的内容做修改后重新打包"""
+    with zipfile.ZipFile(archive) as src, zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for name in src.namelist():
+            dst.writestr(name, mutate(name, src.read(name)))
+
+
+def flip_page(name, data):
+    if name != db_snapshot.DB_ENTRY:
+        return data
+    data = bytearray(data)
+    data[len(data) // 2] ^= 0xFF
+    return bytes(data)
+
+
+def flip_stream(archive, out):
+    """复制归档，直接翻转数据库条目压缩数据流开头附近的一个字节（破坏块头和编码表，解压时报 zlib 错误）"""
+    with zipfile.ZipFile(archive) as zf:
+        info = zf.getinfo(db_snapshot.DB_ENTRY)
+    with open(archive, 'rb') as f:
+        data = bytearray(f.read())
+    # 本地文件头 30 字节，其后是文件名和扩展字段
+    name_len, extra_len = struct.unpack('<HH', data[info.header_offset + 26:info.header_offset + 30])
+    data[info.header_offset + 30 + name_len + extra_len + 2] ^= 0xFF
+    with open(out, 'wb') as f:
+        f.write(data)
+
+
+def edit_meta(name, data):
+    if name != db_snapshot.META_ENTRY:
+        return data
+    return data.replace(b'"users": ', b'"users": 1')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='数据库快照基准')
+    parser.add_argument('--submissions', type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_db_snapshot_')
+    try:
+        src_path = os.path.join(workdir, 'app.db')
+        populate(src_path, args.submissions)
+        db.pool = db.ConnectionPool(src_path)
+        db.run_write(exam_answers.backfill)
+        db.release_db()
+        db.pool.close_all()
+        db.configure_database(src_path)
+
+        sql_dir = os.path.join(workdir, 'SQL')
+        _, export_time = quiet(lambda: SQLExporter(src_path, sql_dir=sql_dir).export_all())
+        sql_size = sum(os.path.getsize(os.path.join(sql_dir, name))
+                       for name in ('database_schema.sql', 'database_data.sql', 'database_triggers.sql'))
+        archive = os.path.join(workdir, 'database_snapshot.zip')
+        _, snapshot_time = quiet(db_snapshot.create_snapshot, src_path, archive)
+        print(f'{args.submissions} 份提交，数据库 {os.path.getsize(src_path) / 1024 / 1024:.1f} MB')
+        print(f'  SQL导出         耗时 {export_time:>6.2f} 秒  文件 {sql_size / 1024 / 1024:>6.1f} MB（结构+数据+触发器）')
+        print(f'  快照            耗时 {snapshot_time:>6.2f} 秒  文件 {os.path.getsize(archive) / 1024 / 1024:>6.1f} MB')
+
+        dst_path = os.path.join(workdir, 'restored.db')
+        importer = load_importer(os.path.join(ROOT, 'SQL'))
+        cases = (('SQL导入', False, lambda: importer(dst_path, sql_dir)),
+                 ('快照替换文件', False, lambda: db_snapshot.restore_snapshot(archive, dst_path)),
+                 ('快照+quick_check', False, lambda: db_snapshot.restore_snapshot(archive, dst_path, quick=True)),
+                 ('快照在线备份', True, lambda: db_snapshot.restore_snapshot(archive, dst_path, online=True)))
+        for label, online, fn in cases:
+            remove_db(dst_path)
+            reader = None
+            versions = ''
+            if online:
+                # 在线恢复时目标库已存在（WAL 模式）且有应用连接打开着
+                shutil.copy(src_path, dst_path)
+                reader = sqlite3.connect(dst_path)
+                before = db_snapshot.data_versions(reader)
+            ok, elapsed = quiet(fn)
+            if reader is not None:
+                after = db_snapshot.data_versions(reader)
+                reader.close()
+                raised = all(after[name] > version for name, version in before.items())
+                versions = f'  数据版本号: {"全部递增" if raised else "未递增"}'
+            with contextlib.redirect_stdout(io.StringIO()):
+                # 在线恢复有意调高了版本号，其余表逐表核对
+                same = same_data(src_path, dst_path, skip=('data_versions',) if online else ())
+            print(f'  {label:<14} 耗时 {elapsed:>6.2f} 秒  {"成功" if ok else "失败"}  '
+                  f'逐表核对: {"一致" if same else "不一致"}{versions}')
+
+        print('篡改归档:')
+        bad = os.path.join(workdir, 'bad.zip')
+        for label, make_bad in (('数据库字节', lambda: tamper(archive, bad, flip_page)),
+                                ('压缩数据流', lambda: flip_stream(archive, bad)),
+                                ('快照记录行数', lambda: tamper(archive, bad, edit_meta))):
+            make_bad()
+            before = file_hash(dst_path)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                ok = db_snapshot.restore_snapshot(bad, dst_path)
+            reason = out.getvalue().strip().splitlines()[-1]
+            left = os.path.exists(dst_path + '.restoring')
+            print(f'  {label:<8} {"恢复成功" if ok else "已拒绝"}  目标库{"未变" if file_hash(dst_path) == before else "被修改"}  '
+                  f'{"留下临时文件" if left else "无临时文件"}  {reason}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
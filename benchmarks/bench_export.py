@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+学生导出基准测试
+在数据库副本中生成 1万 / 10万 名学生，对比原 openpyxl 整表导出（fetchall + Workbook + BytesIO）
+与流式 XLSX、CSV 导出的首字节时间、总耗时和 Python 内存峰值（tracemalloc）。
+用法: python benchmarks/bench_export.py [--sizes 10000 100000]
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+import student_export  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def legacy_export():
+    """原 StudentManager.export_to_excel"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "学生信息"
+    headers = ['学生姓名', '学号', '班级', '手机号', '邮箱', '状态', '创建时间']
+    ws.append(headers)
+    for col_num in range(1, len(headers) + 1):
+        cell = ws.cell(row=1, column=col_num)
+        cell.font = Font(bold=True, color='FFFFFF')
+        cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+    with db.get_db() as conn:
+        students = conn.execute('''
+            SELECT name, student_id, class_name, phone, email, status, created_at
+            FROM users WHERE role = 'student' ORDER BY student_id
+        ''').fetchall()
+        for s in students:
+            ws.append([s['name'], s['student_id'], s['class_name'] or '', s['phone'] or '', s['email'] or '',
+                       s['status'] or 'active', s['created_at'] or ''])
+    for col_num, width in enumerate([15, 15, 15, 15, 25, 10, 20], 1):
+        ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = width
+    output = io.BytesIO()
+    wb.save(output)
+    yield output.getvalue()
+
+
+def populate(path, n):
+    shutil.copy(SRC_DB, path)
+    db.pool = db.ConnectionPool(path)
+    migrations.migrate()
+    rows = [(f'学生{i}', f'B{i:07d}', f'大数据{i % 20 + 1}班', f'138{i:08d}', f'stu{i}@example.com',
+             'student', 'x', 'active', '2025-09-01 08:00:00') for i in range(n)]
+    db.run_write(lambda c: c.executemany('''
+        INSERT INTO users(name, student_id, class_name, phone, email, role, password_hash, status, created_at)
+        VALUES(?,?,?,?,?,?,?,?,?)''', rows))
+    db.release_db()
+
+
+def run(gen_factory, trace):
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    ttfb = None
+    size = 0
+    for chunk in gen_factory():
+        if chunk and ttfb is None:
+            ttfb = time.perf_counter() - t0
+        size += len(chunk)
+    total = time.perf_counter() - t0
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    db.release_db()
+    return ttfb, total, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='学生导出基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    engines = [
+        ('原openpyxl导出', legacy_export),
+        ('流式XLSX', student_export.iter_xlsx),
+        ('流式CSV', student_export.iter_csv),
+    ]
+    workdir = tempfile.mkdtemp(prefix='bench_export_')
+    try:
+        for n in args.sizes:
+            populate(os.path.join(workdir, f'{n}.db'), n)
+            print(f'\n{n} 名学生')
+            for label, factory in engines:
+                ttfb, total, size, _ = run(factory, trace=False)
+                _, _, _, peak = run(factory, trace=True)
+                print(f'  {label:<10} 首字节 {ttfb * 1000:>9.1f} ms  总耗时 {total:>6.2f} 秒  '
+                      f'大小 {size / 1024:>8.0f} KB  内存峰值 {peak / 1024 / 1024:>7.1f} MB')
+            db.pool.close_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
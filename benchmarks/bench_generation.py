@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容生成队列压测（离线桩，不调用真实大模型）
+模拟 --threads 个服务线程同时收到 --requests 次生成请求（分布在 --topics 个知识点上，即重复点击），
+对比原同步实现（每个请求在服务线程中调用一次生成服务）与后台队列（请求只提交任务，同一知识点去重，
+结果按提示词缓存）的请求耗时、全部完成耗时和生成服务调用次数。
+用法: python benchmarks/bench_generation.py [--requests 40 --topics 10 --latency 0.5]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+os.environ['LLM_PROVIDER'] = 'local'
+
+import app as backend  # noqa: E402
+import db  # noqa: E402
+import generation  # noqa: E402
+import migrations  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def legacy_request(provider, tid):
+    """原 api_generate_topic：请求线程内同步调用生成服务并写库"""
+    with db.get_db() as c:
+        r = generation.topic_context(c, tid)
+    data = backend.gen_content(r['mtitle'], r['tord'])
+    data['theory'] = provider.complete(generation.SYSTEM_PROMPT, generation.build_prompt(r['mtitle'], r['tord']))
+    db.run_write(lambda c: generation.save_content(c, tid, data))
+    db.release_db()
+
+
+def queued_request(queue, tid):
+    queue.submit(tid)
+    db.release_db()
+
+
+def run_requests(fn, topics, n, threads):
+    latencies = []
+
+    def one(i):
+        t0 = time.perf_counter()
+        fn(topics[i % len(topics)])
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(n)))
+    return time.perf_counter() - t0, sum(latencies) / len(latencies), max(latencies)
+
+
+def wait_idle():
+    while True:
+        with db.get_db() as c:
+            active = c.execute(f'SELECT COUNT(*) FROM generation_jobs WHERE {generation.ACTIVE}').fetchone()[0]
+        db.release_db()
+        if not active:
+            return
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='内容生成队列压测')
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--topics', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.5, help='离线桩每次调用耗时（秒）')
+    parser.add_argument('--threads', type=int, default=8, help='服务线程数')
+    parser.add_argument('--workers', type=int, default=4, help='生成队列线程数')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_generation_')
+    try:
+        db.pool = db.ConnectionPool(os.path.join(workdir, 'app.db'))
+        shutil.copy(SRC_DB, db.pool.db_path)
+        migrations.migrate()
+        with db.get_db() as c:
+            topics = [r[0] for r in c.execute('SELECT id FROM topics ORDER BY id LIMIT ?', (args.topics,))]
+        db.release_db()
+
+        print(f'{args.requests} 次请求 / {len(topics)} 个知识点，服务线程 {args.threads}，'
+              f'生成服务耗时 {args.latency} 秒/次')
+        stub = generation.StubProvider(latency=args.latency)
+        wall, avg, worst = run_requests(lambda t: legacy_request(stub, t), topics, args.requests, args.threads)
+        print(f'  原同步实现    请求平均 {avg * 1000:>8.1f} ms  最长 {worst * 1000:>8.1f} ms  '
+              f'全部完成 {wall:>6.2f} 秒  调用生成服务 {stub.calls} 次')
+
+        for label in ('后台队列(首次)', '后台队列(缓存)'):
+            stub = generation.StubProvider(latency=args.latency) if label.endswith('(首次)') else stub
+            queue = generation.GenerationQueue(backend.gen_content, provider=stub, workers=args.workers)
+            calls = stub.calls
+            t0 = time.perf_counter()
+            _, avg, worst = run_requests(lambda t: queued_request(queue, t), topics, args.requests, args.threads)
+            wait_idle()
+            wall = time.perf_counter() - t0
+            queue.shutdown(wait=True)
+            print(f'  {label:<12}  请求平均 {avg * 1000:>8.1f} ms  最长 {worst * 1000:>8.1f} ms  '
+                  f'全部完成 {wall:>6.2f} 秒  调用生成服务 {stub.calls - calls} 次')
+        db.pool.close_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
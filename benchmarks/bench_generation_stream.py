@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式生成首段输出耗时（离线桩）
+在本进程中用 waitress 启动后端，生成服务为模拟流式输出的 StubProvider
+（--latency 秒后产出首段，之后每 --token-delay 秒一段），对比客户端看到第一段文字的时间：
+- 提交任务并轮询（间隔 --poll 秒）：生成全部完成后才能看到内容
+- SSE 流式接口：首段生成后立即推送
+用法: python benchmarks/bench_generation_stream.py [--latency 1.0 --token-delay 0.02 --topics 5]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+os.environ['LLM_PROVIDER'] = 'local'
+
+from waitress import create_server  # noqa: E402
+
+import app as backend  # noqa: E402
+import db  # noqa: E402
+import generation  # noqa: E402
+import migrations  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def request(port, method, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request(method, path)
+    resp = conn.getresponse()
+    return conn, resp
+
+
+def poll_ttft(port, tid, interval):
+    """提交后轮询任务，完成时才拿到内容"""
+    t0 = time.perf_counter()
+    conn, resp = request(port, 'POST', f'/api/generate/topic/{tid}')
+    job = json.loads(resp.read())
+    conn.close()
+    while True:
+        conn, resp = request(port, 'GET', job['status_url'])
+        status = json.loads(resp.read())['status']
+        conn.close()
+        if status in ('done', 'failed'):
+            elapsed = time.perf_counter() - t0
+            return elapsed, elapsed
+        time.sleep(interval)
+
+
+def stream_ttft(port, tid):
+    """读取 SSE，返回 (首段耗时, 全部完成耗时)"""
+    t0 = time.perf_counter()
+    conn, resp = request(port, 'POST', f'/api/generate/topic/{tid}/stream')
+    first = None
+    while True:
+        line = resp.fp.readline()
+        if not line:
+            break
+        if first is None and line.startswith(b'event: token'):
+            first = time.perf_counter() - t0
+    conn.close()
+    return first, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式生成首段输出耗时')
+    parser.add_argument('--latency', type=float, default=1.0, help='首段输出前的耗时（秒）')
+    parser.add_argument('--token-delay', type=float, default=0.02, help='每段输出间隔（秒）')
+    parser.add_argument('--poll', type=float, default=1.0, help='轮询间隔（秒，与前端一致）')
+    parser.add_argument('--topics', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_stream_')
+    try:
+        db.pool = db.ConnectionPool(os.path.join(workdir, 'app.db'))
+        shutil.copy(SRC_DB, db.pool.db_path)
+        migrations.migrate()
+        with db.get_db() as c:
+            topics = [r[0] for r in c.execute('SELECT id FROM topics ORDER BY id LIMIT ?', (args.topics * 2,))]
+        db.release_db()
+        backend.generator.provider = generation.StubProvider(latency=args.latency, token_delay=args.token_delay)
+        server = create_server(backend.app, listen='127.0.0.1:0', threads=4)
+        threading.Thread(target=server.run, daemon=True).start()
+        port = server.effective_port
+
+        print(f'生成服务：首段 {args.latency} 秒，之后每 {args.token_delay} 秒一段；{args.topics} 个知识点取中位数')
+        cases = [
+            ('提交任务+轮询', lambda tid: poll_ttft(port, tid, args.poll), topics[:args.topics]),
+            ('SSE 流式', lambda tid: stream_ttft(port, tid), topics[args.topics:]),
+        ]
+        for label, fn, tids in cases:
+            results = [fn(tid) for tid in tids]
+            first = statistics.median(r[0] for r in results)
+            total = statistics.median(r[1] for r in results)
+            print(f'  {label:<10} 首段可见 {first * 1000:>8.1f} ms  全部完成 {total * 1000:>8.1f} ms')
+        with db.get_db() as c:
+            ttfts = [r[0] for r in c.execute('SELECT ttft FROM generation_jobs WHERE ttft IS NOT NULL')]
+        print(f'  服务端记录的 ttft 中位数 {statistics.median(ttfts) * 1000:.1f} ms（generation_jobs.ttft）')
+        server.close()
+        backend.generator.shutdown(wait=True)
+        db.release_db()
+        db.pool.close_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评分引擎基准测试
+对比原 api_exam_submit 中逐题解析/归一化的评分循环与预编译答案的单次遍历评分，
+并校验两者结果完全一致（含 detail 中各题的顺序：在数据库副本中打乱题目的 ord，
+交卷结果仍按原实现（没有索引、按 rowid 扫描）返回的顺序排列）。
+用法: python benchmarks/bench_grading.py [--rounds 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+import grading  # noqa: E402
+import migrations  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def legacy_grade(rows, answers):
+    """原实现（不含数据库读取）"""
+    total = 0
+    got = 0
+    detail = []
+    wrong_qids = []
+    for r in rows:
+        qid, qtype, ans, score, kref = r['id'], r['qtype'], r['answer'], r['score'], r['knowledge_ref']
+        ua = answers.get(str(qid)) or answers.get(qid)
+        correct = False
+        part = 0.0
+        if qtype == 'mcq':
+            correct = (str(ua).strip().upper() == ans.upper())
+        elif qtype == 'tf':
+            correct = (str(ua).strip().lower() in ['true', 't', '1', '是', '对'] and ans == 'True') or \
+                      (str(ua).strip().lower() in ['false', 'f', '0', '否', '错'] and ans == 'False')
+        elif qtype == 'fill':
+            correct = (str(ua).strip().lower() == ans.lower())
+        else:
+            try:
+                kw = json.loads(ans).get('keywords', [])
+            except Exception:
+                kw = []
+            hit = sum(1 for k in kw if k.lower() in str(ua or '').lower())
+            if kw:
+                part = min(1.0, hit / len(kw))
+            correct = part > 0.6
+        s = score if correct else (int(score * part) if part > 0 else 0)
+        if s < score:
+            wrong_qids.append(qid)
+        got += s
+        total += score
+        detail.append({'qid': qid, 'type': qtype, 'score': s, 'max': score, 'kref': kref})
+    return got, total, detail, wrong_qids
+
+
+def random_answers(rows, rng):
+    answers = {}
+    for r in rows:
+        qtype = r['qtype']
+        if qtype == 'mcq':
+            ua = rng.choice(['A', 'b ', 'C', 'd', '', None])
+        elif qtype == 'tf':
+            ua = rng.choice(['True', 'false', '对', '错', '1', 'x', None])
+        elif qtype == 'fill':
+            ua = rng.choice([r['answer'], r['answer'].upper() + ' ', 'ls', ''])
+        else:
+            kw = json.loads(r['answer']).get('keywords', [])
+            ua = '，'.join(rng.sample(kw, rng.randint(0, len(kw)))) + ' 其余作答内容' * rng.randint(0, 20)
+        answers[str(r['id']) if rng.random() < 0.8 else r['id']] = ua
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='评分引擎基准')
+    parser.add_argument('--rounds', type=int, default=5000)
+    parser.add_argument('--exam', type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_grading_')
+    try:
+        db.pool = db.ConnectionPool(os.path.join(workdir, 'app.db'))
+        shutil.copy(SRC_DB, db.pool.db_path)
+        migrations.migrate()
+        # 打乱 ord，使按 ord 排序与原实现（不排序）的顺序不同
+        db.run_write(lambda c: c.execute('UPDATE questions SET ord = -ord WHERE exam_id = ?', (args.exam,)))
+        c = db.get_db()
+        # 原 api_exam_submit 的查询；原库没有 questions 的索引，NOT INDEXED 还原它的扫描顺序
+        rows = c.execute('SELECT id,qtype,answer,score,knowledge_ref FROM questions NOT INDEXED WHERE exam_id=?',
+                         (args.exam,)).fetchall()
+        key = grading.answer_keys.get(c, args.exam)
+        db.release_db()
+        db.pool.close_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    rng = random.Random(42)
+    submissions = [random_answers(rows, rng) for _ in range(200)]
+
+    # 结果一致性校验
+    for answers in submissions:
+        assert tuple(grading.grade(key, answers)) == legacy_grade(rows, answers)
+    print(f'试卷 {args.exam}：{len(rows)} 题，{len(submissions)} 份随机作答结果与原实现一致')
+
+    t0 = time.perf_counter()
+    for i in range(args.rounds):
+        legacy_grade(rows, submissions[i % len(submissions)])
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(args.rounds):
+        grading.grade(key, submissions[i % len(submissions)])
+    compiled = time.perf_counter() - t0
+
+    print(f'原实现     {args.rounds / legacy:>10.0f} 份/秒')
+    print(f'预编译答案 {args.rounds / compiled:>10.0f} 份/秒  ({legacy / compiled:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+学生名单导入基准测试
+生成一份 N 行的名单（一半是已存在学生的更新），分别用原来的逐行 SELECT + INSERT/UPDATE
+（每个新学生一次PBKDF2哈希，整个导入一个写事务）和批量导入流水线导入到数据库副本，
+对比总耗时和最长的单次写锁持有时间。
+用法: python benchmarks/bench_import.py [--rows 2000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from openpyxl import Workbook, load_workbook
+from werkzeug.security import generate_password_hash
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+import student_import  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def make_roster(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['学生姓名', '学号', '班级', '手机号', '邮箱'])
+    for i in range(rows):
+        sid = f'BENCH{i % (rows // 2 or 1):06d}' if i >= rows // 2 else f'BENCH{i:06d}'
+        ws.append([f'学生{i}', sid, f'大数据{i % 8 + 1}班', f'138{i:08d}', f'stu{i}@example.com'])
+    wb.save(path)
+
+
+def legacy_import(path):
+    """原 StudentManager.import_from_excel 的导入循环，返回最长写锁持有时间"""
+    wb = load_workbook(filename=path, data_only=True)
+    ws = wb.active
+
+    def import_rows(conn):
+        cursor = conn.cursor()
+        for row_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
+            if row_idx == 1:
+                continue
+            name, student_id, class_name, phone, email = (str(v).strip() for v in row[:5])
+            existing = cursor.execute('SELECT id, name FROM users WHERE student_id = ?', (student_id,)).fetchone()
+            if existing:
+                cursor.execute('UPDATE users SET name = ?, class_name = ?, phone = ?, email = ? WHERE student_id = ?',
+                               (name, class_name, phone, email, student_id))
+            else:
+                cursor.execute('''
+                    INSERT INTO users (student_id, name, class_name, phone, email, role, password_hash, status, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (student_id, name, class_name, phone, email, 'student', generate_password_hash('123456'),
+                      'active', datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+    t0 = time.perf_counter()
+    db.run_write(import_rows)
+    return time.perf_counter() - t0
+
+
+def timed_run_write():
+    """包装 db.run_write，记录每个写事务的耗时"""
+    original = db.run_write
+    holds = []
+
+    def run_write(fn, **kw):
+        t0 = time.perf_counter()
+        try:
+            return original(fn, **kw)
+        finally:
+            holds.append(time.perf_counter() - t0)
+
+    student_import.run_write = run_write
+    return holds
+
+
+def fresh_pool(workdir, name):
+    path = os.path.join(workdir, name)
+    shutil.copy(SRC_DB, path)
+    db.pool = db.ConnectionPool(path)
+    migrations.migrate()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='学生名单导入基准')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--chunk-size', type=int, default=student_import.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_import_')
+    try:
+        roster = os.path.join(workdir, 'roster.xlsx')
+        make_roster(roster, args.rows)
+        print(f'名单 {args.rows} 行（{args.rows // 2} 个新学生，其余为重复学号的更新）')
+
+        fresh_pool(workdir, 'legacy.db')
+        t0 = time.perf_counter()
+        hold = legacy_import(roster)
+        legacy = time.perf_counter() - t0
+        db.pool.close_all()
+        print(f'原实现     总耗时 {legacy:>7.2f} 秒  最长写锁 {hold * 1000:>9.1f} ms')
+
+        fresh_pool(workdir, 'bulk.db')
+        holds = timed_run_write()
+        t0 = time.perf_counter()
+        result = student_import.import_students(roster, chunk_size=args.chunk_size)
+        bulk = time.perf_counter() - t0
+        db.pool.close_all()
+        print(f'批量流水线 总耗时 {bulk:>7.2f} 秒  最长写锁 {max(holds) * 1000:>9.1f} ms  '
+              f'({len(holds)} 批，新增 {result.imported}，更新 {result.updated})  {legacy / bulk:.1f}x')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务模式压测
+对比原来的 Flask 开发服务器（main.py 默认方式，每个请求一个线程）与 --serve production
+（waitress 工作线程池 + HTTP/1.1 长连接）的吞吐量和延迟。
+服务端在子进程中运行，使用数据库副本；客户端用多个进程、每个进程多个长连接并发请求
+学习内容、试卷和静态资源等只读接口。
+用法: python benchmarks/bench_serving.py [--clients 32] [--duration 10] [--threads 8]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+PATHS = [
+    '/api/modules',
+    '/api/modules/1/topics',
+    '/api/topics/31/content',
+    '/api/topics/60/content',
+    '/api/exams',
+    '/api/exams/1',
+    '/assets/app.js',
+    '/',
+]
+
+
+def run_child(mode, port, db_path, threads):
+    """子进程：用数据库副本启动指定模式的服务"""
+    sys.path.insert(0, ROOT)
+    sys.argv = ['main.py']
+    import main
+    backend = main.backend_module
+    backend.db.pool = backend.db.ConnectionPool(db_path)
+    backend.init_db()
+    backend.db.release_db()
+    if mode == 'production':
+        main.create_production_server([f'127.0.0.1:{port}'], threads=threads).run()
+    else:
+        # 与 main.py 开发模式相同的 app.run；压测只用一个端口，前端请求也交给合并后的应用
+        from flask import Flask
+        dev = Flask('bench_dev')
+        dev.wsgi_app = main.combined_app
+        dev.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/ready')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError('服务启动超时')
+
+
+def client_worker(port, connections, duration, headers, queue):
+    """一个客户端进程：connections 个线程，每个线程一个长连接循环请求"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def loop(offset):
+        conn = None
+        local = []
+        i = offset
+        while time.perf_counter() < deadline:
+            path = PATHS[i % len(PATHS)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                conn.request('GET', path, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    raise http.client.HTTPException(resp.status)
+                if resp.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                if conn is not None:
+                    conn.close()
+                conn = None
+                continue
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=loop, args=(n,)) for n in range(connections)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    queue.put((latencies, errors[0]))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def bench(mode, args, db_path):
+    port = free_port()
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--child', mode, '--port', str(port),
+                              '--db', db_path, '--threads', str(args.threads)],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        headers = {'Accept-Encoding': 'gzip, br'}
+        queue = multiprocessing.Queue()
+        per_proc = max(1, args.clients // args.procs)
+        procs = [multiprocessing.Process(target=client_worker, args=(port, per_proc, args.duration, headers, queue))
+                 for _ in range(args.procs)]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        latencies, errors = [], 0
+        for _ in procs:
+            lat, err = queue.get()
+            latencies.extend(lat)
+            errors += err
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        child.terminate()
+        child.wait()
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.50) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'errors': errors,
+        'requests': len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='服务模式压测')
+    parser.add_argument('--clients', type=int, default=32, help='并发长连接总数')
+    parser.add_argument('--procs', type=int, default=4, help='客户端进程数')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--threads', type=int, default=8, help='生产模式工作线程数')
+    parser.add_argument('--child', choices=['dev', 'production'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.port, args.db, args.threads)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='bench_serving_')
+    try:
+        db_path = os.path.join(workdir, 'app.db')
+        shutil.copy(SRC_DB, db_path)
+        print(f'{args.clients} 个并发长连接，{args.procs} 个客户端进程，每种模式 {args.duration:g} 秒')
+        results = {}
+        for mode in ('dev', 'production'):
+            r = results[mode] = bench(mode, args, db_path)
+            print(f"{mode:<11} {r['rps']:>8.0f} 请求/秒  p50 {r['p50']:>7.1f} ms  p99 {r['p99']:>7.1f} ms  "
+                  f"请求 {r['requests']}  错误 {r['errors']}")
+        print(f"吞吐提升 {results['production']['rps'] / max(results['dev']['rps'], 1e-9):.2f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
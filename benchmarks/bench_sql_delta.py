@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL增量导出基准测试
+在数据库副本中生成 N 份提交（以及 rowid 有空缺的文本主键表）后做一次全量导出，然后模拟日常变化（新增提交和学生、修改和删除少量行），
+对比再次全量导出与增量导出（只写新增或修改的行）的耗时和文件大小；
+最后把结构文件 + 全量数据 + 各增量文件导入空库、以及合并（--compact）后的全量数据导入空库，逐表与源库核对。
+用法: python benchmarks/bench_sql_delta.py [--submissions 50000 --rounds 3]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_sql_export import populate  # noqa: E402
+from sql_exporter import SQLExporter, MANIFEST_FILE  # noqa: E402
+
+
+def quiet(fn, *args):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def seed_cache(db_path, n=300):
+    """generation_cache 以文本为主键（rowid 不是主键别名、导出中不保留），写入 n 行后删掉一段，
+    使 rowid 出现空缺且超过一个校验块，检查这类表的增量是否正确"""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("INSERT INTO generation_cache(prompt_hash, provider, model, text, created_at) "
+                         "VALUES(?, 'stub', 'stub', ?, 0)", [(f'h{i:06d}', f'内容{i}') for i in range(n)])
+        conn.execute("DELETE FROM generation_cache WHERE prompt_hash < 'h000050'")
+    conn.close()
+
+
+def change(db_path, rng, n_new):
+    """新增 n_new 份提交和一些学生，修改少量学生、删除少量提交，修改、新增和删除少量生成缓存"""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        max_user = conn.execute('SELECT MAX(id) FROM users').fetchone()[0]
+        conn.executemany("INSERT INTO users(name, student_id, class_name, role, password_hash) "
+                         "VALUES(?, ?, '新班', 'student', 'x')",
+                         [(f'新生{max_user + i}', f'N{max_user + i:07d}') for i in range(n_new // 10)])
+        conn.executemany("INSERT INTO submissions(user_id, exam_id, score, total, rate, detail, wrong_qids, suggestions) "
+                         "VALUES(?, 2, ?, 100, ?, '[]', '[]', '[]')",
+                         [(rng.randint(1, max_user), s, s * 1.0) for s in (rng.randint(0, 100) for _ in range(n_new))])
+        ids = [r[0] for r in conn.execute('SELECT id FROM users ORDER BY random() LIMIT 5')]
+        conn.executemany("UPDATE users SET class_name = '调班' WHERE id = ?", [(i,) for i in ids])
+        sids = [r[0] for r in conn.execute('SELECT id FROM submissions ORDER BY random() LIMIT 3')]
+        conn.executemany('DELETE FROM submissions WHERE id = ?', [(i,) for i in sids])
+        hashes = [r[0] for r in conn.execute('SELECT prompt_hash FROM generation_cache ORDER BY random() LIMIT 2')]
+        conn.execute("UPDATE generation_cache SET text = '已更新' WHERE prompt_hash = ?", (hashes[0],))
+        conn.execute('DELETE FROM generation_cache WHERE prompt_hash = ?', (hashes[1],))
+        conn.execute("INSERT INTO generation_cache(prompt_hash, provider, model, text, created_at) "
+                     "VALUES(?, 'stub', 'stub', '新增', 0)", (f'a{rng.random()}',))
+    conn.close()
+
+
+def rebuild(sql_dir, files, path):
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    for name in files:
+        with open(os.path.join(sql_dir, name), encoding='utf-8') as f:
+            conn.executescript(f.read())
+    conn.close()
+
+
+def same_data(src_path, dst_path, skip=()):
+    src = sqlite3.connect(src_path)
+    dst = sqlite3.connect(dst_path)
+    tables = SQLExporter(src_path, sql_dir=os.path.dirname(dst_path)).get_all_tables()
+    ok = True
+    for table in tables:
+        if table in skip:
+            continue
+        if src.execute("SELECT sql FROM sqlite_master WHERE name=?", (table,)).fetchone()[0].upper().startswith(
+                'CREATE VIRTUAL'):
+            a = src.execute(f"SELECT rowid, * FROM {table} ORDER BY rowid").fetchall()
+            b = dst.execute(f"SELECT rowid, * FROM {table} ORDER BY rowid").fetchall()
+        else:
+            order = ', '.join(str(i + 1) for i in range(len(src.execute(f'PRAGMA table_info({table})').fetchall())))
+            a = src.execute(f'SELECT * FROM {table} ORDER BY {order}').fetchall()
+            b = dst.execute(f'SELECT * FROM {table} ORDER BY {order}').fetchall()
+        if a != b:
+            print(f'  ❌ {table} 不一致（{len(a)} / {len(b)} 行）')
+            ok = False
+    src.close()
+    dst.close()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQL增量导出基准')
+    parser.add_argument('--submissions', type=int, default=50000)
+    parser.add_argument('--rounds', type=int, default=3, help='变化+导出的轮数')
+    parser.add_argument('--new', type=int, default=200, help='每轮新增的提交数')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_sql_delta_')
+    try:
+        db_path = os.path.join(workdir, 'app.db')
+        populate(db_path, args.submissions)
+        seed_cache(db_path)
+        full_dir = os.path.join(workdir, 'full')
+        delta_dir = os.path.join(workdir, 'delta')
+        full = SQLExporter(db_path, sql_dir=full_dir)
+        inc = SQLExporter(db_path, sql_dir=delta_dir)
+        for exporter in (full, inc):
+            quiet(exporter.export_all_schemas)
+            quiet(exporter.export_all_data)
+        print(f'{args.submissions} 份提交，每轮新增 {args.new} 份提交、{args.new // 10} 名学生，修改 5 名学生，删除 3 份提交')
+
+        rng = random.Random(7)
+        for i in range(args.rounds):
+            change(db_path, rng, args.new)
+            data_file, full_time = quiet(full.export_all_data)
+            delta_file, delta_time = quiet(inc.export_delta)
+            print(f'  第 {i + 1} 轮  全量 {full_time:>6.2f} 秒 {os.path.getsize(data_file) / 1024 / 1024:>7.1f} MB   '
+                  f'增量 {delta_time:>6.2f} 秒 {os.path.getsize(delta_file) / 1024:>7.1f} KB')
+        _, none_time = quiet(inc.export_delta)
+        print(f'  无变化时增量导出 {none_time:.2f} 秒（不生成文件）')
+
+        with open(os.path.join(delta_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            deltas = json.load(f)['deltas']
+        check = os.path.join(workdir, 'check.db')
+        rebuild(delta_dir, ['database_schema.sql', 'database_data.sql'] + deltas, check)
+        print(f'  全量 + {len(deltas)} 个增量导入空库核对: {"一致" if same_data(db_path, check) else "不一致"}')
+
+        _, compact_time = quiet(inc.compact)
+        left = os.listdir(os.path.join(delta_dir, 'deltas'))
+        rebuild(delta_dir, ['database_schema.sql', 'database_data.sql'], check)
+        print(f'  合并耗时 {compact_time:.2f} 秒，剩余增量文件 {len(left)} 个，'
+              f'合并后导入空库核对: {"一致" if same_data(db_path, check) else "不一致"}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL导出基准测试
+在数据库副本中生成 N 份提交（含明细JSON），对比原 SQLExporter 数据导出（fetchall + 字符串拼接、每行一条INSERT、
+再拼接成完整文件）、流式分块多行INSERT顺序导出、快照后多进程/多线程并行导出的耗时和 Python 内存峰值，
+并把新导出的文件导入空库核对数据一致。
+最后在导出期间持续写入（每个事务新增一名学生和他的一份提交），检查导出的提交是否都能找到对应学生。
+用法: python benchmarks/bench_sql_export.py [--submissions 50000 --workers 4]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+from sql_exporter import SQLExporter  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+class LegacyExporter(SQLExporter):
+    """原 export_table_data / export_all_data"""
+
+    def export_table_data(self, table_name):
+        conn = self.get_database_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        column_names = [col[1] for col in cursor.fetchall()]
+        cursor.execute(f"SELECT * FROM {table_name}")
+        rows = cursor.fetchall()
+        data_sql = f"-- 表数据: {table_name}\n"
+        data_sql += f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        data_sql += f"-- 记录数: {len(rows)}\n\n"
+        if rows:
+            data_sql += f"DELETE FROM {table_name};\n\n"
+            columns_str = ', '.join(column_names)
+            for row in rows:
+                values = []
+                for value in row:
+                    if value is None:
+                        values.append('NULL')
+                    elif isinstance(value, str):
+                        escaped_value = value.replace("'", "''")
+                        values.append(f"'{escaped_value}'")
+                    elif isinstance(value, (int, float)):
+                        values.append(str(value))
+                    else:
+                        values.append(f"'{str(value)}'")
+                values_str = ', '.join(values)
+                data_sql += f"INSERT INTO {table_name} ({columns_str}) VALUES ({values_str});\n"
+            data_sql += "\n"
+        conn.close()
+        return data_sql
+
+    def export_all_data(self):
+        tables = self.get_all_tables()
+        all_data_sql = "-- 数据库数据导出\n"
+        for table in tables:
+            data_sql = self.export_table_data(table)
+            if data_sql:
+                all_data_sql += data_sql
+                with open(os.path.join(self.sql_dir, f"{table}_data.sql"), 'w', encoding='utf-8') as f:
+                    f.write(data_sql)
+        all_data_file = os.path.join(self.sql_dir, "database_data.sql")
+        with open(all_data_file, 'w', encoding='utf-8') as f:
+            f.write(all_data_sql)
+        return all_data_file
+
+
+def populate(path, n):
+    shutil.copy(SRC_DB, path)
+    db.pool = db.ConnectionPool(path)
+    migrations.migrate()
+    rng = random.Random(5)
+    with db.get_db() as c:
+        qids = [r[0] for r in c.execute('SELECT id FROM questions WHERE exam_id = 1')]
+    detail = [{'qid': q, 'type': 'mcq', 'score': 2, 'max': 2, 'kref': '1:1'} for q in qids]
+
+    def insert(c):
+        c.executemany('INSERT INTO users(name, student_id, class_name, role, password_hash) VALUES(?,?,?,?,?)',
+                      [(f'学生{i}', f'S{i:06d}', f'{i % 20 + 1}班', 'student', 'x') for i in range(n // 10)])
+        c.executemany('INSERT INTO submissions(user_id, exam_id, score, total, rate, detail, wrong_qids, suggestions) '
+                      "VALUES(?, 1, ?, 100, ?, ?, '[]', ?)",
+                      [(rng.randint(1, n // 10), s, s * 1.0, json.dumps(detail),
+                        json.dumps(["优先复习：Shell - 变量定义（错题数 1）; echo 'a;b'"], ensure_ascii=False))
+                       for s in (rng.randint(0, 100) for _ in range(n))])
+    db.run_write(insert)
+    db.release_db()
+    db.pool.close_all()
+
+
+def run(exporter_cls, db_path, out_dir, trace, **kwargs):
+    os.makedirs(out_dir, exist_ok=True)
+    exporter = exporter_cls(db_path, **kwargs)
+    exporter.sql_dir = out_dir
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = exporter.export_all_data()
+    elapsed = time.perf_counter() - t0
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return path, elapsed, peak
+
+
+def verify(src_path, data_file, workdir):
+    """按源库结构建空库，执行导出的数据文件，逐表比较"""
+    dst_path = os.path.join(workdir, 'verify.db')
+    if os.path.exists(dst_path):
+        os.remove(dst_path)
+    src = sqlite3.connect(src_path)
+    dst = sqlite3.connect(dst_path)
+    tables = SQLExporter(src_path).get_all_tables()
+    for (sql,) in src.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name IN (%s)"
+                              % ','.join('?' * len(tables)), tables):
+        dst.execute(sql)
+    with open(data_file, encoding='utf-8') as f:
+        dst.executescript(f.read())
+    ok = True
+    for table in tables:
+        if src.execute("SELECT sql FROM sqlite_master WHERE name=?", (table,)).fetchone()[0].upper().startswith(
+                'CREATE VIRTUAL'):
+            continue
+        a = src.execute(f'SELECT * FROM {table} ORDER BY 1').fetchall()
+        b = dst.execute(f'SELECT * FROM {table} ORDER BY 1').fetchall()
+        if a != b:
+            print(f'  ❌ {table} 不一致（{len(a)} / {len(b)} 行）')
+            ok = False
+    src.close()
+    dst.close()
+    return ok
+
+
+def orphans_during_writes(exporter_cls, db_path, out_dir, prefix, **kwargs):
+    """导出期间另一个连接不断写入，返回导出结果中找不到学生的提交数"""
+    stop = threading.Event()
+
+    def writer():
+        conn = sqlite3.connect(db_path, timeout=30)
+        i = 0
+        while not stop.is_set():
+            with conn:
+                uid = conn.execute("INSERT INTO users(name, student_id, class_name, role, password_hash) "
+                                   "VALUES('并发', ?, '1班', 'student', 'x')", (f'{prefix}{i:08d}',)).lastrowid
+                conn.execute("INSERT INTO submissions(user_id, exam_id, score, total, rate, detail, wrong_qids, "
+                             "suggestions) VALUES(?, 1, 50, 100, 50.0, '[]', '[]', '[]')", (uid,))
+            i += 1
+        conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        run(exporter_cls, db_path, out_dir, trace=False, **kwargs)
+    finally:
+        stop.set()
+        thread.join()
+    src = sqlite3.connect(db_path)
+    conn = sqlite3.connect(':memory:')
+    for table in ('users', 'submissions'):
+        cols = [r[1] for r in src.execute(f'PRAGMA table_info({table})')]
+        conn.execute(f"CREATE TABLE {table}({', '.join(cols)})")
+        with open(os.path.join(out_dir, f'{table}_data.sql'), encoding='utf-8') as f:
+            conn.executescript(f.read())
+    src.close()
+    orphans = conn.execute('SELECT COUNT(*) FROM submissions WHERE user_id NOT IN (SELECT id FROM users)').fetchone()[0]
+    conn.close()
+    return orphans
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQL导出基准')
+    parser.add_argument('--submissions', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_sql_export_')
+    try:
+        db_path = os.path.join(workdir, 'app.db')
+        populate(db_path, args.submissions)
+        print(f'{args.submissions} 份提交')
+        cases = (('原实现', LegacyExporter, {}),
+                 ('流式顺序导出', SQLExporter, {}),
+                 (f'快照+{args.workers}进程', SQLExporter, {'workers': args.workers}),
+                 (f'快照+{args.workers}线程', SQLExporter, {'workers': args.workers, 'use_threads': True}))
+        for label, cls, kwargs in cases:
+            out_dir = os.path.join(workdir, label)
+            path, elapsed, _ = run(cls, db_path, out_dir, trace=False, **kwargs)
+            _, _, peak = run(cls, db_path, out_dir, trace=True, **kwargs)
+            size = os.path.getsize(path)
+            print(f'  {label:<10} 耗时 {elapsed:>6.2f} 秒  内存峰值 {peak / 1024 / 1024:>7.1f} MB  '
+                  f'database_data.sql {size / 1024 / 1024:>6.1f} MB')
+            if cls is SQLExporter:
+                ok = verify(db_path, path, workdir)
+                print(f'    导入空库核对: {"一致" if ok else "不一致"}')
+
+        print('导出期间持续写入（学生和提交在同一事务中新增）:')
+        for i, (label, cls, kwargs) in enumerate(cases[:3]):
+            orphans = orphans_during_writes(cls, db_path, os.path.join(workdir, 'writes_' + label), f'W{i}_', **kwargs)
+            print(f'  {label:<10} 找不到学生的提交 {orphans} 份')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
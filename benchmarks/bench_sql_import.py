@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL导入基准测试
+在数据库副本中生成 N 份提交（含明细JSON和按题目的答题记录），用 SQLExporter 导出后，
+对比原导入脚本（整文件读入、按 ';' 切分、每段单独执行）与新导入脚本（流式切分语句、
+一个事务、journal_mode=OFF、数据导入后建索引和触发器）的耗时、Python 内存峰值、执行出错的语句数，
+并逐表核对导入结果，检查索引和触发器数量与源库一致。
+另外用两个脚本分别导入仓库中已有的 SQL 目录（旧格式导出），比较各表导入的行数。
+用法: python benchmarks/bench_sql_import.py [--submissions 20000]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import db  # noqa: E402
+import exam_answers  # noqa: E402
+from bench_sql_delta import same_data  # noqa: E402
+from bench_sql_export import populate  # noqa: E402
+from sql_exporter import SQLExporter  # noqa: E402
+
+
+def legacy_import(db_path, sql_dir):
+    """原 import_database.py"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        for name in ('database_schema.sql', 'database_data.sql'):
+            with open(os.path.join(sql_dir, name), 'r', encoding='utf-8') as f:
+                text = f.read()
+            statements = [stmt.strip() for stmt in text.split(';') if stmt.strip() and not stmt.strip().startswith('--')]
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except sqlite3.Error as e:
+                    print(f"执行语句时出错: {statement[:50]}... 错误: {e}")
+            conn.commit()
+    except Exception as e:
+        print(f"导入过程中出错: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def load_importer(sql_dir):
+    spec = importlib.util.spec_from_file_location('import_database', os.path.join(sql_dir, 'import_database.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.import_database
+
+
+def run(fn, db_path, sql_dir, trace):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    if trace:
+        tracemalloc.start()
+    out = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        fn(db_path, sql_dir)
+    elapsed = time.perf_counter() - t0
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, out.getvalue().count('执行语句时出错')
+
+
+def schema_counts(path):
+    conn = sqlite3.connect(path)
+    counts = dict(conn.execute("SELECT type, COUNT(*) FROM sqlite_master WHERE type IN ('index', 'trigger') "
+                               "AND sql IS NOT NULL GROUP BY type"))
+    conn.close()
+    return counts
+
+
+def table_counts(path):
+    conn = sqlite3.connect(path)
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table' "
+                                         "AND name NOT LIKE 'sqlite_%'")]
+    counts = {t: conn.execute(f'SELECT COUNT(*) FROM {t}').fetchone()[0] for t in tables}
+    conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQL导入基准')
+    parser.add_argument('--submissions', type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_sql_import_')
+    try:
+        src_path = os.path.join(workdir, 'app.db')
+        populate(src_path, args.submissions)
+        db.pool = db.ConnectionPool(src_path)
+        db.run_write(exam_answers.backfill)
+        db.release_db()
+        db.pool.close_all()
+
+        sql_dir = os.path.join(workdir, 'SQL')
+        with contextlib.redirect_stdout(io.StringIO()):
+            SQLExporter(src_path, sql_dir=sql_dir).export_all()
+        size = os.path.getsize(os.path.join(sql_dir, 'database_data.sql'))
+        with sqlite3.connect(src_path) as conn:
+            answers = conn.execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+        print(f'{args.submissions} 份提交、{answers} 条答题记录，database_data.sql {size / 1024 / 1024:.1f} MB')
+
+        importer = load_importer(os.path.join(ROOT, 'SQL'))
+        print('仓库 SQL 目录:')
+        results = {}
+        for label, fn in (('原导入脚本', legacy_import), ('流式单事务', importer)):
+            dst_path = os.path.join(workdir, f'repo_{len(results)}.db')
+            elapsed, _, errors = run(fn, dst_path, os.path.join(ROOT, 'SQL'), trace=False)
+            results[label] = table_counts(dst_path)
+            print(f'  {label:<8} 耗时 {elapsed:>6.2f} 秒  出错语句 {errors:>5}  '
+                  f'共 {sum(results[label].values())} 行')
+        old, new = results.values()
+        for table in new:
+            if old.get(table) != new[table]:
+                print(f'    {table}: {old.get(table, 0)} / {new[table]} 行')
+
+        print('生成的数据:')
+        expected = schema_counts(src_path)
+        for label, fn in (('原导入脚本', legacy_import), ('流式单事务', importer)):
+            dst_path = os.path.join(workdir, 'imported.db')
+            elapsed, _, errors = run(fn, dst_path, sql_dir, trace=False)
+            _, peak, _ = run(fn, dst_path, sql_dir, trace=True)
+            with contextlib.redirect_stdout(io.StringIO()) as diff:
+                ok = same_data(src_path, dst_path)
+            got = schema_counts(dst_path)
+            print(f'  {label:<8} 耗时 {elapsed:>6.2f} 秒  内存峰值 {peak / 1024 / 1024:>7.1f} MB  出错语句 {errors:>5}  '
+                  f'数据{"一致" if ok else "不一致"}  索引 {got.get("index", 0)}/{expected.get("index", 0)}  '
+                  f'触发器 {got.get("trigger", 0)}/{expected.get("trigger", 0)}')
+            if not ok:
+                print('    ' + diff.getvalue().strip().replace('\n', '\n    '))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+学生列表分页/搜索基准测试
+在数据库副本中生成 N 名学生，对比原 get_students_list（每页 COUNT(*) + LIKE '%x%' + LIMIT/OFFSET）
+与学号游标分页 + trigram 全文索引（1、2 个字的关键词用姓名片段索引）+ 缓存总数的单次请求耗时，
+并核对按姓名搜索时两种实现的总数一致。
+用法: python benchmarks/bench_student_search.py [--students 100000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+import student_search  # noqa: E402
+
+SRC_DB = os.path.join(ROOT, 'DB', 'app.db')
+
+
+def legacy_list(c, page, per_page, search):
+    """原实现"""
+    where_clause = "WHERE role = 'student'"
+    params = []
+    if search:
+        where_clause += " AND (name LIKE ? OR student_id LIKE ? OR class_name LIKE ?)"
+        params.extend([f'%{search}%'] * 3)
+    total = c.execute(f'SELECT COUNT(*) FROM users {where_clause}', params).fetchone()[0]
+    rows = c.execute(f'''
+        SELECT id, name, student_id, class_name, phone, email, status, created_at
+        FROM users {where_clause} ORDER BY student_id LIMIT ? OFFSET ?
+    ''', params + [per_page, (page - 1) * per_page]).fetchall()
+    return total, rows
+
+
+def populate(path, n):
+    shutil.copy(SRC_DB, path)
+    db.pool = db.ConnectionPool(path)
+    migrations.migrate()
+    rng = random.Random(7)
+    surnames = '张王李赵刘陈杨黄周吴徐孙马朱胡郭何高林罗'
+    given = '伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀英华慧建平刚桂兰'
+    # 姓名2到3个字，其中两字姓名（如「张伟」）约占一半
+    rows = [(rng.choice(surnames) + ''.join(rng.sample(given, rng.randint(1, 2))), f'2301{i:07d}',
+             f'大数据{i % 60 + 1}班', 'student', 'x') for i in range(n)]
+    db.run_write(lambda c: c.executemany(
+        'INSERT INTO users(name, student_id, class_name, role, password_hash) VALUES(?,?,?,?,?)', rows))
+
+
+def timed(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='学生列表分页/搜索基准')
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_search_')
+    try:
+        populate(os.path.join(workdir, 'app.db'), args.students)
+        c = db.get_db()
+        per_page = args.per_page
+        deep = args.students // per_page - 1
+        # 深页的游标：上一页最后一个学号
+        deep_cursor = c.execute("SELECT student_id FROM users WHERE role='student' ORDER BY student_id "
+                                'LIMIT 1 OFFSET ?', ((deep - 1) * per_page - 1,)).fetchone()[0]
+        cases = [
+            ('第1页', lambda: legacy_list(c, 1, per_page, None),
+             lambda: student_search.list_students(c, None, per_page)),
+            (f'第{deep}页', lambda: legacy_list(c, deep, per_page, None),
+             lambda: student_search.list_students(c, None, per_page, cursor=deep_cursor)),
+            ('搜索班级「大数据42班」', lambda: legacy_list(c, 1, per_page, '大数据42班'),
+             lambda: student_search.list_students(c, '大数据42班', per_page)),
+            ('搜索学号「2301004」', lambda: legacy_list(c, 1, per_page, '2301004'),
+             lambda: student_search.list_students(c, '2301004', per_page)),
+            ('搜索姓名「张伟」(2字)', lambda: legacy_list(c, 1, per_page, '张伟'),
+             lambda: student_search.list_students(c, '张伟', per_page)),
+            ('搜索名字「丽强」(2字,不在开头)', lambda: legacy_list(c, 1, per_page, '丽强'),
+             lambda: student_search.list_students(c, '丽强', per_page)),
+            ('搜索姓「张」(1字)', lambda: legacy_list(c, 1, per_page, '张'),
+             lambda: student_search.list_students(c, '张', per_page)),
+        ]
+        print(f'{args.students} 名学生，每页 {per_page} 条，单次请求平均耗时')
+        for label, legacy, new in cases:
+            a = timed(legacy, args.repeat)
+            b = timed(new, args.repeat)
+            print(f'  {label:<22} 原实现 {a:>8.2f} ms  新实现 {b:>8.2f} ms  ({a / b:.1f}x)')
+        for name in ('张伟', '丽强', '张', '张丽强'):
+            a = legacy_list(c, 1, per_page, name)[0]
+            b = student_search.list_students(c, name, per_page)['total']
+            print(f'  核对「{name}」总数: 原实现 {a}  新实现 {b}  {"一致" if a == b else "不一致"}')
+        db.release_db()
+        db.pool.close_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
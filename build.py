@@ -69,6 +69,19 @@ def clean_build():
             spec_file.unlink()
             print(f"✅ 清理文件: {spec_file}")
 
+def precompress_static():
+    """预压缩前端静态资源（运行时 /assets 路由直接发送 .br/.gz 文件）"""
+    print("\n🗜️ 预压缩前端静态资源...")
+    sys.path.insert(0, os.path.abspath('backend'))
+    try:
+        import compression
+    except ImportError as e:
+        print(f"⚠️ 跳过预压缩: {e}")
+        return
+    for path, size, sizes in compression.precompress_assets(os.path.join('frontend', 'assets')):
+        detail = ', '.join(f'{enc} {n} 字节' for enc, n in sizes.items())
+        print(f"✅ {path}: {size} 字节 -> {detail}")
+
 def build_executable():
     """构建可执行文件"""
     print("\n🔨 开始构建可执行文件...")
@@ -88,6 +101,8 @@ def build_executable():
         '--hidden-import=openpyxl',
         '--hidden-import=openai',
         '--hidden-import=werkzeug.security',
+        '--hidden-import=brotli',
+        '--hidden-import=waitress',
         '--exclude-module=tkinter',
         '--exclude-module=matplotlib',
         '--exclude-module=numpy',
@@ -182,6 +197,9 @@ def main():
     # 清理构建目录
     clean_build()
     
+    # 预压缩静态资源
+    precompress_static()
+    
     # 构建可执行文件
     if not build_executable():
         print("\n❌ 构建失败")
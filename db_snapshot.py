@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库二进制快照：与 SQL 导出并存的快速分发/恢复格式
+- snapshot: VACUUM INTO 生成一致、紧凑的数据库副本，压缩写入 zip 归档，
+  归档中的 snapshot.json 记录数据库文件的 SHA-256、大小、结构版本和各表行数
+- restore: 流式解压到目标库旁的临时文件，边写边算 SHA-256，再做 PRAGMA integrity_check
+  并核对结构版本和各表行数，全部通过后才替换目标库：
+  默认直接替换文件（需先停止应用）；--online 用在线备份API写入正在使用的数据库，
+  并把 data_versions 中的版本号调到高于恢复前的值，使应用中按版本号缓存的数据全部失效
+用法: python db_snapshot.py snapshot [--db DB/app.db] [--out SQL/database_snapshot.zip]
+      python db_snapshot.py restore [--db DB/app.db] [--archive SQL/database_snapshot.zip] [--online] [--quick]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_DB = os.path.join(ROOT, 'DB', 'app.db')
+DEFAULT_ARCHIVE = os.path.join(ROOT, 'SQL', 'database_snapshot.zip')
+# 归档中的文件名和格式版本
+DB_ENTRY = 'app.db'
+META_ENTRY = 'snapshot.json'
+FORMAT_VERSION = 1
+COPY_BUFFER = 1024 * 1024
+
+
+class SnapshotError(Exception):
+    """快照归档损坏或与记录不符"""
+
+
+def schema_version(conn):
+    """schema_migrations 中的最新版本（没有迁移表时为 0）"""
+    row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'").fetchone()
+    if not row:
+        return 0
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations').fetchone()[0]
+
+
+def table_counts(conn):
+    """各表行数（不含 sqlite_ 内部表）"""
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table' "
+                                         "AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    return {t: conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0] for t in tables}
+
+
+def create_snapshot(db_path=DEFAULT_DB, archive_path=DEFAULT_ARCHIVE, level=6):
+    """生成快照归档，返回归档路径"""
+    t0 = time.perf_counter()
+    tmp_dir = tempfile.mkdtemp(prefix='db_snapshot_')
+    try:
+        copy_path = os.path.join(tmp_dir, DB_ENTRY)
+        src = sqlite3.connect(db_path)
+        try:
+            journal_mode = src.execute('PRAGMA journal_mode').fetchone()[0]
+            # VACUUM INTO 在一个读事务中复制，得到一致且去掉空闲页的副本，不阻塞其他连接的写入
+            src.execute('VACUUM INTO ?', (copy_path,))
+        finally:
+            src.close()
+
+        conn = sqlite3.connect(copy_path)
+        try:
+            meta = {
+                'format': FORMAT_VERSION,
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'source': os.path.abspath(db_path),
+                'journal_mode': journal_mode,
+                'schema_version': schema_version(conn),
+                'tables': table_counts(conn),
+            }
+        finally:
+            conn.close()
+
+        digest = hashlib.sha256()
+        with open(copy_path, 'rb') as f:
+            for block in iter(lambda: f.read(COPY_BUFFER), b''):
+                digest.update(block)
+        meta['size'] = os.path.getsize(copy_path)
+        meta['sha256'] = digest.hexdigest()
+
+        # 先写临时归档再替换，中途失败不会留下半个归档
+        archive_dir = os.path.dirname(archive_path)
+        if archive_dir and not os.path.exists(archive_dir):
+            os.makedirs(archive_dir)
+        tmp_archive = archive_path + '.tmp'
+        with zipfile.ZipFile(tmp_archive, 'w', zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+            zf.writestr(META_ENTRY, json.dumps(meta, ensure_ascii=False, indent=2))
+            zf.write(copy_path, DB_ENTRY)
+        os.replace(tmp_archive, archive_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"生成快照: {archive_path}（数据库 {meta['size'] / 1024 / 1024:.1f} MB，"
+          f"归档 {os.path.getsize(archive_path) / 1024 / 1024:.1f} MB，耗时 {time.perf_counter() - t0:.2f} 秒）")
+    return archive_path
+
+
+def read_meta(zf):
+    try:
+        meta = json.loads(zf.read(META_ENTRY).decode('utf-8'))
+    except KeyError:
+        raise SnapshotError(f'归档中缺少 {META_ENTRY}')
+    if meta.get('format') != FORMAT_VERSION:
+        raise SnapshotError(f"不支持的快照格式版本: {meta.get('format')}")
+    return meta
+
+
+def extract_database(archive_path, dest_path):
+    """把归档中的数据库流式解压到 dest_path 并校验大小和 SHA-256，返回快照记录"""
+    with zipfile.ZipFile(archive_path) as zf:
+        meta = read_meta(zf)
+        digest = hashlib.sha256()
+        # 读完整个条目时 zipfile 还会校验 CRC32，不一致抛 BadZipFile
+        with zf.open(DB_ENTRY) as src, open(dest_path, 'wb') as dst:
+            for block in iter(lambda: src.read(COPY_BUFFER), b''):
+                digest.update(block)
+                dst.write(block)
+    size = os.path.getsize(dest_path)
+    if size != meta['size'] or digest.hexdigest() != meta['sha256']:
+        raise SnapshotError(f"数据库文件校验失败（大小 {size} / {meta['size']}，"
+                            f"SHA-256 {digest.hexdigest()[:12]} / {meta['sha256'][:12]}）")
+    return meta
+
+
+def verify_database(path, meta, quick=False):
+    """完整性检查，并核对结构版本和各表行数"""
+    conn = sqlite3.connect(path)
+    try:
+        pragma = 'quick_check' if quick else 'integrity_check'
+        problems = [r[0] for r in conn.execute(f'PRAGMA {pragma}')]
+        if problems != ['ok']:
+            raise SnapshotError(f"{pragma} 未通过: {'；'.join(problems[:5])}")
+        version = schema_version(conn)
+        if version != meta['schema_version']:
+            raise SnapshotError(f"结构版本不符: {version} / {meta['schema_version']}")
+        counts = table_counts(conn)
+        if counts != meta['tables']:
+            diff = [t for t in set(counts) | set(meta['tables']) if counts.get(t) != meta['tables'].get(t)]
+            raise SnapshotError(f"表行数与快照记录不符: {', '.join(sorted(diff))}")
+    finally:
+        conn.close()
+
+
+def data_versions(conn):
+    """data_versions 中各表的版本号（没有该表时为空）"""
+    if not conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='data_versions'").fetchone():
+        return {}
+    return dict(conn.execute('SELECT name, version FROM data_versions'))
+
+
+def restore_snapshot(archive_path=DEFAULT_ARCHIVE, db_path=DEFAULT_DB, online=False, quick=False):
+    """从快照恢复数据库，成功返回 True；校验不通过时目标库不受影响"""
+    t0 = time.perf_counter()
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+    tmp_path = db_path + '.restoring'
+    try:
+        meta = extract_database(archive_path, tmp_path)
+        verify_database(tmp_path, meta, quick)
+        print(f"快照校验通过: {meta['created_at']}，结构版本 {meta['schema_version']}，"
+              f"{len(meta['tables'])} 张表 {sum(meta['tables'].values())} 行")
+
+        if online and os.path.exists(db_path):
+            # 在线备份API按页写入目标库，应用的其他连接下次读取即看到新数据
+            src = sqlite3.connect(tmp_path)
+            dst = sqlite3.connect(db_path, timeout=30)
+            try:
+                before = data_versions(dst)
+                src.backup(dst)
+                # 快照中的版本号可能不高于应用已缓存的版本，按版本号判断的缓存会继续返回恢复前的数据；
+                # 每个版本号都调到恢复前后两者中较大的值加一，任意几张表的版本和都比恢复前大
+                with dst:
+                    dst.executemany('UPDATE data_versions SET version = MAX(version, ?) + 1 WHERE name = ?',
+                                    [(version, name) for name, version in before.items()])
+            finally:
+                src.close()
+                dst.close()
+            os.remove(tmp_path)
+        else:
+            # VACUUM INTO 的副本是回滚日志模式，恢复为源库原来的日志模式
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute(f"PRAGMA journal_mode={meta['journal_mode']}")
+            finally:
+                conn.close()
+            # 旧库的 WAL 文件一并删除，避免被应用到新库上
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            os.replace(tmp_path, db_path)
+    except (SnapshotError, zipfile.BadZipFile, zlib.error, sqlite3.Error, OSError, KeyError, ValueError) as e:
+        print(f"恢复失败: {e}")
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(tmp_path + suffix):
+                os.remove(tmp_path + suffix)
+        return False
+
+    print(f"数据库恢复成功！{db_path}（{'在线备份' if online else '替换文件'}，耗时 {time.perf_counter() - t0:.2f} 秒）")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='数据库二进制快照与恢复')
+    sub = parser.add_subparsers(dest='command', required=True)
+    snap = sub.add_parser('snapshot', help='生成快照归档')
+    snap.add_argument('--db', default=DEFAULT_DB, help='数据库文件')
+    snap.add_argument('--out', default=DEFAULT_ARCHIVE, help='快照归档')
+    snap.add_argument('--level', type=int, default=6, help='压缩级别 0-9')
+    restore = sub.add_parser('restore', help='从快照归档恢复数据库')
+    restore.add_argument('--db', default=DEFAULT_DB, help='恢复到的数据库文件')
+    restore.add_argument('--archive', default=DEFAULT_ARCHIVE, help='快照归档')
+    restore.add_argument('--online', action='store_true', help='用在线备份API写入正在使用的数据库（不必停止应用）')
+    restore.add_argument('--quick', action='store_true', help='用 quick_check 代替 integrity_check')
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        if not os.path.exists(args.db):
+            print(f"错误: 数据库文件不存在: {args.db}")
+            sys.exit(1)
+        create_snapshot(args.db, args.out, args.level)
+    else:
+        sys.exit(0 if restore_snapshot(args.archive, args.db, args.online, args.quick) else 1)
+
+
+if __name__ == '__main__':
+    main()
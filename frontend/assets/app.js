@@ -125,9 +125,8 @@ function showPage(page) {
 // 加载学习模块
 async function loadModules() {
   try {
-    // 添加时间戳参数防止缓存
-    const timestamp = new Date().getTime();
-    const response = await fetch(`http://localhost:90/api/modules?_t=${timestamp}`);
+    // 后端返回ETag，浏览器自动带If-None-Match校验，内容未变时只返回304
+    const response = await fetch('http://localhost:90/api/modules');
     modules = await response.json();
     renderModules();
   } catch (error) {
@@ -173,9 +172,7 @@ function selectModule(moduleId) {
 // 加载知识点
 async function loadTopics(moduleId) {
   try {
-    // 添加时间戳参数防止缓存
-    const timestamp = new Date().getTime();
-    const response = await fetch(`http://localhost:90/api/modules/${moduleId}/topics?_t=${timestamp}`);
+    const response = await fetch(`http://localhost:90/api/modules/${moduleId}/topics`);
     topics = await response.json();
     renderTopics();
   } catch (error) {
@@ -290,24 +287,27 @@ async function generateAIContent() {
   elements.aiGenerate.textContent = '🔄 生成中...';
   
   try {
-    const response = await fetch(`http://localhost:90/api/generate/topic/${currentTopic.id}`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({
-        topic_id: currentTopic.id,
-        topic_name: currentTopic.title,
-        module_name: currentModule.title
-      })
+    // 流式生成：边生成边显示，结束后服务端整体保存
+    const response = await fetch(`http://localhost:90/api/generate/topic/${currentTopic.id}/stream`, {
+      method: 'POST'
     });
     
-    const result = await response.json();
+    let job;
+    if (response.ok) {
+      job = await readGenerationStream(response);
+    } else {
+      const result = await response.json();
+      // 该知识点已在生成中（409）时轮询已有任务
+      job = result.status_url ? await waitGenerationJob(result.status_url) : result;
+    }
     
-    if (result.success) {
+    if (job.status === 'done') {
       // 重新加载内容以显示生成的内容
       await loadContent(currentTopic.id);
-      showTip(elements.loginTip, '✨ AI内容生成成功！内容已保存，刷新页面不会重新生成。', 'success');
+      const ttft = job.ttft != null ? `（首段输出 ${job.ttft} 秒）` : '';
+      showTip(elements.loginTip, `✨ AI内容生成成功！内容已保存，刷新页面不会重新生成。${ttft}`, 'success');
     } else {
-      showTip(elements.loginTip, result.error || 'AI生成失败', 'error');
+      showTip(elements.loginTip, job.error || 'AI生成失败', 'error');
     }
   } catch (error) {
     console.error('AI生成错误:', error);
@@ -318,6 +318,58 @@ async function generateAIContent() {
   }
 }
 
+// 读取生成接口的Server-Sent Events，实时显示生成的文本，返回最终的任务状态
+async function readGenerationStream(response) {
+  const preview = document.createElement('div');
+  preview.className = 'content-card';
+  preview.innerHTML = '<h4>🤖 AI生成中...</h4><p style="white-space: pre-wrap"></p>';
+  elements.contentCards.prepend(preview);
+  const output = preview.querySelector('p');
+  
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let job = { status: 'failed', error: '生成连接意外中断' };
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) >= 0) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = 'message';
+      let data = '';
+      block.split('\n').forEach(line => {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      });
+      const payload = data ? JSON.parse(data) : {};
+      if (event === 'token') {
+        output.textContent += payload.text;
+      } else if (event === 'done') {
+        job = payload;
+      } else if (event === 'error') {
+        job = { status: 'failed', error: payload.error };
+      }
+    }
+  }
+  preview.remove();
+  return job;
+}
+
+// 轮询内容生成任务，返回完成或失败时的任务状态
+async function waitGenerationJob(statusUrl) {
+  while (true) {
+    const response = await fetch(`http://localhost:90${statusUrl}`);
+    const job = await response.json();
+    if (!response.ok || job.status === 'done' || job.status === 'failed') {
+      return job;
+    }
+    await new Promise(resolve => setTimeout(resolve, 1000));
+  }
+}
+
 // 用户认证
 async function login() {
   const id = elements.loginId.value.trim();
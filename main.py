@@ -5,7 +5,10 @@
 整合前后端服务，提供一键启动功能
 """
 
+import _thread
+import argparse
 import os
+import signal
 import sys
 import time
 import threading
@@ -13,21 +16,29 @@ import webbrowser
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 
+try:
+    from waitress import create_server
+except Exception:
+    create_server = None
+
 # 添加backend目录到Python路径
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 BACKEND_DIR = os.path.join(BASE_DIR, 'backend')
 sys.path.insert(0, BACKEND_DIR)
 
 # 导入后端应用
+backend_module = None
 backend_app = None
 try:
     # 方法1: 尝试直接导入（开发环境）
-    from app import app as backend_app
+    import app as backend_module
+    backend_app = backend_module.app
     print("✅ 使用直接导入方式加载后端模块")
 except ImportError:
     try:
         # 方法2: 尝试从backend目录导入
-        from backend.app import app as backend_app
+        from backend import app as backend_module
+        backend_app = backend_module.app
         print("✅ 使用backend.app导入方式加载后端模块")
     except ImportError:
         try:
@@ -36,10 +47,10 @@ except ImportError:
             app_path = os.path.join(BACKEND_DIR, 'app.py')
             if os.path.exists(app_path):
                 spec = importlib.util.spec_from_file_location("backend_app", app_path)
-                app_module = importlib.util.module_from_spec(spec)
-                sys.modules['backend_app'] = app_module
-                spec.loader.exec_module(app_module)
-                backend_app = app_module.app
+                backend_module = importlib.util.module_from_spec(spec)
+                sys.modules['backend_app'] = backend_module
+                spec.loader.exec_module(backend_module)
+                backend_app = backend_module.app
                 print("✅ 使用动态导入方式加载后端模块")
             else:
                 print(f"❌ 无法找到后端应用文件: {app_path}")
@@ -56,10 +67,15 @@ if backend_app is None:
     print("❌ 无法加载后端应用模块")
     sys.exit(1)
 
+import compression  # noqa: E402
+
 # 前端服务配置
 FRONTEND_DIR = os.path.join(BASE_DIR, 'frontend')
-frontend_app = Flask(__name__, static_folder=os.path.join(FRONTEND_DIR, 'assets'))
+ASSETS_DIR = os.path.join(FRONTEND_DIR, 'assets')
+# 不注册Flask内置的静态路由，否则它会抢先匹配 /assets/ 而绕过预压缩文件
+frontend_app = Flask(__name__, static_folder=None)
 CORS(frontend_app)
+compression.init_app(frontend_app)
 
 @frontend_app.route('/')
 def index():
@@ -67,32 +83,124 @@ def index():
 
 @frontend_app.route('/assets/<path:path>')
 def assets(path):
-    return send_from_directory(frontend_app.static_folder, path)
+    # 优先发送构建时生成的 .br/.gz 预压缩文件
+    return compression.send_precompressed(ASSETS_DIR, path)
+
+API_PORT = 90
+WEB_PORT = 8082
+
+
+def combined_app(environ, start_response):
+    """生产模式下的单一WSGI应用：/api/ 交给后端，其余交给前端"""
+    if environ.get('PATH_INFO', '').startswith('/api/'):
+        return backend_app(environ, start_response)
+    return frontend_app(environ, start_response)
 
 def start_backend():
     """启动后端API服务"""
-    print("🚀 启动后端API服务 (端口: 90)...")
-    backend_app.run(host='0.0.0.0', port=90, debug=False, use_reloader=False)
+    print(f"🚀 启动后端API服务 (端口: {API_PORT})...")
+    backend_app.run(host='0.0.0.0', port=API_PORT, debug=False, use_reloader=False)
 
 def start_frontend():
     """启动前端Web服务"""
-    print("🌐 启动前端Web服务 (端口: 8082)...")
-    frontend_app.run(host='0.0.0.0', port=8082, debug=False, use_reloader=False)
+    print(f"🌐 启动前端Web服务 (端口: {WEB_PORT})...")
+    frontend_app.run(host='0.0.0.0', port=WEB_PORT, debug=False, use_reloader=False)
+
+def create_production_server(listen, threads=8, connection_limit=100, channel_timeout=120):
+    """创建waitress服务器：多个监听地址共用一个工作线程池，HTTP/1.1长连接空闲 channel_timeout 秒后断开"""
+    if create_server is None:
+        raise RuntimeError('生产模式需要安装 waitress: pip install waitress')
+    # 每个工作线程（含SSE流式请求）、每个后台生成线程最多同时持有一个数据库连接，另留一个给主线程的启动和后台任务；
+    # 连接池不小于这个总数（DB_POOL_SIZE 更大时以它为准），避免请求排队等连接
+    needed = threads + backend_module.generator.workers + 1
+    backend_module.db.pool.max_size = max(backend_module.db.pool.max_size, needed)
+    return create_server(combined_app, listen=' '.join(listen), threads=threads,
+                         connection_limit=connection_limit, channel_timeout=channel_timeout,
+                         ident='BigDataLearn')
+
+def serve_production(args):
+    """生产模式：一个进程内用waitress同时监听前端和API端口，收到 Ctrl+C/SIGTERM 后优雅退出
+
+    收到信号后先进入排空阶段：继续正常处理请求，但就绪检查返回503，负载均衡据此摘除流量；
+    --drain-seconds 秒后（或再次收到信号时）关闭监听，等待处理中的请求完成（最多5秒）。
+    """
+    listen = [f'{args.host}:{API_PORT}', f'{args.host}:{WEB_PORT}']
+    server = create_production_server(listen, args.threads, args.connection_limit, args.channel_timeout)
+
+    def stop(signum, frame):
+        if backend_module.serving_state['draining'] or args.drain_seconds <= 0:
+            raise KeyboardInterrupt
+        backend_module.serving_state['draining'] = True
+        print(f"\n⏳ 排空中: 就绪检查返回503，{args.drain_seconds} 秒后关闭（再按一次 Ctrl+C 立即关闭）")
+        # 到时在主线程触发 SIGINT，再次进入本函数并结束 server.run()
+        timer = threading.Timer(args.drain_seconds, _thread.interrupt_main)
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGINT, stop)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, stop)
+
+    print(f"🚀 生产模式启动: {', '.join(listen)} (工作线程: {args.threads}, "
+          f"最大连接: {args.connection_limit}, 长连接超时: {args.channel_timeout}秒, "
+          f"数据库连接池: {backend_module.db.pool.max_size})")
+    print(f"🩺 就绪检查: http://localhost:{API_PORT}/api/ready")
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n👋 正在关闭服务...")
+        backend_module.serving_state['draining'] = True
+        server.close()
+        backend_module.generator.shutdown()
+        backend_module.db.pool.close_all()
+        print("✅ 程序已退出")
 
 def open_browser():
     """延迟打开浏览器"""
     time.sleep(3)  # 等待服务启动
-    url = 'http://localhost:8082'
+    url = f'http://localhost:{WEB_PORT}'
     print(f"🔗 正在打开浏览器: {url}")
     webbrowser.open(url)
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='大数据学习平台')
+    parser.add_argument('--serve', choices=['dev', 'production'], default='dev',
+                        help='dev: Flask开发服务器（默认）; production: waitress多线程WSGI服务器')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('SERVE_THREADS', 8)),
+                        help='生产模式工作线程数')
+    parser.add_argument('--connection-limit', type=int, default=100, help='生产模式最大并发连接数')
+    parser.add_argument('--channel-timeout', type=int, default=120, help='生产模式长连接空闲超时（秒）')
+    parser.add_argument('--drain-seconds', type=float, default=float(os.environ.get('DRAIN_SECONDS', 10)),
+                        help='生产模式收到退出信号后继续服务、就绪检查返回503的秒数（0 为立即关闭）')
+    parser.add_argument('--no-browser', action='store_true', help='不自动打开浏览器')
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """主函数 - 启动所有服务"""
+    args = parse_args(argv)
     print("="*50)
     print("🎓 大数据学习平台 - Hadoop学习系统")
     print("="*50)
     
     try:
+        # 初始化数据库（WAL、结构迁移），数据库结构版本未知时拒绝启动
+        backend_module.init_db()
+        backend_module.db.release_db()
+        # 继续执行上次退出时未完成的内容生成任务
+        backend_module.generator.resume()
+
+        if not args.no_browser:
+            # 启动浏览器线程
+            browser_thread = threading.Thread(target=open_browser, daemon=True)
+            browser_thread.start()
+
+        if args.serve == 'production':
+            serve_production(args)
+            return
+        
         # 启动后端服务线程
         backend_thread = threading.Thread(target=start_backend, daemon=True)
         backend_thread.start()
@@ -101,13 +209,9 @@ def main():
         frontend_thread = threading.Thread(target=start_frontend, daemon=True)
         frontend_thread.start()
         
-        # 启动浏览器线程
-        browser_thread = threading.Thread(target=open_browser, daemon=True)
-        browser_thread.start()
-        
         print("\n✅ 所有服务已启动!")
-        print("📱 前端地址: http://localhost:8082")
-        print("🔧 后端API: http://localhost:90")
+        print(f"📱 前端地址: http://localhost:{WEB_PORT}")
+        print(f"🔧 后端API: http://localhost:{API_PORT}")
         print("\n💡 提示: 关闭此窗口将停止所有服务")
         print("\n按 Ctrl+C 退出程序")
         
@@ -124,4 +228,4 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
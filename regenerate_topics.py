@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量重新生成知识点内容（大模型）
+- asyncio 并发调用生成服务，最多 --concurrency 个请求同时进行
+- 令牌桶限速：平均每秒 --rate 次，允许 --burst 次突发
+- 调用失败按指数退避（带随机抖动）重试 --retries 次
+- 每 --batch-size 个知识点一个写事务写入 contents 和结果缓存，提交后记录断点；
+  中断后再次运行同样的命令会跳过断点文件中已完成的知识点（--restart 忽略断点）
+- 相同提示词命中 generation_cache 时不再调用生成服务（--force 强制重新生成）
+用法: python regenerate_topics.py [--modules 1 2] [--topics 31 32] [--provider openai|stub]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import db  # noqa: E402
+import generation  # noqa: E402
+from content_templates import gen_content  # noqa: E402
+
+DEFAULT_CHECKPOINT = os.path.join(ROOT, 'DB', 'regenerate_topics.checkpoint.json')
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+class TokenBucket:
+    """令牌桶：平均每秒 rate 个令牌，最多积攒 burst 个（只在一个事件循环中使用）"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Checkpoint:
+    """断点文件：记录本次选择的知识点中已写入数据库的ID"""
+
+    def __init__(self, path, selection):
+        self.path = path
+        self.selection = sorted(selection)
+        self.done = set()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('selection') != self.selection:
+            print('⚠️ 断点文件对应的知识点范围与本次不同，已忽略')
+            return False
+        self.done = set(saved.get('done', []))
+        return True
+
+    def mark(self, topic_ids):
+        self.done.update(topic_ids)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'selection': self.selection, 'done': sorted(self.done)}, f)
+        os.replace(tmp, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def select_topics(c, module_ids=None, topic_ids=None):
+    sql = ('SELECT t.id AS tid, t.ord AS tord, m.id AS mid, m.title AS mtitle '
+           'FROM topics t JOIN modules m ON t.module_id = m.id WHERE 1=1')
+    params = []
+    if module_ids:
+        sql += ' AND m.id IN (SELECT value FROM json_each(?))'
+        params.append(json.dumps(module_ids))
+    if topic_ids:
+        sql += ' AND t.id IN (SELECT value FROM json_each(?))'
+        params.append(json.dumps(topic_ids))
+    return c.execute(sql + ' ORDER BY m.ord, t.ord', params).fetchall()
+
+
+def write_batch(provider, batch):
+    """一个事务写入一批知识点内容和新生成的结果缓存"""
+    def save(c):
+        for item in batch:
+            if not item['cached']:
+                generation.store_text(c, item['key'], provider, item['text'])
+            generation.save_content(c, item['tid'], item['data'])
+    try:
+        db.run_write(save)
+    finally:
+        db.release_db()
+
+
+async def regenerate(topics, provider, template, checkpoint, concurrency=4, rate=1.0, burst=4,
+                     retries=3, batch_size=10, force=False):
+    """并发生成并分批写入，返回统计信息"""
+    sem = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate, burst)
+    write_lock = asyncio.Lock()
+    pending = []
+    stats = {'total': len(topics), 'generated': 0, 'cached': 0, 'retries': 0, 'written': 0, 'failed': []}
+
+    async def complete(prompt):
+        for attempt in range(retries + 1):
+            await bucket.acquire()
+            try:
+                return await asyncio.to_thread(provider.complete, generation.SYSTEM_PROMPT, prompt)
+            except Exception:
+                if attempt == retries:
+                    raise
+                stats['retries'] += 1
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def flush():
+        async with write_lock:
+            if not pending:
+                return
+            batch = pending[:]
+            del pending[:]
+            await asyncio.to_thread(write_batch, provider, batch)
+            checkpoint.mark([item['tid'] for item in batch])
+            stats['written'] += len(batch)
+            print(f"  已写入 {stats['written']}/{stats['total']}（生成 {stats['generated']}，"
+                  f"缓存 {stats['cached']}，重试 {stats['retries']}，失败 {len(stats['failed'])}）", flush=True)
+
+    async def one(r):
+        prompt = generation.build_prompt(r['mtitle'], r['tord'])
+        key = generation.prompt_key(provider, generation.SYSTEM_PROMPT, prompt)
+        text = None
+        if not force:
+            with db.get_db() as c:
+                text = generation.cached_text(c, key)
+        cached = text is not None
+        if not cached:
+            async with sem:
+                try:
+                    text = await complete(prompt)
+                except Exception as e:
+                    stats['failed'].append((r['tid'], str(e)))
+                    return
+            if not text:
+                stats['failed'].append((r['tid'], '生成服务返回空内容'))
+                return
+            stats['generated'] += 1
+        else:
+            stats['cached'] += 1
+        data = template(r['mtitle'], r['tord'])
+        data['theory'] = text
+        pending.append({'tid': r['tid'], 'data': data, 'key': key, 'text': text, 'cached': cached})
+        if len(pending) >= batch_size:
+            await flush()
+
+    await asyncio.gather(*(one(r) for r in topics))
+    await flush()
+    return stats
+
+
+def make_provider(args):
+    if args.provider == 'stub':
+        return generation.StubProvider(latency=args.stub_latency, fail_rate=args.stub_fail_rate)
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        print('❌ 未设置 OPENAI_API_KEY（离线测试请使用 --provider stub）')
+        sys.exit(1)
+    return generation.OpenAIProvider(api_key, model=args.model)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量重新生成知识点内容')
+    parser.add_argument('--modules', type=int, nargs='+', help='模块ID')
+    parser.add_argument('--topics', type=int, nargs='+', help='知识点ID')
+    parser.add_argument('--provider', choices=['openai', 'stub'], default='openai')
+    parser.add_argument('--model', default=os.environ.get('OPENAI_MODEL', generation.DEFAULT_MODEL))
+    parser.add_argument('--concurrency', type=int, default=4, help='同时进行的生成请求数')
+    parser.add_argument('--rate', type=float, default=1.0, help='每秒最多发起的请求数（令牌桶速率）')
+    parser.add_argument('--burst', type=int, default=4, help='令牌桶容量')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=10, help='每个写事务包含的知识点数')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--restart', action='store_true', help='忽略断点，全部重新生成')
+    parser.add_argument('--force', action='store_true', help='不使用结果缓存')
+    parser.add_argument('--db', help='数据库文件（默认 DB/app.db）')
+    parser.add_argument('--stub-latency', type=float, default=0.2, help='stub: 每次调用耗时（秒）')
+    parser.add_argument('--stub-fail-rate', type=float, default=0.0, help='stub: 随机失败概率')
+    args = parser.parse_args(argv)
+
+    if args.db:
+        db.pool = db.ConnectionPool(args.db)
+    import migrations
+    migrations.migrate()
+
+    with db.get_db() as c:
+        topics = select_topics(c, args.modules, args.topics)
+    db.release_db()
+    if not topics:
+        print('没有符合条件的知识点')
+        return
+    checkpoint = Checkpoint(args.checkpoint, [r['tid'] for r in topics])
+    if not args.restart and checkpoint.load():
+        print(f'从断点继续：已完成 {len(checkpoint.done)} 个知识点')
+    todo = [r for r in topics if r['tid'] not in checkpoint.done]
+    provider = make_provider(args)
+    print(f'重新生成 {len(todo)}/{len(topics)} 个知识点（{provider.name}/{provider.model}，'
+          f'并发 {args.concurrency}，限速 {args.rate}/秒）')
+
+    t0 = time.perf_counter()
+    stats = asyncio.run(regenerate(todo, provider, gen_content, checkpoint, args.concurrency, args.rate,
+                                   args.burst, args.retries, args.batch_size, args.force))
+    elapsed = time.perf_counter() - t0
+    print(f"完成：写入 {stats['written']}，调用生成服务 {stats['generated']} 次，命中缓存 {stats['cached']}，"
+          f"重试 {stats['retries']} 次，耗时 {elapsed:.1f} 秒")
+    if stats['failed']:
+        print(f"❌ {len(stats['failed'])} 个知识点失败，再次运行同样的命令只处理未完成的知识点：")
+        for tid, err in stats['failed'][:20]:
+            print(f'  知识点 {tid}: {err}')
+        sys.exit(1)
+    checkpoint.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,88 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import shutil
 import sqlite3
 import os
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+# 写文件的缓冲区大小
+WRITE_BUFFER = 1024 * 1024
+# 单表数据文件首尾的事务语句，拼接完整数据文件时去掉
+TABLE_BEGIN = "BEGIN;\n\n"
+TABLE_COMMIT = "COMMIT;\n"
+# 增量导出的清单文件和增量文件目录（相对导出目录）
+MANIFEST_FILE = 'export_manifest.json'
+DELTA_DIR = 'deltas'
+
+
+def sql_literal(value):
+    """Python值转为SQL字面量"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        # 转义单引号
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'NULL'
+        if math.isinf(value):
+            return '9e999' if value > 0 else '-9e999'
+        return repr(value)
+    if isinstance(value, bytes):
+        return "X'" + value.hex() + "'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def export_table_part(db_path, table_name, lo, hi, part_file, chunk_size, rows_per_insert):
+    """并行导出的任务：把表中 rowid 属于 [lo, hi) 的行（lo/hi 为 None 表示不限）写成多行INSERT
+
+    返回 (记录数, 开始时间, 结束时间)。
+    """
+    started = time.time()
+    exporter = SQLExporter(db_path, chunk_size, rows_per_insert, sql_dir=os.path.dirname(part_file))
+    conn = exporter.get_database_connection()
+    try:
+        with open(part_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as out:
+            count = exporter.write_rows(conn, table_name, [out], lo, hi)
+    finally:
+        conn.close()
+    return count, started, time.time()
+
+
 class SQLExporter:
     """SQL导出工具类"""
     
-    def __init__(self, db_path='DB/app.db'):
+    def __init__(self, db_path='DB/app.db', chunk_size=1000, rows_per_insert=100, sql_dir='SQL', workers=1,
+                 use_threads=False, part_rows=20000, block_rows=100):
         self.db_path = db_path
-        self.sql_dir = 'SQL'
+        # 每次从游标读取的行数、每条INSERT语句包含的行数
+        self.chunk_size = chunk_size
+        self.rows_per_insert = rows_per_insert
+        self.sql_dir = sql_dir
+        # 并行导出的进程数（use_threads 时为线程数），1 为单连接顺序导出；
+        # 并行时超过 part_rows 行的表按 rowid 范围拆成多段同时导出
+        self.workers = workers
+        self.use_threads = use_threads
+        self.part_rows = part_rows
+        # 增量导出按 rowid 每 block_rows 行一块记录校验和，用于发现已导出行的修改和删除
+        self.block_rows = block_rows
+        # 快照期间读取的数据库文件和复用的连接
+        self._source = None
+        self._conn = None
+        # 最近一次数据导出的每表统计：{表名: (记录数, 耗时)}
+        self.table_stats = {}
         self.ensure_sql_directory()
     
     def ensure_sql_directory(self):
@@ -17,25 +92,73 @@ class SQLExporter:
             print(f"创建SQL目录: {self.sql_dir}")
     
     def get_database_connection(self):
-        """获取数据库连接"""
-        return sqlite3.connect(self.db_path)
+        """获取数据库连接（快照期间连接快照文件）"""
+        return sqlite3.connect(self._source or self.db_path)
     
-    def get_all_tables(self):
-        """获取所有表名"""
+    @contextlib.contextmanager
+    def reading(self):
+        """读连接：快照期间复用快照连接，否则临时打开一个"""
+        if self._conn is not None:
+            yield self._conn
+            return
         conn = self.get_database_connection()
-        cursor = conn.cursor()
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    @contextlib.contextmanager
+    def snapshot(self, copy=None):
+        """固定一份一致的数据供期间所有导出读取，导出过程中源库的写入不会让各表之间不一致
         
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-        tables = [row[0] for row in cursor.fetchall()]
+        顺序导出时在一个连接上保持读事务；并行导出的多个连接无法共享读事务，
+        用在线备份API把数据库复制到临时文件再读（copy 默认在 workers 大于 1 时为真）。
+        """
+        if self._conn is not None:
+            yield
+            return
+        tmp_dir = None
+        if copy is None:
+            copy = self.workers > 1
+        if copy:
+            tmp_dir = tempfile.mkdtemp(prefix='sql_export_')
+            self._source = os.path.join(tmp_dir, 'snapshot.db')
+            src = sqlite3.connect(self.db_path)
+            dst = sqlite3.connect(self._source)
+            try:
+                src.backup(dst)
+            finally:
+                src.close()
+                dst.close()
+        self._conn = self.get_database_connection()
+        try:
+            if tmp_dir is None:
+                self._conn.execute("BEGIN")
+                # 第一次读取时才真正开始读事务
+                self._conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            yield
+        finally:
+            self._conn.close()
+            self._conn = None
+            self._source = None
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def get_all_tables(self):
+        """获取所有表名"""
+        with self.reading() as conn:
+            rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'").fetchall()
         
-        conn.close()
-        return tables
+        # 虚拟表（全文索引）的影子表由 CREATE VIRTUAL TABLE 自动创建，不单独导出
+        virtual = [name for name, sql in rows if sql and sql.upper().startswith('CREATE VIRTUAL TABLE')]
+        return [name for name, _ in rows if not any(name.startswith(v + '_') for v in virtual)]
     
     def export_table_schema(self, table_name):
         """导出表结构SQL"""
-        conn = self.get_database_connection()
-        cursor = conn.cursor()
-        
+        with self.reading() as conn:
+            return self._table_schema(conn.cursor(), table_name)
+    
+    def _table_schema(self, cursor, table_name):
         # 获取建表语句
         cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
         result = cursor.fetchone()
@@ -58,60 +181,75 @@ class SQLExporter:
                     schema_sql += index[0] + ";\n"
                 schema_sql += "\n"
             
-            conn.close()
             return schema_sql
         
-        conn.close()
         return None
     
     def export_table_data(self, table_name):
-        """导出表数据SQL"""
-        conn = self.get_database_connection()
-        cursor = conn.cursor()
-        
-        # 获取表结构信息
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns_info = cursor.fetchall()
-        column_names = [col[1] for col in columns_info]
-        
-        # 获取所有数据
-        cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
-        
-        data_sql = f"-- 表数据: {table_name}\n"
-        data_sql += f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        data_sql += f"-- 记录数: {len(rows)}\n\n"
+        """导出表数据SQL（返回字符串，大表请用 export_all_data 直接写文件）"""
+        with self.reading() as conn:
+            out = io.StringIO()
+            self.write_table_data(conn, table_name, [out])
+            return out.getvalue()
+    
+    @staticmethod
+    def is_virtual(conn, table_name):
+        create_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,)).fetchone()[0]
+        return create_sql.upper().startswith('CREATE VIRTUAL TABLE')
+    
+    @staticmethod
+    def table_header(table_name, virtual):
+        """表数据段开头：外部内容的全文索引不导出数据，导入后按源表重建；普通表先清空"""
+        header = f"-- 表数据: {table_name}\n"
+        header += f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        if virtual:
+            return header + f"INSERT INTO {table_name}({table_name}) VALUES('rebuild');\n\n"
+        return header + f"DELETE FROM {table_name};\n"
+    
+    def write_table_data(self, conn, table_name, outputs):
+        """用游标分块读取表数据，生成的多行INSERT同时写入 outputs 中的每个文件，返回记录数
         
-        if rows:
-            # 清空表数据
-            data_sql += f"DELETE FROM {table_name};\n\n"
-            
-            # 生成INSERT语句
-            columns_str = ', '.join(column_names)
-            
-            for row in rows:
-                values = []
-                for value in row:
-                    if value is None:
-                        values.append('NULL')
-                    elif isinstance(value, str):
-                        # 转义单引号
-                        escaped_value = value.replace("'", "''")
-                        values.append(f"'{escaped_value}'")
-                    elif isinstance(value, (int, float)):
-                        values.append(str(value))
-                    else:
-                        values.append(f"'{str(value)}'")
-                
-                values_str = ', '.join(values)
-                data_sql += f"INSERT INTO {table_name} ({columns_str}) VALUES ({values_str});\n"
-            
-            data_sql += "\n"
-        else:
-            data_sql += f"-- 表 {table_name} 无数据\n\n"
+        整张表只读一遍，内存占用与表大小无关。
+        """
+        virtual = self.is_virtual(conn, table_name)
+        for out in outputs:
+            out.write(self.table_header(table_name, virtual))
+        if virtual:
+            return 0
+        count = self.write_rows(conn, table_name, outputs)
+        for out in outputs:
+            out.write(f"-- 记录数: {count}\n\n")
+        return count
+    
+    def write_rows(self, conn, table_name, outputs, lo=None, hi=None, key='rowid'):
+        """写出表中 key 属于 [lo, hi) 的行（None 表示不限），返回记录数"""
+        column_names = [col[1] for col in conn.execute(f"PRAGMA table_info({table_name})")]
+        columns_str = ', '.join(column_names)
+        sql = f"SELECT {columns_str} FROM {table_name}"
+        conditions, params = [], []
+        if lo is not None:
+            conditions.append(f"{key} >= ?")
+            params.append(lo)
+        if hi is not None:
+            conditions.append(f"{key} < ?")
+            params.append(hi)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions) + f" ORDER BY {key}"
         
-        conn.close()
-        return data_sql
+        cursor = conn.execute(sql, params)
+        count = 0
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            for start in range(0, len(rows), self.rows_per_insert):
+                batch = rows[start:start + self.rows_per_insert]
+                values = ',\n'.join('(' + ', '.join(map(sql_literal, row)) + ')' for row in batch)
+                text = f"INSERT INTO {table_name} ({columns_str}) VALUES\n{values};\n"
+                for out in outputs:
+                    out.write(text)
+            count += len(rows)
+        return count
     
     def export_all_schemas(self):
         """导出所有表结构"""
@@ -122,16 +260,18 @@ class SQLExporter:
         all_schemas_sql += f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
         all_schemas_sql += f"-- 数据库文件: {self.db_path}\n\n"
         
-        for table in tables:
-            schema_sql = self.export_table_schema(table)
-            if schema_sql:
-                all_schemas_sql += schema_sql
-                
-                # 单独保存每个表的结构
-                schema_file = os.path.join(self.sql_dir, f"{table}_schema.sql")
-                with open(schema_file, 'w', encoding='utf-8') as f:
-                    f.write(schema_sql)
-                print(f"导出表结构: {schema_file}")
+        with self.reading() as conn:
+            cursor = conn.cursor()
+            for table in tables:
+                schema_sql = self._table_schema(cursor, table)
+                if schema_sql:
+                    all_schemas_sql += schema_sql
+                    
+                    # 单独保存每个表的结构
+                    schema_file = os.path.join(self.sql_dir, f"{table}_schema.sql")
+                    with open(schema_file, 'w', encoding='utf-8') as f:
+                        f.write(schema_sql)
+                    print(f"导出表结构: {schema_file}")
         
         # 保存完整结构文件
         all_schemas_file = os.path.join(self.sql_dir, "database_schema.sql")
@@ -139,105 +279,527 @@ class SQLExporter:
             f.write(all_schemas_sql)
         print(f"导出完整数据库结构: {all_schemas_file}")
         
+        self.export_triggers()
+        
         return all_schemas_file
     
+    def export_triggers(self):
+        """导出所有触发器到单独文件，在数据导入之后执行，导入数据时不会触发"""
+        with self.reading() as conn:
+            rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type='trigger' AND sql IS NOT NULL "
+                                "ORDER BY tbl_name, name").fetchall()
+        
+        triggers_sql = f"-- 数据库触发器导出（在数据导入之后执行）\n"
+        triggers_sql += f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        for name, create_sql in rows:
+            triggers_sql += f"DROP TRIGGER IF EXISTS {name};\n{create_sql};\n\n"
+        
+        triggers_file = os.path.join(self.sql_dir, "database_triggers.sql")
+        with open(triggers_file, 'w', encoding='utf-8') as f:
+            f.write(triggers_sql)
+        print(f"导出触发器: {triggers_file} ({len(rows)} 个)")
+        
+        return triggers_file
+    
     def export_all_data(self):
-        """导出所有表数据"""
-        tables = self.get_all_tables()
+        """导出所有表数据到每个表的数据文件和完整数据文件，整个文件在一个事务中导入
         
-        # 创建完整的数据导出文件
-        all_data_sql = f"-- 数据库数据导出\n"
-        all_data_sql += f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        all_data_sql += f"-- 数据库文件: {self.db_path}\n\n"
+        workers 为 1 时一个连接顺序导出，每张表只读一遍同时写两个文件；
+        大于 1 时各表（大表按 rowid 分段）由多个进程或线程并行导出到临时文件，再按表顺序拼接。
+        """
+        all_data_file = os.path.join(self.sql_dir, "database_data.sql")
+        header = (f"-- 数据库数据导出\n"
+                  f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                  f"-- 数据库文件: {self.db_path}\n\n"
+                  "BEGIN;\n\n")
+        t0 = time.perf_counter()
+        self.table_stats = {}
+        with self.snapshot():
+            tables = self.get_all_tables()
+            if self.workers > 1:
+                # 分段文件按字节拼接，不再解码
+                with open(all_data_file, 'wb') as all_out:
+                    all_out.write(header.encode('utf-8'))
+                    self._export_parallel(tables, all_out)
+                    all_out.write(b"COMMIT;\n")
+            else:
+                with open(all_data_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as all_out:
+                    all_out.write(header)
+                    for table in tables:
+                        # 单独保存每个表的数据
+                        data_file = os.path.join(self.sql_dir, f"{table}_data.sql")
+                        start = time.perf_counter()
+                        with open(data_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as table_out:
+                            table_out.write(TABLE_BEGIN)
+                            count = self.write_table_data(self._conn, table, [table_out, all_out])
+                            table_out.write(TABLE_COMMIT)
+                        self.table_stats[table] = (count, time.perf_counter() - start)
+                    all_out.write("COMMIT;\n")
+            # 全量导出后重新记录清单，之前的增量文件已包含在内
+            self.write_manifest(self.build_manifest(self._conn, tables), replace=True)
+        elapsed = time.perf_counter() - t0
         
         for table in tables:
-            data_sql = self.export_table_data(table)
-            if data_sql:
-                all_data_sql += data_sql
-                
-                # 单独保存每个表的数据
-                data_file = os.path.join(self.sql_dir, f"{table}_data.sql")
-                with open(data_file, 'w', encoding='utf-8') as f:
-                    f.write(data_sql)
-                print(f"导出表数据: {data_file}")
-        
-        # 保存完整数据文件
-        all_data_file = os.path.join(self.sql_dir, "database_data.sql")
-        with open(all_data_file, 'w', encoding='utf-8') as f:
-            f.write(all_data_sql)
-        print(f"导出完整数据库数据: {all_data_file}")
+            count, seconds = self.table_stats[table]
+            rate = count / seconds if seconds > 0 else 0
+            print(f"导出表数据: {os.path.join(self.sql_dir, f'{table}_data.sql')} "
+                  f"({count} 条, {seconds:.2f} 秒, {rate:.0f} 条/秒)")
+        mode = f"{self.workers} 个{'线程' if self.use_threads else '进程'}并行" if self.workers > 1 else "顺序"
+        print(f"导出完整数据库数据: {all_data_file}（{len(tables)} 张表，{mode}，总耗时 {elapsed:.2f} 秒）")
         
         return all_data_file
     
+    def table_ranges(self, conn, table_name):
+        """按 rowid 把表分成每段约 part_rows 行的 [lo, hi) 范围；WITHOUT ROWID 表不拆分"""
+        try:
+            bounds = [r[0] for r in conn.execute(
+                f"SELECT rowid FROM (SELECT rowid, row_number() OVER (ORDER BY rowid) AS n FROM {table_name}) "
+                f"WHERE n % ? = 1 AND n > 1", (self.part_rows,))]
+        except sqlite3.OperationalError:
+            return [(None, None)]
+        edges = [None] + bounds + [None]
+        return list(zip(edges[:-1], edges[1:]))
+    
+    def _export_parallel(self, tables, all_out):
+        """各表分段并行导出到快照目录中的临时文件，完成后按表顺序拼接成单表文件和完整文件（all_out 为二进制文件）"""
+        part_dir = os.path.dirname(self._source)
+        virtual = {t: self.is_virtual(self._conn, t) for t in tables}
+        tasks = []
+        for table in tables:
+            if not virtual[table]:
+                for i, (lo, hi) in enumerate(self.table_ranges(self._conn, table)):
+                    tasks.append((table, lo, hi, os.path.join(part_dir, f"{table}.{i}.part")))
+        
+        executor_cls = ThreadPoolExecutor if self.use_threads else ProcessPoolExecutor
+        with executor_cls(max_workers=self.workers) as executor:
+            futures = {task: executor.submit(export_table_part, self._source, *task,
+                                             self.chunk_size, self.rows_per_insert)
+                       for task in tasks}
+            results = {task: future.result() for task, future in futures.items()}
+        
+        for table in tables:
+            parts = [task for task in tasks if task[0] == table]
+            count = sum(results[task][0] for task in parts)
+            data_file = os.path.join(self.sql_dir, f"{table}_data.sql")
+            with open(data_file, 'wb') as table_out:
+                outputs = [table_out, all_out]
+                table_out.write(TABLE_BEGIN.encode('utf-8'))
+                for out in outputs:
+                    out.write(self.table_header(table, virtual[table]).encode('utf-8'))
+                for task in parts:
+                    with open(task[3], 'rb') as part:
+                        while True:
+                            chunk = part.read(WRITE_BUFFER)
+                            if not chunk:
+                                break
+                            for out in outputs:
+                                out.write(chunk)
+                    os.remove(task[3])
+                if not virtual[table]:
+                    for out in outputs:
+                        out.write(f"-- 记录数: {count}\n\n".encode('utf-8'))
+                table_out.write(TABLE_COMMIT.encode('utf-8'))
+            seconds = max(results[t][2] for t in parts) - min(results[t][1] for t in parts) if parts else 0
+            self.table_stats[table] = (count, seconds)
+    
+    @staticmethod
+    def table_key(conn, table_name):
+        """增量导出用的递增键：导出数据中的整数主键列，没有时返回 None（整表比较）
+        
+        rowid 本身不导出，只有作为 INTEGER PRIMARY KEY 的别名时导入后才保持不变，这时用该列；
+        WITHOUT ROWID 表用整数类型的第一个主键列。
+        """
+        pk_columns = [(name, (col_type or '').upper()) for _, name, col_type, _, _, pk
+                      in sorted(conn.execute(f"PRAGMA table_info({table_name})"), key=lambda col: col[5]) if pk]
+        try:
+            conn.execute(f"SELECT rowid FROM {table_name} LIMIT 0")
+        except sqlite3.OperationalError:
+            # WITHOUT ROWID
+            return pk_columns[0][0] if pk_columns and 'INT' in pk_columns[0][1] else None
+        if len(pk_columns) == 1 and pk_columns[0][1] == 'INTEGER':
+            return pk_columns[0][0]
+        return None
+    
+    @staticmethod
+    def schema_hash(conn):
+        """所有表结构的摘要，变化后增量文件无法在旧结构上执行"""
+        rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type='table' ORDER BY name").fetchall()
+        return hashlib.sha1(json.dumps(rows).encode('utf-8')).hexdigest()
+    
+    def table_blocks(self, conn, table_name, key, lo=None, hi=None):
+        """按 key 每 block_rows 一块统计 {块号: [行数, 行校验和之和]}，只统计 key 属于 [lo, hi) 的行"""
+        columns = [col[1] for col in conn.execute(f"PRAGMA table_info({table_name})")]
+        row_text = " || ',' || ".join(f"quote({c})" for c in columns)
+        if key is None:
+            sql = f"SELECT 0, COUNT(*), SUM(row_crc({row_text})) FROM {table_name}"
+            params = []
+        else:
+            conditions, params = [], [self.block_rows]
+            if lo is not None:
+                conditions.append(f"{key} >= ?")
+                params.append(lo)
+            if hi is not None:
+                conditions.append(f"{key} < ?")
+                params.append(hi)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+            sql = f"SELECT {key} / ? AS blk, COUNT(*), SUM(row_crc({row_text})) FROM {table_name}{where} GROUP BY blk"
+        conn.create_function('row_crc', 1, lambda text: zlib.crc32(text.encode('utf-8')), deterministic=True)
+        return {str(blk): [count, crc] for blk, count, crc in conn.execute(sql, params) if count}
+    
+    def build_manifest(self, conn, tables):
+        """记录每张表的递增键、高水位和分块校验和"""
+        manifest = {
+            'db_path': self.db_path,
+            'exported_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'schema': self.schema_hash(conn),
+            'block_rows': self.block_rows,
+            'deltas': [],
+            'tables': {},
+        }
+        for table in tables:
+            if self.is_virtual(conn, table):
+                continue
+            key = self.table_key(conn, table)
+            hwm = conn.execute(f"SELECT MAX({key}) FROM {table}").fetchone()[0] if key else None
+            manifest['tables'][table] = {'key': key, 'hwm': hwm, 'blocks': self.table_blocks(conn, table, key)}
+        return manifest
+    
+    def load_manifest(self):
+        path = os.path.join(self.sql_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    
+    def write_manifest(self, manifest, replace=False):
+        """保存清单；replace 表示新的全量导出，删除旧清单中的增量文件"""
+        if replace:
+            old = self.load_manifest()
+            for name in (old or {}).get('deltas', []):
+                path = os.path.join(self.sql_dir, name)
+                if os.path.exists(path):
+                    os.remove(path)
+        path = os.path.join(self.sql_dir, MANIFEST_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    
+    def export_delta(self):
+        """增量导出：只导出清单记录之后新增或修改的行，追加一个增量文件，返回文件路径（没有变化时为 None）
+        
+        高水位以下按块比较校验和，变化的块先按 key 范围删除再重新插入；高水位以上的行直接插入。
+        没有清单或表结构已变化时改为全量导出。
+        """
+        manifest = self.load_manifest()
+        if manifest is not None:
+            with self.reading() as conn:
+                schema = self.schema_hash(conn)
+        if manifest is None or manifest['schema'] != schema or manifest['block_rows'] != self.block_rows:
+            print("没有可用的导出清单或表结构已变化，改为全量导出")
+            with self.snapshot():
+                self.export_all_schemas()
+                return self.export_all_data()
+        
+        t0 = time.perf_counter()
+        # 增量只在一个连接上读取，保持读事务即可，不复制数据库
+        with self.snapshot(copy=False):
+            conn = self._conn
+            tables = self.get_all_tables()
+            name = os.path.join(DELTA_DIR, f"delta_{len(manifest['deltas']) + 1:06d}.sql")
+            delta_file = os.path.join(self.sql_dir, name)
+            os.makedirs(os.path.dirname(delta_file), exist_ok=True)
+            summary = []
+            with open(delta_file + '.tmp', 'w', encoding='utf-8', buffering=WRITE_BUFFER) as out:
+                out.write(f"-- 数据库增量导出\n")
+                out.write(f"-- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                out.write(f"-- 上次导出: {manifest['exported_at']}\n\n")
+                out.write("BEGIN;\n\n")
+                for table in tables:
+                    if self.is_virtual(conn, table):
+                        continue
+                    rewritten, rows, added, entry = self._write_table_delta(
+                        conn, table, manifest['tables'].get(table), out)
+                    manifest['tables'][table] = entry
+                    if rewritten or added:
+                        summary.append((table, rewritten, rows, added))
+                if summary:
+                    # 外部内容的全文索引按源表重建
+                    for table in tables:
+                        if self.is_virtual(conn, table):
+                            out.write(f"INSERT INTO {table}({table}) VALUES('rebuild');\n")
+                out.write("COMMIT;\n")
+        
+        if not summary:
+            os.remove(delta_file + '.tmp')
+            print(f"数据没有变化，未生成增量文件（耗时 {time.perf_counter() - t0:.2f} 秒）")
+            return None
+        os.replace(delta_file + '.tmp', delta_file)
+        manifest['deltas'].append(name)
+        manifest['exported_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.write_manifest(manifest)
+        for table, rewritten, rows, added in summary:
+            print(f"  {table}: 重写 {rewritten} 块 {rows} 条，新增 {added} 条")
+        print(f"导出增量文件: {delta_file}（第 {len(manifest['deltas'])} 个，耗时 {time.perf_counter() - t0:.2f} 秒）")
+        return delta_file
+    
+    def _write_table_delta(self, conn, table_name, old, out):
+        """写出一张表的增量，返回 (重写的块数, 重写的行数, 新增的行数, 新的清单项)"""
+        key = self.table_key(conn, table_name)
+        hwm = conn.execute(f"SELECT MAX({key}) FROM {table_name}").fetchone()[0] if key else None
+        entry = {'key': key, 'hwm': hwm}
+        header = f"-- 表数据: {table_name}\n"
+        
+        if old is None or old['key'] != key or key is None:
+            # 新表或没有递增键：整表比较，有变化就整表重写
+            entry['blocks'] = self.table_blocks(conn, table_name, key)
+            if old is not None and old['blocks'] == entry['blocks']:
+                return 0, 0, 0, entry
+            out.write(header + f"DELETE FROM {table_name};\n")
+            return 1, self.write_rows(conn, table_name, [out]), 0, entry
+        
+        old_hwm = old['hwm']
+        rewritten = rows = 0
+        blocks = {}
+        if old_hwm is not None:
+            # 高水位以下：逐块比较，变化的块按范围删除后重新插入
+            blocks = self.table_blocks(conn, table_name, key, hi=old_hwm + 1)
+            for blk in sorted(set(old['blocks']) | set(blocks), key=int):
+                if old['blocks'].get(blk) == blocks.get(blk):
+                    continue
+                lo = int(blk) * self.block_rows
+                hi = min(lo + self.block_rows, old_hwm + 1)
+                if not rewritten:
+                    out.write(header)
+                out.write(f"DELETE FROM {table_name} WHERE {key} >= {lo} AND {key} < {hi};\n")
+                rows += self.write_rows(conn, table_name, [out], lo, hi, key)
+                rewritten += 1
+        
+        # 高水位以上：新增的行
+        added = 0
+        if hwm is not None and (old_hwm is None or hwm > old_hwm):
+            if not rewritten:
+                out.write(header)
+            added = self.write_rows(conn, table_name, [out], None if old_hwm is None else old_hwm + 1, None, key)
+        if rewritten or added:
+            out.write("\n")
+        
+        # 高水位所在块及之后的块重新统计，之前的块与比较结果相同
+        if old_hwm is not None:
+            first = old_hwm // self.block_rows
+            blocks = {b: v for b, v in blocks.items() if int(b) < first}
+            blocks.update(self.table_blocks(conn, table_name, key, lo=first * self.block_rows))
+        else:
+            blocks = self.table_blocks(conn, table_name, key)
+        entry['blocks'] = blocks
+        return rewritten, rows, added, entry
+    
+    def compact(self):
+        """把全量数据文件和所有增量文件合并为新的全量导出，返回数据文件路径
+        
+        在临时库中依次执行结构文件、全量数据文件和各增量文件，再从临时库重新全量导出并删除增量文件。
+        """
+        manifest = self.load_manifest()
+        if not manifest or not manifest['deltas']:
+            print("没有需要合并的增量文件")
+            return None
+        t0 = time.perf_counter()
+        tmp_dir = tempfile.mkdtemp(prefix='sql_compact_')
+        try:
+            path = os.path.join(tmp_dir, 'compact.db')
+            conn = sqlite3.connect(path)
+            try:
+                for name in ['database_schema.sql', 'database_data.sql'] + manifest['deltas']:
+                    with open(os.path.join(self.sql_dir, name), encoding='utf-8') as f:
+                        conn.executescript(f.read())
+            finally:
+                conn.close()
+            # 直接以临时库作为快照导出，文件头仍标注原数据库
+            self._source = path
+            self._conn = sqlite3.connect(path)
+            try:
+                data_file = self.export_all_data()
+            finally:
+                self._conn.close()
+                self._conn = None
+                self._source = None
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"合并 {len(manifest['deltas'])} 个增量文件完成（耗时 {time.perf_counter() - t0:.2f} 秒）")
+        return data_file
+    
     def create_import_script(self):
         """创建数据导入脚本"""
-        import_script = '''#!/usr/bin/env python3
+        import_script = r'''#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""数据库导入脚本"""
+"""数据库导入脚本
 
-import sqlite3
+- 分块读取SQL文件，按字符串、标识符引号和注释切分语句，内容中的分号不会截断语句
+- 在目标库旁的临时文件中导入：journal_mode=OFF、synchronous=OFF，整个导入一个事务，
+  文件自带的 BEGIN/COMMIT 由本脚本统一管理
+- 先建表再导入数据和增量文件，最后创建索引和触发器；全部成功后才替换目标数据库
+用法: python import_database.py [数据库文件] [SQL目录]
+"""
+
+import json
 import os
+import re
+import sqlite3
+import sys
+import time
+
+# 每次读取的字符数
+READ_CHUNK = 1024 * 1024
+# 普通状态下需要关注的记号：语句结束、各种引号、注释开始
+SPECIAL = re.compile(r"[;'\"`\[]|--|/\*")
+# 进入引号或注释后对应的结束符
+CLOSING = {"'": "'", '"': '"', '`': '`', '[': ']', '--': '\n', '/*': '*/'}
+LEADING = re.compile(r"(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*", re.S)
+TRIGGER = re.compile(r"CREATE\s+(?:TEMP\s+|TEMPORARY\s+)?TRIGGER\b", re.I)
+DEFERRED = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\b", re.I)
+TRANSACTION = re.compile(r"(?:BEGIN|COMMIT|END|ROLLBACK)\b(?:\s+TRANSACTION)?\s*;?$", re.I)
+
+
+def iter_statements(path):
+    """流式读取SQL文件，逐条返回语句（去掉前导空白和注释，跳过空语句）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        start = pos = 0
+        closing = None
+        eof = False
+        while not eof:
+            chunk = f.read(READ_CHUNK)
+            eof = not chunk
+            # 只保留未完成的语句，已返回的部分丢掉
+            buf = buf[start:] + chunk
+            pos -= start
+            start = 0
+            while True:
+                if closing is None:
+                    m = SPECIAL.search(buf, pos)
+                    if not m:
+                        # 最后一个字符可能是跨块的 -- 或 /* 的一半
+                        pos = max(pos, len(buf) - 1)
+                        break
+                    pos = m.end()
+                    token = m.group()
+                    if token != ';':
+                        closing = CLOSING[token]
+                        continue
+                    stmt = buf[start:pos]
+                    body = stmt[LEADING.match(stmt).end():]
+                    # 触发器体内的分号不结束语句
+                    if TRIGGER.match(body) and not sqlite3.complete_statement(stmt):
+                        continue
+                    start = pos
+                    if body.strip() != ';':
+                        yield body
+                else:
+                    end = buf.find(closing, pos)
+                    if end < 0:
+                        pos = max(pos, len(buf) - len(closing) + 1)
+                        break
+                    pos = end + len(closing)
+                    closing = None
+        tail = buf[start:]
+        body = tail[LEADING.match(tail).end():]
+        if body.strip():
+            yield body
+
+
+def execute_file(conn, path, deferred=None):
+    """执行一个SQL文件，返回执行的语句数；deferred 不为 None 时把建索引语句留到最后"""
+    count = 0
+    for stmt in iter_statements(path):
+        if TRANSACTION.match(stmt):
+            continue
+        if deferred is not None and DEFERRED.match(stmt):
+            deferred.append(stmt)
+            continue
+        try:
+            conn.execute(stmt)
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"{os.path.basename(path)} 执行语句出错: {stmt[:80]}... 错误: {e}") from e
+        count += 1
+    return count
+
 
 def import_database(db_path='DB/app.db', sql_dir='SQL'):
-    """导入数据库结构和数据"""
-    
+    """导入数据库结构和数据，成功返回 True"""
+
     # 确保数据库目录存在
     db_dir = os.path.dirname(db_path)
-    if not os.path.exists(db_dir):
+    if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir)
-    
-    # 连接数据库
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+
+    tmp_path = db_path + '.importing'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    # 每条语句只执行一次，不缓存预编译语句
+    conn = sqlite3.connect(tmp_path, isolation_level=None, cached_statements=0)
+    t0 = time.perf_counter()
+
     try:
-        # 导入数据库结构
+        # 导入期间不写回滚日志、不等待落盘；出错时丢弃临时文件，目标库不受影响
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("BEGIN")
+        indexes = []
+
+        # 导入数据库结构（索引留到数据导入之后）
         schema_file = os.path.join(sql_dir, 'database_schema.sql')
         if os.path.exists(schema_file):
             print(f"导入数据库结构: {schema_file}")
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                schema_sql = f.read()
-            
-            # 执行结构SQL（分割成单独的语句）
-            statements = [stmt.strip() for stmt in schema_sql.split(';') if stmt.strip() and not stmt.strip().startswith('--')]
-            for statement in statements:
-                try:
-                    cursor.execute(statement)
-                except sqlite3.Error as e:
-                    print(f"执行语句时出错: {statement[:50]}... 错误: {e}")
-            
-            conn.commit()
+            execute_file(conn, schema_file, indexes)
             print("数据库结构导入完成")
-        
+
         # 导入数据
         data_file = os.path.join(sql_dir, 'database_data.sql')
         if os.path.exists(data_file):
             print(f"导入数据: {data_file}")
-            with open(data_file, 'r', encoding='utf-8') as f:
-                data_sql = f.read()
-            
-            # 执行数据SQL
-            statements = [stmt.strip() for stmt in data_sql.split(';') if stmt.strip() and not stmt.strip().startswith('--')]
-            for statement in statements:
-                try:
-                    cursor.execute(statement)
-                except sqlite3.Error as e:
-                    print(f"执行语句时出错: {statement[:50]}... 错误: {e}")
-            
-            conn.commit()
-            print("数据导入完成")
-        
-        print("数据库导入成功！")
-        
+            count = execute_file(conn, data_file)
+            print(f"数据导入完成（{count} 条语句）")
+
+        # 按清单顺序导入增量文件
+        manifest_file = os.path.join(sql_dir, 'export_manifest.json')
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                deltas = json.load(f).get('deltas', [])
+            for name in deltas:
+                delta_file = os.path.join(sql_dir, name)
+                print(f"导入增量: {delta_file}")
+                execute_file(conn, delta_file)
+            if deltas:
+                print(f"增量导入完成（{len(deltas)} 个文件）")
+
+        # 数据就位后一次性建索引，再建触发器（导入数据时不触发）
+        for stmt in indexes:
+            conn.execute(stmt)
+        print(f"创建索引: {len(indexes)} 个")
+        triggers_file = os.path.join(sql_dir, 'database_triggers.sql')
+        if os.path.exists(triggers_file):
+            print(f"创建触发器: {execute_file(conn, triggers_file)} 条语句")
+
+        conn.execute("COMMIT")
+        conn.close()
     except Exception as e:
         print(f"导入过程中出错: {e}")
-        conn.rollback()
-    
-    finally:
         conn.close()
+        os.remove(tmp_path)
+        return False
+
+    # 替换目标数据库（旧库的 WAL 文件一并删除，避免被应用到新库上）
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.replace(tmp_path, db_path)
+    print(f"数据库导入成功！{db_path}（耗时 {time.perf_counter() - t0:.2f} 秒）")
+    return True
 
 if __name__ == '__main__':
-    import_database()
+    ok = import_database(*sys.argv[1:3])
+    sys.exit(0 if ok else 1)
 '''
         
         import_file = os.path.join(self.sql_dir, "import_database.py")
@@ -256,11 +818,19 @@ if __name__ == '__main__':
 ### 数据库结构文件
 - `database_schema.sql` - 完整数据库结构（所有表）
 - `*_schema.sql` - 单个表结构文件
+- `database_triggers.sql` - 所有触发器，在数据导入之后执行
 
 ### 数据文件
 - `database_data.sql` - 完整数据库数据（所有表）
 - `*_data.sql` - 单个表数据文件
 
+### 增量文件
+- `export_manifest.json` - 导出清单（每张表的高水位和分块校验和，以及增量文件列表）
+- `deltas/delta_*.sql` - 增量数据文件，按清单顺序在完整数据之后导入
+
+### 快照文件
+- `database_snapshot.zip` - 数据库二进制快照（压缩的数据库副本和校验记录），由项目根目录的 `db_snapshot.py` 生成
+
 ### 工具文件
 - `import_database.py` - 数据库导入脚本
 - `README.md` - 本说明文件
@@ -269,7 +839,8 @@ if __name__ == '__main__':
 
 ### 1. 导入完整数据库
 ```bash
-python import_database.py
+# 在项目根目录执行，可指定数据库文件和SQL目录（默认 DB/app.db、SQL）
+python SQL/import_database.py
 ```
 
 ### 2. 手动导入
@@ -279,9 +850,34 @@ sqlite3 your_database.db < database_schema.sql
 
 # 导入数据
 sqlite3 your_database.db < database_data.sql
+
+# 最后创建触发器
+sqlite3 your_database.db < database_triggers.sql
+```
+
+### 3. 增量导出与合并
+```bash
+# 只导出上次导出之后新增或修改的行，生成一个新的增量文件
+python sql_exporter.py --incremental
+
+# 把完整数据和所有增量文件合并为新的完整导出，并删除增量文件
+python sql_exporter.py --compact
 ```
+手动导入时，在 `database_data.sql` 之后按 `export_manifest.json` 中的顺序执行各增量文件。
 
-### 3. 导入单个表
+### 4. 快照与恢复
+```bash
+# 生成快照（VACUUM INTO 后压缩，记录 SHA-256 和各表行数）
+python db_snapshot.py snapshot
+
+# 从快照恢复：校验后直接替换数据库文件（需先停止应用），比执行SQL导入快得多
+python db_snapshot.py restore
+
+# 应用运行中恢复：用在线备份API写入正在使用的数据库
+python db_snapshot.py restore --online
+```
+
+### 5. 导入单个表
 ```bash
 # 导入单个表结构
 sqlite3 your_database.db < table_name_schema.sql
@@ -295,7 +891,7 @@ sqlite3 your_database.db < table_name_data.sql
 1. 导入前请备份现有数据库
 2. 结构文件包含 `DROP TABLE` 语句，会删除现有表
 3. 数据文件包含 `DELETE` 语句，会清空现有数据
-4. 建议先导入结构，再导入数据
+4. 建议先导入结构，再导入数据，最后创建触发器；`import_database.py` 会在数据导入后再建索引
 5. 如果遇到编码问题，请确保文件以UTF-8编码保存
 
 ## 导出时间
@@ -319,11 +915,13 @@ sqlite3 your_database.db < table_name_data.sql
         print(f"导出目录: {self.sql_dir}")
         print("-" * 50)
         
-        # 导出结构
-        schema_file = self.export_all_schemas()
-        
-        # 导出数据
-        data_file = self.export_all_data()
+        # 结构和数据从同一份快照导出
+        with self.snapshot():
+            # 导出结构
+            schema_file = self.export_all_schemas()
+            
+            # 导出数据
+            data_file = self.export_all_data()
         
         # 创建导入脚本
         import_file = self.create_import_script()
@@ -345,13 +943,30 @@ sqlite3 your_database.db < table_name_data.sql
 
 def main():
     """主函数"""
-    exporter = SQLExporter()
+    parser = argparse.ArgumentParser(description='导出数据库结构和数据为SQL文件')
+    parser.add_argument('--db', default='DB/app.db', help='数据库文件')
+    parser.add_argument('--out', default='SQL', help='导出目录')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='并行导出表数据的进程数（1 为顺序导出）')
+    parser.add_argument('--threads', action='store_true', help='用线程代替进程并行导出')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true', help='只导出上次导出之后新增或修改的行（增量文件）')
+    mode.add_argument('--compact', action='store_true', help='把完整数据和增量文件合并为新的完整导出')
+    args = parser.parse_args()
+    exporter = SQLExporter(args.db, sql_dir=args.out, workers=args.workers, use_threads=args.threads)
     
     # 检查数据库文件是否存在
     if not os.path.exists(exporter.db_path):
         print(f"错误: 数据库文件不存在: {exporter.db_path}")
         return
     
+    if args.incremental:
+        exporter.export_delta()
+        return
+    if args.compact:
+        exporter.compact()
+        return
+    
     # 导出所有内容
     result = exporter.export_all()
     